@@ -0,0 +1,45 @@
+"""Сравнение расчета страниц 'Главная' и 'События' за каждый день года вызовами по одной дате и пакетно.
+
+Запуск: python -m benchmarks.bench_batch_pages [число_строк] [диапазон]
+"""
+import sys
+import time
+
+import pandas as pd
+
+from benchmarks.synthetic import make_transactions
+from src.cube import build_daily_cube, get_events_information_batch, get_information_home_page_batch
+from src.date_index import sort_transactions_by_date
+from src.utils import get_events_information, get_information_home_page
+
+
+def main() -> None:
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    data_range = sys.argv[2] if len(sys.argv) > 2 else "M"
+
+    transactions = sort_transactions_by_date(make_transactions(n_rows))
+    date_strs = [(pd.Timestamp("2020-01-01 12:00:00") + pd.Timedelta(days=day)).strftime("%Y-%m-%d %H:%M:%S")
+                 for day in range(366)]
+
+    start = time.perf_counter()
+    single_pages = [(get_information_home_page(date_str, transactions, [], []),
+                     get_events_information(date_str, transactions, [], [], data_range))
+                    for date_str in date_strs]
+    single_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    cube = build_daily_cube(transactions)
+    build_time = time.perf_counter() - start
+    home_pages = get_information_home_page_batch(date_strs, transactions, cube, [], [])
+    events_pages = get_events_information_batch(date_strs, transactions, cube, [], [], data_range)
+    batch_time = time.perf_counter() - start
+
+    assert single_pages == list(zip(home_pages, events_pages))
+    print(f"Строк: {n_rows}, дат: {len(date_strs)}, диапазон: {data_range}")
+    print(f"По одной дате: {single_time:8.2f} с ({len(date_strs) / single_time:8.1f} дат/с)")
+    print(f"Пакетно:       {batch_time:8.2f} с ({len(date_strs) / batch_time:8.1f} дат/с), "
+          f"из них построение куба {build_time:.2f} с")
+
+
+if __name__ == "__main__":
+    main()
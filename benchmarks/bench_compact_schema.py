@@ -0,0 +1,62 @@
+"""Сравнение расхода памяти и скорости агрегаций для обычной и компактной схемы транзакций.
+
+Запуск: python -m benchmarks.bench_compact_schema [число_строк] [число_повторов]
+"""
+import sys
+import time
+
+import pandas as pd
+
+from benchmarks.synthetic import make_transactions
+from src.schema import apply_compact_schema
+from src.utils import (
+    filter_transactions,
+    get_card_spent_cashback,
+    get_date_obj_information,
+    get_top_categories_expenses,
+    get_top_categories_income,
+    get_total_expenses,
+    get_transfers_and_cash_expenses
+)
+
+
+def render_events(transactions: pd.DataFrame) -> None:
+    """Выполняет агрегации страниц 'Главная' и 'События' за год."""
+    date_obj, start_date, end_date = get_date_obj_information("2021-12-31 22:39:04", "Y")
+    transactions_df = filter_transactions(transactions, start_date, end_date, date_obj)
+    get_card_spent_cashback(transactions_df)
+    get_total_expenses(transactions_df)
+    get_top_categories_expenses(transactions_df)
+    get_transfers_and_cash_expenses(transactions_df)
+    get_top_categories_income(transactions_df)
+
+
+def measure(transactions: pd.DataFrame, repeats: int) -> float:
+    """Возвращает лучшее время выполнения агрегаций в секундах."""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        render_events(transactions)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    default_df = make_transactions(n_rows)
+    start = time.perf_counter()
+    compact_df = apply_compact_schema(default_df)
+    convert_time = time.perf_counter() - start
+
+    default_memory = default_df.memory_usage(deep=True).sum() / 1024 / 1024
+    compact_memory = compact_df.memory_usage(deep=True).sum() / 1024 / 1024
+
+    print(f"Строк: {n_rows}, преобразование схемы: {convert_time:.2f} с")
+    print(f"Обычная схема:    {default_memory:8.1f} МБ, агрегации {measure(default_df, repeats) * 1000:8.1f} мс")
+    print(f"Компактная схема: {compact_memory:8.1f} МБ, агрегации {measure(compact_df, repeats) * 1000:8.1f} мс")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Сравнение расчета страниц 'Главная' и 'События' по транзакциям и по дневному кубу.
+
+Запуск: python -m benchmarks.bench_daily_cube [число_строк] [число_дат]
+"""
+import sys
+import time
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import make_transactions
+from src.cube import build_daily_cube, get_events_information_cube, get_information_home_page_cube
+from src.date_index import sort_transactions_by_date
+from src.utils import get_events_information, get_information_home_page
+
+
+def measure(render: Callable[[str, str], object], date_strs: list[str]) -> dict[str, float]:
+    """Возвращает среднее время расчета страниц в миллисекундах для каждого диапазона."""
+    timings = {}
+    for data_range in ("W", "M", "Y"):
+        start = time.perf_counter()
+        for date_str in date_strs:
+            render(date_str, data_range)
+        timings[data_range] = (time.perf_counter() - start) / len(date_strs) * 1000
+    return timings
+
+
+def main() -> None:
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    n_dates = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    transactions = sort_transactions_by_date(make_transactions(n_rows, years=6))
+    rng = np.random.default_rng(0)
+    date_strs = [(pd.Timestamp("2017-01-01") + pd.Timedelta(seconds=int(offset))).strftime("%Y-%m-%d %H:%M:%S")
+                 for offset in rng.integers(0, 5 * 365 * 24 * 3600, n_dates)]
+
+    start = time.perf_counter()
+    cube = build_daily_cube(transactions)
+    build_time = time.perf_counter() - start
+
+    raw = measure(lambda date_str, data_range: (
+        get_information_home_page(date_str, transactions, [], []),
+        get_events_information(date_str, transactions, [], [], data_range)), date_strs)
+    cubed = measure(lambda date_str, data_range: (
+        get_information_home_page_cube(date_str, transactions, cube, [], []),
+        get_events_information_cube(date_str, transactions, cube, [], [], data_range)), date_strs)
+
+    print(f"Строк: {n_rows}, групп куба: {len(cube.keys)}, построение куба: {build_time:.2f} с, дат: {n_dates}")
+    for data_range in raw:
+        print(f"Диапазон {data_range}: транзакции {raw[data_range]:8.2f} мс, куб {cubed[data_range]:8.2f} мс, "
+              f"ускорение x{raw[data_range] / cubed[data_range]:.1f}")
+
+
+if __name__ == "__main__":
+    main()
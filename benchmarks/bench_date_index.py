@@ -0,0 +1,52 @@
+"""Сравнение фильтрации по булевой маске и выборки диапазона дат бинарным поиском.
+
+Бинарный поиск измеряется с проверкой порядка дат при каждом вызове и с порядком, найденным один раз
+на версию данных (TransactionDataset.date_order).
+
+Запуск: python -m benchmarks.bench_date_index [число_строк] [число_окон]
+"""
+import sys
+import time
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import make_transactions
+from src.date_index import DETECT_ORDER, build_date_order, sort_transactions_by_date
+from src.utils import filter_transactions, get_date_obj_information
+
+
+def measure(transactions: pd.DataFrame, windows: list[tuple], date_order: Optional[str] = DETECT_ORDER) -> float:
+    """Возвращает среднее время выборки одного окна в миллисекундах."""
+    start = time.perf_counter()
+    for date_obj, start_date, end_date in windows:
+        filter_transactions(transactions, start_date, end_date, date_obj, date_order)
+    return (time.perf_counter() - start) / len(windows) * 1000
+
+
+def main() -> None:
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    n_windows = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+
+    transactions = make_transactions(n_rows).sample(frac=1, random_state=0)
+    rng = np.random.default_rng(0)
+    offsets = rng.integers(0, 4 * 365 * 24 * 3600, n_windows)
+    windows = [get_date_obj_information((pd.Timestamp("2018-01-01") + pd.Timedelta(seconds=int(offset)))
+                                        .strftime("%Y-%m-%d %H:%M:%S"), "MWY"[i % 3])
+               for i, offset in enumerate(offsets)]
+
+    mask_time = measure(transactions, windows)
+    indexed = sort_transactions_by_date(transactions)
+    detect_time = measure(indexed, windows)
+    index_time = measure(indexed, windows, build_date_order(indexed))
+
+    print(f"Строк: {n_rows}, окон: {n_windows}")
+    for name, milliseconds in (("Булева маска:", mask_time),
+                               ("Бинарный поиск с проверкой порядка:", detect_time),
+                               ("Бинарный поиск, порядок известен:", index_time)):
+        print(f"{name:<36}{milliseconds:8.3f} мс на окно")
+
+
+if __name__ == "__main__":
+    main()
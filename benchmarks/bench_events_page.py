@@ -0,0 +1,56 @@
+"""Сравнение расчета данных страницы 'События' пятью отдельными проходами и одной сверткой.
+
+Запуск: python -m benchmarks.bench_events_page [число_строк] [число_повторов]
+"""
+import sys
+import time
+from typing import Callable
+
+import pandas as pd
+
+from benchmarks.synthetic import make_transactions
+from src.schema import apply_compact_schema
+from src.utils import (
+    get_expenses_and_income,
+    get_top_categories_expenses,
+    get_top_categories_income,
+    get_total_expenses,
+    get_total_income,
+    get_transfers_and_cash_expenses
+)
+
+
+def five_passes(transactions: pd.DataFrame) -> None:
+    """Выполняет пять отдельных агрегаций страницы 'События'."""
+    get_total_expenses(transactions)
+    get_top_categories_expenses(transactions)
+    get_transfers_and_cash_expenses(transactions)
+    get_total_income(transactions)
+    get_top_categories_income(transactions)
+
+
+def measure(render: Callable[[pd.DataFrame], object], transactions: pd.DataFrame, repeats: int) -> float:
+    """Возвращает лучшее время расчета в миллисекундах."""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        render(transactions)
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main() -> None:
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    default_df = make_transactions(n_rows)
+    print(f"Строк: {n_rows}")
+    for name, transactions in (("Обычная схема", default_df), ("Компактная схема", apply_compact_schema(default_df))):
+        separate = measure(five_passes, transactions, repeats)
+        fused = measure(get_expenses_and_income, transactions, repeats)
+        print(f"{name}: пять проходов {separate:8.1f} мс, одна свертка {fused:8.1f} мс, "
+              f"ускорение x{separate / fused:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Профилирование расчета страниц 'Главная' и 'События' с котировками из записанных ответов API (без сети).
+
+Выводит длительность каждого этапа и общее время: этапы загрузки и запросов котировок выполняются одновременно,
+поэтому общее время близко к самому долгому из них, а не к сумме.
+Запуск: python -m benchmarks.bench_home_page [задержка_API_мс] [число_повторов]
+"""
+import os
+import sys
+
+from config import ROOT_DIR
+from src.dataset import get_dataset
+from src.external_api import ReplayQuoteProvider
+from src.views import get_inform_for_veb_page
+
+RECORDED_PATH = os.path.join(ROOT_DIR, "data", "quotes_recorded.json")
+STAGES = ["transactions", "currency_rates", "stock_prices", "home_page", "events_page"]
+
+
+def main() -> None:
+    latency = float(sys.argv[1]) / 1000 if len(sys.argv) > 1 else 0.1
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    provider = ReplayQuoteProvider(RECORDED_PATH, latency)
+    print(f"Задержка API: {latency * 1000:.0f} мс, повторов: {repeats}")
+    for cold in (True, False):
+        runs = []
+        for _ in range(repeats):
+            if cold:
+                get_dataset().invalidate()
+            timings: dict[str, float] = {}
+            get_inform_for_veb_page("2021-12-31 22:39:04", "M", provider=provider, use_cache=False, timings=timings)
+            runs.append(timings)
+
+        best = min(runs, key=lambda run: run["total"])
+        stages = ", ".join(f"{stage} {best[stage] * 1000:.1f}" for stage in STAGES)
+        print(f"{'Без загруженных данных' if cold else 'С загруженными данными'}: {stages} мс")
+        print(f"  сумма этапов {sum(best[stage] for stage in STAGES) * 1000:7.1f} мс, "
+              f"общее время {best['total'] * 1000:7.1f} мс")
+
+
+if __name__ == "__main__":
+    main()
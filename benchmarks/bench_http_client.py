@@ -0,0 +1,56 @@
+"""Сравнение задержек запросов котировок без сессии и через HttpClient на локальном сервере с внесением ошибок.
+
+Запуск: python -m benchmarks.bench_http_client [число_запросов] [доля_ошибок] [задержка_мс]
+"""
+import sys
+import time
+from typing import Callable
+
+import numpy as np
+import requests
+
+from src.http_client import HttpClient
+from tests.quote_stub import run_quote_stub
+
+
+def measure(fetch: Callable[[str], dict], urls: list[str]) -> tuple[np.ndarray, int]:
+    """Возвращает задержки запросов в миллисекундах и число неудачных запросов."""
+    timings = []
+    errors = 0
+    for url in urls:
+        start = time.perf_counter()
+        try:
+            fetch(url)
+        except requests.exceptions.RequestException:
+            errors += 1
+        timings.append(time.perf_counter() - start)
+    return np.array(timings) * 1000, errors
+
+
+def bare_get(url: str) -> dict:
+    """Запрос без сессии и повторов, как до появления HttpClient."""
+    response = requests.get(url, timeout=10)
+    response.raise_for_status()
+    result: dict = response.json()
+    return result
+
+
+def main() -> None:
+    n_requests = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    failure_rate = float(sys.argv[2]) if len(sys.argv) > 2 else 0.05
+    latency = float(sys.argv[3]) / 1000 if len(sys.argv) > 3 else 0.002
+
+    print(f"Запросов: {n_requests}, доля ошибок сервера: {failure_rate}, задержка сервера: {latency * 1000:.0f} мс")
+    with run_quote_stub(latency, failure_rate) as server:
+        urls = [f"{server.url}/price?symbol=S{i}" for i in range(n_requests)]
+        client = HttpClient(backoff_factor=0.01, failure_threshold=n_requests)
+        for name, fetch in (("requests.get", bare_get), ("HttpClient", client.get_json)):
+            timings, errors = measure(fetch, urls)
+            p50, p95, p99 = np.percentile(timings, [50, 95, 99])
+            print(f"{name:>12}: p50 {p50:6.2f} мс, p95 {p95:6.2f} мс, p99 {p99:6.2f} мс, ошибок {errors}")
+        client.close()
+        print(f"Соединений открыто сервером: {server.connections}")
+
+
+if __name__ == "__main__":
+    main()
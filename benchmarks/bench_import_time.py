@@ -0,0 +1,77 @@
+"""Время холодного импорта каждого модуля src по отчету python -X importtime и проверка бюджета.
+
+Каждый модуль импортируется в отдельном процессе. Скрипт завершается с кодом 1, если импорт модуля
+дольше бюджета или загружает тяжелую зависимость (pandas, numpy, requests и т.д.).
+
+Запуск: python -m benchmarks.bench_import_time [бюджет_мс]
+"""
+import glob
+import os
+import subprocess
+import sys
+
+from config import ROOT_DIR
+
+DEFAULT_BUDGET_MS = 100.0
+BUDGETS_MS = {
+    "src.http_client": 200.0
+}
+HEAVY_MODULES = ("pandas", "numpy", "pyarrow", "openpyxl", "requests", "dotenv", "dateutil")
+ALLOWED_HEAVY_MODULES = {
+    "src.http_client": ("requests",)
+}
+
+
+def find_modules() -> list[str]:
+    """Возвращает имена модулей пакета src."""
+    paths = glob.glob(os.path.join(ROOT_DIR, "src", "*.py"))
+    return sorted(f"src.{os.path.splitext(os.path.basename(path))[0]}"
+                  for path in paths if not path.endswith("__init__.py"))
+
+
+def measure_import(module: str) -> tuple[float, list[str]]:
+    """Импортирует модуль в новом процессе.
+
+    Возвращает время импорта в миллисекундах и загруженные при импорте тяжелые зависимости.
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=ROOT_DIR, capture_output=True, text=True, check=True)
+
+    total_us = 0
+    imported = []
+    after_site = False
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not after_site:
+            after_site = name.strip() == "site"
+            continue
+        if not name.startswith("  "):
+            total_us += int(cumulative)
+        if name.strip() in HEAVY_MODULES:
+            imported.append(name.strip())
+    return total_us / 1000, imported
+
+
+def main() -> None:
+    default_budget = float(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_BUDGET_MS
+
+    failed = []
+    print(f"{'Модуль':24} {'Импорт, мс':>11} {'Бюджет, мс':>11}  Тяжелые зависимости")
+    for module in find_modules():
+        elapsed, imported = measure_import(module)
+        budget = BUDGETS_MS.get(module, default_budget)
+        unexpected = [name for name in imported if name not in ALLOWED_HEAVY_MODULES.get(module, ())]
+        status = "ok" if elapsed <= budget and not unexpected else "FAIL"
+        if status == "FAIL":
+            failed.append(module)
+        print(f"{module:24} {elapsed:11.1f} {budget:11.1f}  {', '.join(imported) or '-'}  {status}")
+
+    if failed:
+        print(f"Превышен бюджет импорта: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Время расчета страниц «Главная» и «События» при включенном уровне INFO и при уровне WARNING.
+
+Запуск: python -m benchmarks.bench_logging [число_строк] [число_дат]
+"""
+import logging
+import sys
+import time
+
+import pandas as pd
+
+from benchmarks.synthetic import make_transactions
+from src.date_index import sort_transactions_by_date
+from src.logging_config import queue_handler, services_logger, src_utils_logger, views_logger
+from src.utils import get_events_information, get_information_home_page
+
+
+def measure(transactions: pd.DataFrame, date_strs: list[str]) -> float:
+    """Возвращает среднее время расчета обеих страниц для одной даты в миллисекундах."""
+    start = time.perf_counter()
+    for date_str in date_strs:
+        get_information_home_page(date_str, transactions, [], [])
+        get_events_information(date_str, transactions, [], [], "M")
+    return (time.perf_counter() - start) / len(date_strs) * 1000
+
+
+def main() -> None:
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    n_dates = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    transactions = sort_transactions_by_date(make_transactions(n_rows))
+    date_strs = [date.strftime("%Y-%m-%d %H:%M:%S")
+                 for date in pd.date_range("2019-01-01", "2021-12-31", periods=n_dates)]
+    loggers = [src_utils_logger, services_logger, views_logger]
+
+    results = {}
+    for level in [logging.INFO, logging.WARNING]:
+        for logger in loggers:
+            logger.setLevel(level)
+        results[logging.getLevelName(level)] = measure(transactions, date_strs)
+        queue_handler.stop()
+
+    print(f"Строк: {n_rows}, дат: {n_dates}")
+    for level_name, elapsed in results.items():
+        print(f"{level_name:8} {elapsed:8.3f} мс на дату")
+
+
+if __name__ == "__main__":
+    main()
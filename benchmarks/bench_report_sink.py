@@ -0,0 +1,50 @@
+"""Время вызова функции с декоратором report и время фоновой записи репорта на диск.
+
+Запуск: python -m benchmarks.bench_report_sink [число_строк] [число_вызовов]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import make_transactions
+from src.date_index import sort_transactions_by_date
+from src.report_sink import get_report_sink
+from src.reports import get_spending_by_date_category
+from src.reports_decorator import report
+
+
+def main() -> None:
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    n_calls = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    transactions = sort_transactions_by_date(make_transactions(n_rows))
+    start_date = transactions["Дата операции"].iloc[-1]
+    end_date = transactions["Дата операции"].iloc[0]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "report.txt")
+        reported = report(filename=path)(get_spending_by_date_category)
+
+        start = time.perf_counter()
+        for _ in range(n_calls):
+            get_spending_by_date_category(transactions, "Связь", start_date, end_date)
+        plain_time = (time.perf_counter() - start) / n_calls * 1000
+
+        start = time.perf_counter()
+        for _ in range(n_calls):
+            reported(transactions, "Связь", start_date, end_date)
+        reported_time = (time.perf_counter() - start) / n_calls * 1000
+
+        start = time.perf_counter()
+        get_report_sink().flush()
+        flush_time = time.perf_counter() - start
+
+        print(f"Строк: {n_rows}, вызовов: {n_calls}, размер репорта: {os.path.getsize(path)} байт")
+        print(f"Без декоратора:   {plain_time:8.2f} мс на вызов")
+        print(f"С декоратором:    {reported_time:8.2f} мс на вызов")
+        print(f"Запись на диск:   {flush_time:8.2f} с после последнего вызова")
+
+
+if __name__ == "__main__":
+    main()
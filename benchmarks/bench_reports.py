@@ -0,0 +1,39 @@
+"""Сравнение отчета по каждой категории отдельным вызовом и одного отчета по всем категориям.
+
+Запуск: python -m benchmarks.bench_reports [число_строк]
+"""
+import json
+import sys
+import time
+
+from benchmarks.synthetic import make_transactions
+from src.date_index import sort_transactions_by_date
+from src.reports import get_spending_by_categories, get_spending_by_category
+
+DATE_STR = "2021-12-30 22:39:04"
+
+
+def main() -> None:
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    transactions = sort_transactions_by_date(make_transactions(n_rows))
+    categories = sorted(transactions["Категория"].dropna().unique())
+
+    start = time.perf_counter()
+    per_category = [json.loads(get_spending_by_category(transactions, category, DATE_STR))
+                    for category in categories]
+    per_category_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    all_categories = json.loads(get_spending_by_categories(transactions, categories, DATE_STR))
+    all_categories_time = time.perf_counter() - start
+
+    max_diff = max(abs(a["spending"] - b["spending"]) for a, b in zip(per_category, all_categories))
+
+    print(f"Строк: {n_rows}, категорий: {len(categories)}, расхождение: {max_diff:.2e}")
+    print(f"По одной категории: {per_category_time:8.3f} с")
+    print(f"Все категории:      {all_categories_time:8.3f} с")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Сравнение поиска транзакций регулярным выражением по каждой строке и по индексу n-грамм,
+а также нечеткого поиска по триграммам для каждой строки и по различным описаниям.
+
+Запуск: python -m benchmarks.bench_search [число_строк] [число_повторов]
+"""
+import sys
+import time
+from typing import Callable
+
+from benchmarks.synthetic import make_transactions
+from src.date_index import sort_transactions_by_date
+from src.search_index import build_fuzzy_index, build_search_index, get_word_trigrams, scan_transactions
+
+QUERIES = ["Ситидрайв", "такси", "Перевод", "ма", "Пятёрочка", "нет такого"]
+FUZZY_QUERIES = ["Ситидрайф", "Магнт", "пятерочка", "Яндекс Таксі"]
+
+
+def measure(search: Callable[[str], object], repeats: int, queries: list[str] = QUERIES) -> float:
+    """Возвращает лучшее среднее время запроса из queries в миллисекундах."""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for query in queries:
+            search(query)
+        timings.append((time.perf_counter() - start) / len(queries))
+    return min(timings) * 1000
+
+
+def score_rows(descriptions: list[str], query: str, threshold: float = 0.3) -> list[int]:
+    """Нечеткий поиск без индекса: сходство триграмм считается для описания каждой строки."""
+    query_trigrams = get_word_trigrams(query)
+    rows = []
+    for row, description in enumerate(descriptions):
+        trigrams = get_word_trigrams(description)
+        overlap = len(query_trigrams & trigrams)
+        if overlap and overlap / len(query_trigrams | trigrams) >= threshold:
+            rows.append(row)
+    return rows
+
+
+def main() -> None:
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    transactions_df = sort_transactions_by_date(make_transactions(n_rows))
+    transactions = transactions_df.to_dict(orient="records")
+
+    start = time.perf_counter()
+    search_index = build_search_index(transactions_df)
+    build_time = (time.perf_counter() - start) * 1000
+
+    scan = measure(lambda query: scan_transactions(transactions, query), repeats)
+    indexed = measure(search_index.search, repeats)
+    for query in QUERIES:
+        assert len(search_index.search(query)) == len(scan_transactions(transactions, query))
+
+    print(f"Строк: {n_rows}, построение индекса: {build_time:.0f} мс")
+    print(f"Регулярное выражение по строкам: {scan:10.2f} мс на запрос")
+    print(f"Индекс n-грамм:                  {indexed:10.2f} мс на запрос, ускорение x{scan / indexed:.0f}")
+
+    start = time.perf_counter()
+    fuzzy_index = build_fuzzy_index(transactions_df)
+    fuzzy_build_time = (time.perf_counter() - start) * 1000
+    descriptions = [str(description) for description in transactions_df["Описание"]]
+
+    def fuzzy_search(query: str) -> list:
+        return [fuzzy_index.rows.get_rows(value_id) for value_id, _ in fuzzy_index.search(query)]
+
+    row_scoring = measure(lambda query: score_rows(descriptions, query), 1, FUZZY_QUERIES[:1])
+    fuzzy = measure(fuzzy_search, repeats, FUZZY_QUERIES)
+    print(f"Нечеткий поиск, построение индекса: {fuzzy_build_time:.0f} мс, "
+          f"различных описаний: {len(fuzzy_index.values)}")
+    print(f"Сходство для каждой строки:      {row_scoring:10.2f} мс на запрос")
+    print(f"Сходство для различных описаний: {fuzzy:10.2f} мс на запрос, ускорение x{row_scoring / fuzzy:.0f}")
+
+
+if __name__ == "__main__":
+    main()
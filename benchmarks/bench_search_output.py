@@ -0,0 +1,59 @@
+"""Сравнение пикового расхода памяти при формировании ответа поиска одной строкой, потоковой записью и по страницам.
+
+Запуск: python -m benchmarks.bench_search_output [число_строк] [запрос]
+"""
+import os
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable
+
+from benchmarks.synthetic import make_transactions
+from src.date_index import sort_transactions_by_date
+from src.records import TRANSACTION_FILL_VALUES, write_records_json
+from src.schema import apply_compact_schema
+from src.search_index import build_search_index
+from src.services import PAGE_SIZE, find_simple_search_rows, make_page_json, make_simple_search_df
+
+
+def measure(func: Callable[[], Any]) -> tuple[float, float]:
+    """Возвращает время выполнения в секундах и пиковый расход памяти в МБ."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024
+
+
+def write_to_devnull(transactions_df: Any, search_str: str, search_index: Any) -> None:
+    """Записывает результаты поиска частями, не сохраняя ответ в памяти."""
+    rows = find_simple_search_rows(transactions_df, search_str, search_index)
+    with open(os.devnull, "w", encoding="utf-8") as f:
+        write_records_json(f, transactions_df.iloc[rows], TRANSACTION_FILL_VALUES)
+
+
+def main() -> None:
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    search_str = sys.argv[2] if len(sys.argv) > 2 else "Переводы"
+
+    transactions_df = apply_compact_schema(sort_transactions_by_date(make_transactions(n_rows)))
+    search_index = build_search_index(transactions_df)
+    n_found = len(find_simple_search_rows(transactions_df, search_str, search_index))
+
+    results = {
+        "Строка JSON": measure(lambda: make_simple_search_df(transactions_df, search_str, search_index)),
+        "Потоковая запись": measure(lambda: write_to_devnull(transactions_df, search_str, search_index)),
+        f"Страница ({PAGE_SIZE})": measure(lambda: make_page_json(
+            transactions_df, find_simple_search_rows(transactions_df, search_str, search_index),
+            search_str, 1, PAGE_SIZE)),
+    }
+
+    print(f"Строк: {n_rows}, запрос: {search_str}, найдено: {n_found}")
+    for name, (elapsed, peak) in results.items():
+        print(f"{name:18} {elapsed:8.2f} с, пик памяти {peak:8.1f} МБ")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Сравнение времени и пикового расхода памяти сервисов на списке словарей и напрямую на DataFrame.
+
+Запуск: python -m benchmarks.bench_services [число_строк]
+"""
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable
+
+import pandas as pd
+
+from benchmarks.synthetic import make_transactions
+from src.date_index import sort_transactions_by_date
+from src.services import (
+    get_profitable_cashback_categories,
+    get_profitable_cashback_categories_df,
+    search_for_transfers_to_individuals,
+    search_for_transfers_to_individuals_df
+)
+
+
+def measure(func: Callable[[], Any]) -> tuple[Any, float, float]:
+    """Возвращает результат, время выполнения в секундах и пиковый расход памяти в МБ."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak / 1024 / 1024
+
+
+def run_list_services(transactions_df: pd.DataFrame) -> tuple[str, str]:
+    """Сервисы со списком словарей, как при вызове через get_transactions_list."""
+    transactions_list = transactions_df.to_dict(orient="records")
+    return (get_profitable_cashback_categories(transactions_list, 11, 2021),
+            search_for_transfers_to_individuals(transactions_list))
+
+
+def run_df_services(transactions_df: pd.DataFrame) -> tuple[str, str]:
+    """Сервисы напрямую на DataFrame."""
+    return (get_profitable_cashback_categories_df(transactions_df, 11, 2021),
+            search_for_transfers_to_individuals_df(transactions_df))
+
+
+def main() -> None:
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    transactions_df = sort_transactions_by_date(make_transactions(n_rows))
+
+    list_result, list_time, list_peak = measure(lambda: run_list_services(transactions_df))
+    df_result, df_time, df_peak = measure(lambda: run_df_services(transactions_df))
+    assert list_result == df_result
+
+    print(f"Строк: {n_rows}")
+    print(f"Список словарей: {list_time:8.2f} с, пик памяти {list_peak:8.1f} МБ")
+    print(f"DataFrame:       {df_time:8.2f} с, пик памяти {df_peak:8.1f} МБ")
+
+
+if __name__ == "__main__":
+    main()
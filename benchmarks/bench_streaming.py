@@ -0,0 +1,47 @@
+"""Сравнение пикового расхода памяти при полном и потоковом чтении XLSX-файла.
+
+Запуск: python -m benchmarks.bench_streaming [число_строк] [размер_фрагмента]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable
+
+from benchmarks.synthetic import make_transactions, write_workbook
+from src.read_xlsx import iter_transactions_excel, read_transactions_excel
+from src.utils import aggregate_transactions_chunks, get_top_categories_expenses, reduce_transactions
+
+
+def measure(func: Callable[[], Any]) -> tuple[float, float]:
+    """Возвращает время выполнения в секундах и пиковый расход памяти в МБ."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024
+
+
+def main() -> None:
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    chunk_size = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filepath = os.path.join(tmp_dir, "operations.xlsx")
+        write_workbook(make_transactions(n_rows), filepath)
+
+        full_time, full_peak = measure(lambda: get_top_categories_expenses(
+            reduce_transactions(read_transactions_excel(filepath, use_cache=False))))
+        stream_time, stream_peak = measure(lambda: get_top_categories_expenses(
+            aggregate_transactions_chunks(iter_transactions_excel(filepath, chunk_size))[0]))
+
+    print(f"Строк: {n_rows}, размер фрагмента: {chunk_size}")
+    print(f"Полное чтение:    {full_time:8.2f} с, пик памяти {full_peak:8.1f} МБ")
+    print(f"Потоковое чтение: {stream_time:8.2f} с, пик памяти {stream_peak:8.1f} МБ")
+
+
+if __name__ == "__main__":
+    main()
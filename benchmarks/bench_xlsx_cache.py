@@ -0,0 +1,53 @@
+"""Сравнение холодной загрузки XLSX-файла с загрузкой из колоночного кэша.
+
+Запуск: python -m benchmarks.bench_xlsx_cache [путь_к_xlsx] [число_повторов]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from config import ROOT_DIR
+from src.read_xlsx import read_transactions_excel
+from src.xlsx_cache import invalidate_cache
+
+
+def measure(filepath: str, repeats: int, use_cache: bool) -> list[float]:
+    """Возвращает время каждой загрузки в секундах."""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        read_transactions_excel(filepath, use_cache=use_cache)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main() -> None:
+    source = sys.argv[1] if len(sys.argv) > 1 else os.path.join(ROOT_DIR, "data", "operations.xlsx")
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filepath = os.path.join(tmp_dir, os.path.basename(source))
+        shutil.copy(source, filepath)
+
+        cold = measure(filepath, repeats, use_cache=False)
+
+        invalidate_cache(filepath)
+        start = time.perf_counter()
+        read_transactions_excel(filepath)
+        first = time.perf_counter() - start
+
+        warm = measure(filepath, repeats, use_cache=True)
+
+    print(f"Файл: {source}, повторов: {repeats}")
+    print(f"Холодная загрузка XLSX:    {min(cold) * 1000:9.2f} мс (лучшее), "
+          f"{sum(cold) / repeats * 1000:9.2f} мс (среднее)")
+    print(f"Первая загрузка с записью: {first * 1000:9.2f} мс")
+    print(f"Загрузка из кэша:          {min(warm) * 1000:9.2f} мс (лучшее), "
+          f"{sum(warm) / repeats * 1000:9.2f} мс (среднее)")
+    print(f"Ускорение: x{min(cold) / min(warm):.1f}")
+
+
+if __name__ == "__main__":
+    main()
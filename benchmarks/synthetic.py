@@ -0,0 +1,59 @@
+"""Генерация синтетических транзакций со структурой operations.xlsx для бенчмарков."""
+import numpy as np
+import pandas as pd
+
+CATEGORIES = ["Супермаркеты", "Фастфуд", "Переводы", "Наличные", "Пополнения", "Такси", "Топливо", "Аптеки",
+              "Связь", "Развлечения", "Одежда и обувь", "Дом и ремонт", "Медицина", "Кэшбэк", "Транспорт",
+              "Местный транспорт", "Каршеринг", "Красота", "Цветы", "Сервис", "Образование", "Авиабилеты",
+              "Ж/д билеты", "Отели", "Кино", "Спорттовары", "Книги", "Животные", "Бонусы", "Госуслуги",
+              "Зарплата", "Проценты на остаток", "Мобильная связь", "Детские товары", "Рестораны", "Музыка",
+              "Турагентства", "Фото/видео", "Косметика", "Электроника", "Подарки", "Хобби", "Страхование",
+              "Штрафы", "Налоги", "Благотворительность", "Инвестиции", "Аренда", "Коммунальные услуги"]
+DESCRIPTIONS = ["Колхоз", "Магнит", "Лента", "Пятёрочка", "Перекрёсток", "Ситидрайв", "Яндекс Такси",
+                "Mouse Tail", "Linzi Coffee", "Аптека Вита", "МТС", "Билайн", "ЛУКОЙЛ", "Газпромнефть",
+                "Перевод с карты", "Пополнение через Газпромбанк", "Снятие в банкомате Тинькофф",
+                "Перевод Кредитная карта. ТП 10.2 RUR"]
+NAMES = ["Дмитрий Р.", "Андрей Х.", "Светлана Т.", "Игорь Б.", "Константин Л.", "Валерий А."]
+CARDS = ["*7197", "*5091", "*4556", "*1112", "*5507", "*6002"]
+
+
+def make_transactions(n_rows: int, years: int = 4, seed: int = 0) -> pd.DataFrame:
+    """Возвращает DataFrame с синтетическими транзакциями, отсортированными по убыванию даты."""
+    rng = np.random.default_rng(seed)
+    end = pd.Timestamp("2021-12-31 23:59:59")
+    seconds = rng.integers(0, years * 365 * 24 * 3600, n_rows)
+    dates = (end - pd.to_timedelta(np.sort(seconds), unit="s")).floor("s")
+
+    amounts = np.round(rng.lognormal(6, 1.2, n_rows), 2)
+    signs = np.where(rng.random(n_rows) < 0.1, 1, -1)
+    amounts = amounts * signs
+
+    descriptions = np.array(DESCRIPTIONS + NAMES, dtype=object)[rng.integers(0, len(DESCRIPTIONS) + len(NAMES),
+                                                                             n_rows)]
+    cashback = np.where(rng.random(n_rows) < 0.2, np.round(np.abs(amounts) / 100), np.nan)
+    cards = np.array(CARDS + [np.nan], dtype=object)[rng.integers(0, len(CARDS) + 1, n_rows)]
+
+    return pd.DataFrame({
+        "Дата операции": dates,
+        "Дата платежа": dates.strftime("%d.%m.%Y"),
+        "Номер карты": cards,
+        "Статус": np.where(rng.random(n_rows) < 0.02, "FAILED", "OK"),
+        "Сумма операции": amounts,
+        "Валюта операции": np.array(["RUB", "USD", "EUR"])[rng.choice(3, n_rows, p=[0.96, 0.03, 0.01])],
+        "Сумма платежа": amounts,
+        "Валюта платежа": "RUB",
+        "Кэшбэк": cashback,
+        "Категория": np.array(CATEGORIES, dtype=object)[rng.integers(0, len(CATEGORIES), n_rows)],
+        "MCC": rng.integers(4000, 8000, n_rows).astype("float64"),
+        "Описание": descriptions,
+        "Бонусы (включая кэшбэк)": np.abs(amounts // 100).astype("int64"),
+        "Округление на инвесткопилку": 0,
+        "Сумма операции с округлением": np.abs(amounts)
+    })
+
+
+def write_workbook(transactions_df: pd.DataFrame, filepath: str) -> None:
+    """Записывает транзакции в XLSX-файл в формате выгрузки банка."""
+    workbook_df = transactions_df.copy()
+    workbook_df["Дата операции"] = workbook_df["Дата операции"].dt.strftime("%d.%m.%Y %H:%M:%S")
+    workbook_df.to_excel(filepath, index=False)
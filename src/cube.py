@@ -0,0 +1,276 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime
+from typing import TYPE_CHECKING, Iterable, Optional, Sequence
+
+from src.date_index import DETECT_ORDER, get_date_order
+from src.lazy_import import lazy_import
+from src.logging_config import src_utils_logger
+from src.schema import KOPECKS_ATTR, is_compact
+from src.utils import (
+    factorize_sorted,
+    filter_transactions,
+    get_category_sign_keys,
+    get_date_windows,
+    get_greeting,
+    get_top_five_transactions,
+    make_card_spent_cashback,
+    make_card_totals,
+    make_category_totals,
+    make_expenses_and_income
+)
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+else:
+    np = lazy_import("numpy")
+    pd = lazy_import("pandas")
+
+
+def to_kopecks(transactions_df: pd.DataFrame) -> pd.DataFrame:
+    """Возвращает транзакции с суммой операции и кэшбэком в копейках, чтобы суммы в кубе складывались точно."""
+    kopecks_df = transactions_df[["Дата операции", "Номер карты", "Категория"]].copy()
+    kopecks_df["Кэшбэк"] = (transactions_df["Кэшбэк"].astype("float64") * 100).round()
+    amounts = transactions_df["Сумма операции"].astype("float64")
+    kopecks_df["Сумма операции"] = amounts if is_compact(transactions_df) else (amounts * 100).round()
+    return kopecks_df
+
+
+class DailyCube:
+    """Дневной куб транзакций: суммы операций, кэшбэк и число операций по дню, карте, категории и знаку операции.
+
+    Для каждой группы (карта, категория, знак) хранятся накопленные по дням суммы в копейках. Сумма за период
+    считается как разность накопленных сумм на его границах, неполные первый и последний дни досчитываются
+    по операциям этих дней, поэтому время расчета не зависит от длины периода.
+    """
+
+    def __init__(self, transactions_df: pd.DataFrame) -> None:
+        kopecks_df = to_kopecks(transactions_df)
+        kopecks_df = kopecks_df[kopecks_df["Дата операции"].notna()].sort_values("Дата операции", kind="stable")
+        amounts = kopecks_df["Сумма операции"]
+        keys = [kopecks_df["Номер карты"], kopecks_df["Категория"],
+                pd.Series(np.sign(amounts), index=kopecks_df.index, name="Знак операции")]
+
+        group_codes = kopecks_df.groupby(keys, dropna=False, sort=False, observed=True).ngroup().to_numpy()
+        _, first_rows = np.unique(group_codes, return_index=True)
+        self.keys = pd.concat(keys, axis=1).iloc[first_rows].reset_index(drop=True)
+        self.cashback_dtype = transactions_df["Кэшбэк"].dtype
+
+        self._dates = kopecks_df["Дата операции"].to_numpy()
+        self._codes = group_codes
+        self._weights: dict[str, Optional[np.ndarray]] = {
+            "Сумма операции": np.nan_to_num(amounts.to_numpy(dtype="float64")),
+            "Кэшбэк": np.nan_to_num(kopecks_df["Кэшбэк"].to_numpy(dtype="float64")),
+            "Количество операций": None
+        }
+
+        days = self._dates.astype("datetime64[D]")
+        is_first = np.ones(len(days), dtype=bool)
+        is_first[1:] = days[1:] != days[:-1]
+        self.days = days[is_first]
+        self._day_starts = np.append(np.flatnonzero(is_first), len(days))
+
+        day_codes = np.cumsum(is_first) - 1
+        size = len(self.days) * len(self.keys)
+        self._cumulative: dict[str, np.ndarray] = {}
+        for column, weights in self._weights.items():
+            totals = np.bincount(day_codes * len(self.keys) + group_codes, weights, minlength=size)
+            totals = totals.reshape(len(self.days), len(self.keys))
+            self._cumulative[column] = np.vstack([np.zeros(len(self.keys)), totals.cumsum(axis=0)])
+
+        self._card_codes, self.cards = factorize_sorted(self.keys["Номер карты"])
+        category_codes, self.categories = factorize_sorted(self.keys["Категория"])
+        self._categorical = isinstance(self.keys["Категория"].dtype, pd.CategoricalDtype)
+        self._category_keys = get_category_sign_keys(category_codes, self.keys["Знак операции"].to_numpy(),
+                                                     len(self.categories))
+
+        src_utils_logger.info("Построен дневной куб транзакций: %s дней, %s групп", len(self.days), len(self.keys))
+
+    def window(self,
+               start_date: Optional[datetime] = None,
+               end_date: Optional[datetime] = None,
+               include_end: bool = False) -> pd.DataFrame:
+        """Возвращает свертку транзакций с датой операции в диапазоне [start_date, end_date).
+
+        Результат совпадает с reduce_transactions по транзакциям, которые выбирает select_date_range.
+        """
+        return self.windows([start_date], [end_date], [include_end])[0]
+
+    def windows(self,
+                start_dates: Iterable[Optional[datetime]],
+                end_dates: Iterable[Optional[datetime]],
+                include_end: Iterable[bool]) -> list[pd.DataFrame]:
+        """Возвращает свертки транзакций для набора диапазонов дат."""
+        sums = self.window_sums(start_dates, end_dates, include_end)
+
+        reduced_windows = []
+        for i in range(len(sums["Количество операций"])):
+            reduced = self.keys.copy()
+            for column, window_sums in sums.items():
+                reduced[column] = window_sums[i]
+            reduced["Сумма операции"] = reduced["Сумма операции"].round().astype("int64")
+            reduced["Количество операций"] = reduced["Количество операций"].astype("int64")
+            reduced = reduced[reduced["Количество операций"] > 0].reset_index(drop=True)
+            reduced.attrs[KOPECKS_ATTR] = True
+            reduced_windows.append(reduced)
+
+        return reduced_windows
+
+    def window_sums(self,
+                    start_dates: Iterable[Optional[datetime]],
+                    end_dates: Iterable[Optional[datetime]],
+                    include_end: Iterable[bool]) -> dict[str, np.ndarray]:
+        """Возвращает суммы в копейках и число операций по группам куба для набора диапазонов дат.
+
+        Границы всех диапазонов находятся одним бинарным поиском, а суммы для всех границ
+        берутся из накопленных сумм куба за один проход. Строка i каждой матрицы относится к диапазону i.
+        """
+        starts = pd.DatetimeIndex(list(start_dates)).to_numpy(dtype="datetime64[ns]")
+        ends = pd.DatetimeIndex(list(end_dates)).to_numpy(dtype="datetime64[ns]")
+
+        lower = np.searchsorted(self._dates, starts)
+        lower[np.isnat(starts)] = 0
+        upper = np.where(np.fromiter(include_end, dtype=bool, count=len(ends)),
+                         np.searchsorted(self._dates, ends, side="right"),
+                         np.searchsorted(self._dates, ends, side="left"))
+        upper[np.isnat(ends)] = len(self._dates)
+        upper = np.maximum(lower, upper)
+
+        positions, inverse = np.unique(np.concatenate([lower, upper]), return_inverse=True)
+        sums = {}
+        for column in self._cumulative:
+            accumulated = self._accumulate(column, positions)
+            sums[column] = accumulated[inverse[len(lower):]] - accumulated[inverse[:len(lower)]]
+        return sums
+
+    def card_totals(self, sums: dict[str, np.ndarray]) -> pd.DataFrame:
+        """Возвращает сумму операций в рублях и кешбэк по картам для сумм одного диапазона из window_sums."""
+        return make_card_totals(self._card_codes, self.cards, sums["Сумма операции"], sums["Кэшбэк"],
+                                sums["Количество операций"], self.cashback_dtype)
+
+    def category_totals(self, sums: dict[str, np.ndarray]) -> pd.DataFrame:
+        """Возвращает свертку по категории и знаку операции, как get_category_totals, для сумм одного диапазона."""
+        valid = self._category_keys >= 0
+        keys = self._category_keys[valid]
+        size = (len(self.categories) + 1) * 3
+        return make_category_totals(np.bincount(keys, sums["Сумма операции"][valid], minlength=size),
+                                    np.bincount(keys, sums["Количество операций"][valid], minlength=size),
+                                    self.categories,
+                                    self._categorical)
+
+    def _accumulate(self, column: str, positions: np.ndarray) -> np.ndarray:
+        """Возвращает суммы по группам для первых position операций для каждой позиции из positions."""
+        days = np.searchsorted(self._day_starts, positions, side="right") - 1
+        accumulated: np.ndarray = self._cumulative[column][days]
+        weights = self._weights[column]
+        for i, (first, position) in enumerate(zip(self._day_starts[days], positions)):
+            if position > first:
+                accumulated[i] += np.bincount(self._codes[first:position],
+                                              None if weights is None else weights[first:position],
+                                              minlength=len(self.keys))
+        return accumulated
+
+
+def build_daily_cube(transactions_df: pd.DataFrame) -> DailyCube:
+    """Строит дневной куб транзакций."""
+    return DailyCube(transactions_df)
+
+
+def get_window_bounds(start_dates: Iterable[datetime],
+                      end_dates: Iterable[datetime],
+                      date_objs: Iterable[datetime]) -> tuple[list[Optional[datetime]], list[datetime], list[bool]]:
+    """Возвращает границы диапазонов дат, которые выбирает filter_transactions, в виде аргументов DailyCube.windows."""
+    window_starts: list[Optional[datetime]] = []
+    include_end = []
+    for start_date, date_obj in zip(start_dates, date_objs):
+        include_end.append(start_date == date_obj)
+        window_starts.append(None if start_date == date_obj else start_date)
+    return window_starts, list(end_dates), include_end
+
+
+def get_information_home_page_cube(date_str: str,
+                                   transactions: pd.DataFrame,
+                                   cube: DailyCube,
+                                   currency_rates: list[dict],
+                                   stock_prices: list[dict],
+                                   date_order: Optional[str] = DETECT_ORDER) -> str:
+    """Создает json-строку для страницы 'Главная' по дневному кубу.
+
+    date_order - порядок дат transactions, см. select_date_range.
+    """
+    return get_information_home_page_batch([date_str], transactions, cube, currency_rates, stock_prices,
+                                           date_order)[0]
+
+
+def get_events_information_cube(date_str: str,
+                                transactions: pd.DataFrame,
+                                cube: DailyCube,
+                                currency_rates: list[dict],
+                                stock_prices: list[dict],
+                                data_range: str = "M") -> str:
+    """Создает json-строку для страницы 'События' по дневному кубу."""
+    return get_events_information_batch([date_str], transactions, cube, currency_rates, stock_prices, data_range)[0]
+
+
+def get_information_home_page_batch(date_strs: Sequence[str],
+                                    transactions: pd.DataFrame,
+                                    cube: DailyCube,
+                                    currency_rates: list[dict],
+                                    stock_prices: list[dict],
+                                    date_order: Optional[str] = DETECT_ORDER) -> list[str]:
+    """Создает json-строки для страницы 'Главная' по дневному кубу для каждой даты из date_strs.
+
+    Результат для каждой даты совпадает с get_information_home_page. date_order - порядок дат transactions,
+    см. select_date_range, если он не передан, даты проверяются один раз на весь набор дат.
+    """
+    date_objs, start_dates, end_dates = get_date_windows(date_strs)
+    sums = cube.window_sums(*get_window_bounds(start_dates, end_dates, date_objs))
+    if date_order == DETECT_ORDER:
+        date_order = get_date_order(transactions["Дата операции"])
+
+    pages = []
+    for i, (date_obj, start_date, end_date) in enumerate(zip(date_objs, start_dates, end_dates)):
+        window = filter_transactions(transactions, start_date, end_date, date_obj, date_order)
+        result_dict = {
+            "greeting": get_greeting(date_obj),
+            "cards": make_card_spent_cashback(cube.card_totals({column: sums[column][i] for column in sums})),
+            "top_transactions": get_top_five_transactions(window),
+            "currency_rates": currency_rates,
+            "stock_prices": stock_prices
+        }
+        pages.append(json.dumps(result_dict, indent=4, ensure_ascii=False))
+
+    src_utils_logger.info("Python-объекты преобразованы в JSON-строки для страницы 'Главная' по дневному кубу: %s",
+                          len(pages))
+    return pages
+
+
+def get_events_information_batch(date_strs: Sequence[str],
+                                 transactions: pd.DataFrame,
+                                 cube: DailyCube,
+                                 currency_rates: list[dict],
+                                 stock_prices: list[dict],
+                                 data_range: str = "M") -> list[str]:
+    """Создает json-строки для страницы 'События' по дневному кубу для каждой даты из date_strs.
+
+    Результат для каждой даты совпадает с get_events_information.
+    """
+    date_objs, start_dates, end_dates = get_date_windows(date_strs, data_range)
+    sums = cube.window_sums(*get_window_bounds(start_dates, end_dates, date_objs))
+
+    pages = []
+    for i in range(len(date_objs)):
+        expenses, income = make_expenses_and_income(cube.category_totals({column: sums[column][i] for column in sums}))
+        result = {
+            "expenses": expenses,
+            "income": income,
+            "currency_rates": currency_rates,
+            "stock_prices": stock_prices
+        }
+        pages.append(json.dumps(result, indent=4, ensure_ascii=False))
+
+    src_utils_logger.info("Python-объекты преобразованы в JSON-строки для страницы 'События' по дневному кубу: %s",
+                          len(pages))
+    return pages
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import os
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+from config import ROOT_DIR
+from src.date_index import build_date_order, sort_transactions_by_date
+from src.lazy_import import lazy_import
+from src.logging_config import read_xlsx_logger
+from src.read_xlsx import read_transactions_excel
+
+if TYPE_CHECKING:
+    import pandas as pd
+else:
+    pd = lazy_import("pandas")
+
+DEFAULT_FILEPATH = os.path.join(ROOT_DIR, "data", "operations.xlsx")
+
+
+class TransactionDataset:
+    """Набор транзакций, который считывается из XLSX-файла один раз и разделяется между функциями.
+
+    Транзакции упорядочены по дате операции, поэтому выборка по диапазону дат выполняется бинарным поиском.
+
+    DataFrame и построенные по нему индексы используются всеми вызовами совместно,
+    поэтому их нельзя изменять на месте.
+    """
+
+    def __init__(self, filepath: str = DEFAULT_FILEPATH, compact: bool = False) -> None:
+        self.filepath = filepath
+        self.compact = compact
+        self._frame: Optional[pd.DataFrame] = None
+        self._indexes: dict[str, Any] = {}
+        self._version = 0
+        self._lock = threading.RLock()
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        """Возвращает DataFrame с транзакциями, при первом обращении считывает файл."""
+        with self._lock:
+            if self._frame is None:
+                return self._load()
+            return self._frame
+
+    @property
+    def version(self) -> int:
+        """Возвращает номер версии данных, увеличивающийся при каждой загрузке."""
+        return self._version
+
+    @property
+    def date_order(self) -> Optional[str]:
+        """Возвращает порядок дат операций текущей версии данных для select_date_range."""
+        date_order: Optional[str] = self.get_index("date_order", build_date_order)
+        return date_order
+
+    @property
+    def is_loaded(self) -> bool:
+        """Проверяет, загружены ли данные в память."""
+        return self._frame is not None
+
+    def get_index(self, name: str, builder: Callable[[pd.DataFrame], Any]) -> Any:
+        """Возвращает производный индекс, при необходимости строит его по текущим данным."""
+        with self._lock:
+            frame = self.frame
+            if name not in self._indexes:
+                self._indexes[name] = builder(frame)
+                read_xlsx_logger.info("Построен индекс %s для версии данных %s.", name, self._version)
+            return self._indexes[name]
+
+    def reload(self) -> pd.DataFrame:
+        """Повторно считывает XLSX-файл и сбрасывает построенные индексы."""
+        with self._lock:
+            return self._load()
+
+    def invalidate(self) -> None:
+        """Выгружает данные из памяти, следующее обращение считает файл заново."""
+        with self._lock:
+            self._frame = None
+            self._indexes = {}
+            read_xlsx_logger.info("Данные из файла %s выгружены из памяти.", self.filepath)
+
+    def _load(self) -> pd.DataFrame:
+        frame = sort_transactions_by_date(read_transactions_excel(self.filepath, compact=self.compact))
+        self._frame = frame
+        self._indexes = {}
+        self._version += 1
+        return frame
+
+
+_datasets: dict[tuple[str, bool], TransactionDataset] = {}
+_datasets_lock = threading.Lock()
+
+
+def get_dataset(filepath: str = DEFAULT_FILEPATH, compact: bool = False) -> TransactionDataset:
+    """Возвращает общий для процесса набор транзакций для заданного файла."""
+    with _datasets_lock:
+        key = (filepath, compact)
+        if key not in _datasets:
+            _datasets[key] = TransactionDataset(filepath, compact)
+        return _datasets[key]
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import TYPE_CHECKING, Optional
+
+from src.lazy_import import lazy_import
+from src.logging_config import src_utils_logger
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+else:
+    np = lazy_import("numpy")
+    pd = lazy_import("pandas")
+
+DETECT_ORDER = "detect"
+
+
+def sort_transactions_by_date(transactions_df: pd.DataFrame) -> pd.DataFrame:
+    """Возвращает транзакции, упорядоченные по дате операции.
+
+    Уже упорядоченные (по возрастанию или по убыванию) транзакции возвращаются без копирования,
+    остальные сортируются по убыванию даты. Транзакции с пустой датой не сортируются.
+    """
+    try:
+        dates = transactions_df["Дата операции"]
+        if dates.isna().any():
+            src_utils_logger.warning("Транзакции с пустой датой операции не упорядочены по дате")
+            return transactions_df
+
+        if dates.is_monotonic_decreasing or dates.is_monotonic_increasing:
+            return transactions_df
+
+        sorted_transactions: pd.DataFrame = transactions_df.sort_values("Дата операции", ascending=False,
+                                                                        kind="stable", ignore_index=True)
+        src_utils_logger.info("Транзакции упорядочены по дате операции")
+        return sorted_transactions
+
+    except KeyError as e:
+        src_utils_logger.error("Ошибка сортировки транзакций по дате: %s", e)
+        raise KeyError(f"Ошибка: {e}")
+
+
+def get_date_order(dates: pd.Series) -> Optional[str]:
+    """Возвращает порядок дат "asc" или "desc" либо None, если даты не упорядочены или есть пустые.
+
+    Порядок проверяется по самим датам (один проход без копирования), поэтому сортировка по другому столбцу,
+    объединение или замена столбца не приводят к неверному результату.
+    """
+    if dates.is_monotonic_increasing:
+        return "asc"
+    if dates.is_monotonic_decreasing:
+        return "desc"
+    return None
+
+
+def build_date_order(transactions_df: pd.DataFrame) -> Optional[str]:
+    """Возвращает порядок дат операций транзакций, как get_date_order.
+
+    Строится один раз на версию данных: get_dataset().get_index("date_order", build_date_order).
+    """
+    return get_date_order(transactions_df["Дата операции"])
+
+
+def select_date_range(transactions_df: pd.DataFrame,
+                      start_date: Optional[datetime] = None,
+                      end_date: Optional[datetime] = None,
+                      include_end: bool = False,
+                      date_order: Optional[str] = DETECT_ORDER) -> pd.DataFrame:
+    """Возвращает транзакции с датой операции в диапазоне [start_date, end_date).
+
+    Для транзакций, упорядоченных по дате (см. sort_transactions_by_date), диапазон находится
+    бинарным поиском и возвращается срез без копирования данных, для остальных - строится булева маска.
+    date_order - порядок дат, заранее найденный get_date_order для этих транзакций (например, один раз
+    на версию данных, см. TransactionDataset.date_order), тогда даты не просматриваются. По умолчанию
+    порядок проверяется по датам за один проход.
+    """
+    dates = transactions_df["Дата операции"]
+    order = get_date_order(dates) if date_order == DETECT_ORDER else date_order
+
+    if order is None:
+        mask = pd.Series(True, index=transactions_df.index)
+        if start_date is not None:
+            mask &= dates >= start_date
+        if end_date is not None:
+            mask &= (dates <= end_date) if include_end else (dates < end_date)
+        selected: pd.DataFrame = transactions_df[mask]
+        return selected
+
+    values = dates.to_numpy()
+    if order == "desc":
+        values = values[::-1]
+
+    size = len(values)
+    lower = 0 if start_date is None else int(np.searchsorted(values, pd.Timestamp(start_date).to_datetime64(),
+                                                             side="left"))
+    upper = size if end_date is None else int(np.searchsorted(values, pd.Timestamp(end_date).to_datetime64(),
+                                                              side="right" if include_end else "left"))
+    if order == "desc":
+        lower, upper = size - upper, size - lower
+
+    return transactions_df.iloc[lower:upper]
@@ -1,33 +1,237 @@
+from __future__ import annotations
+
 import json
 import os
-
-import requests
-from dotenv import load_dotenv
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Optional
 
 from config import ROOT_DIR
+from src.lazy_import import lazy_import
 from src.logging_config import external_api_logger
+from src.metrics import instrument
+from src.quote_cache import QuoteCache
+
+if TYPE_CHECKING:
+    import requests
+
+    from src.http_client import HttpClient
+else:
+    requests = lazy_import("requests")
+
+API_URL = "https://api.twelvedata.com"
+MAX_WORKERS = 8
+BATCH_SIZE = 120
+
+
+def get_http_client() -> HttpClient:
+    """Возвращает общий для процесса HTTP-клиент. requests импортируется при первом вызове."""
+    from src import http_client
+
+    return http_client.get_http_client()
+
+
+def fetch_json(urls: list[str],
+               parallel: bool = False,
+               max_workers: int = MAX_WORKERS,
+               timeout: Optional[float] = None,
+               client: Optional[HttpClient] = None) -> list[dict]:
+    """Выполняет GET-запросы и возвращает JSON-ответы в порядке адресов urls.
+
+    В параллельном режиме запросы отправляются одновременно из пула не более чем max_workers потоков.
+    Запросы выполняются через общий HTTP-клиент с постоянными соединениями и повторами.
+    """
+    http_client = client or get_http_client()
+
+    def fetch(url: str) -> dict:
+        return http_client.get_json(url, timeout)
+
+    if not parallel or len(urls) <= 1:
+        return [fetch(url) for url in urls]
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as executor:
+        return list(executor.map(fetch, urls))
+
+
+def split_batch_response(symbols: list[str], response: dict) -> list[dict]:
+    """Разбирает ответ на запрос нескольких символов через запятую в список ответов по каждому символу.
+
+    На запрос одного символа API возвращает ответ без вложенности. Если символа нет в ответе
+    (например, API вернул ошибку на весь запрос), для него возвращается весь ответ.
+    """
+    if len(symbols) == 1:
+        return [response]
+    return [response.get(symbol, response) for symbol in symbols]
+
+
+class QuoteProvider(ABC):
+    """Источник котировок: по названию метода API (exchange_rate, price) и списку символов возвращает ответы."""
+
+    source: str = ""
+
+    @abstractmethod
+    def fetch(self, endpoint: str, symbols: list[str]) -> list[dict]:
+        """Возвращает ответы API для символов symbols в том же порядке."""
+
+
+class TwelvedataProvider(QuoteProvider):
+    """Котировки из API twelvedata.com.
+
+    При parallel=True запросы по символам отправляются одновременно из пула не более чем max_workers потоков.
+    Если задан batch_size, символы передаются списками через запятую, не более batch_size в одном запросе.
+    """
 
+    def __init__(self,
+                 api_url: str = API_URL,
+                 api_key: Optional[str] = None,
+                 parallel: bool = False,
+                 max_workers: int = MAX_WORKERS,
+                 timeout: Optional[float] = None,
+                 client: Optional[HttpClient] = None,
+                 batch_size: Optional[int] = None) -> None:
+        if api_key is None:
+            from dotenv import load_dotenv
 
-def get_currency_rates() -> list[dict]:
-    """Получает данные о курсе заданных валют к рублю."""
+            load_dotenv()
+            api_key = os.getenv('API_KEY_twelvedata')
+        self.source = api_url
+        self.api_key = api_key
+        self.parallel = parallel
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.client = client
+        self.batch_size = batch_size
+
+    def make_url(self, endpoint: str, symbol: str) -> str:
+        """Возвращает адрес запроса для символа или списка символов через запятую."""
+        return f"{self.source}/{endpoint}?symbol={symbol}&apikey={self.api_key}&source=docs"
+
+    def fetch(self, endpoint: str, symbols: list[str]) -> list[dict]:
+        """Возвращает ответы API для символов symbols в том же порядке."""
+        if self.batch_size is None:
+            batches = [[symbol] for symbol in symbols]
+        else:
+            batches = [symbols[i:i + self.batch_size] for i in range(0, len(symbols), self.batch_size)]
+
+        urls = [self.make_url(endpoint, ",".join(batch)) for batch in batches]
+        responses = fetch_json(urls, self.parallel, self.max_workers, self.timeout, self.client)
+        return [quote
+                for batch, response in zip(batches, responses)
+                for quote in split_batch_response(batch, response)]
+
+
+def read_recorded_quotes(path: str) -> dict[str, dict[str, dict]]:
+    """Считывает записанные ответы API: {метод API: {символ: ответ}}."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            recorded: dict[str, dict[str, dict]] = json.load(f)
+        return recorded
+    except FileNotFoundError:
+        return {}
+
+
+class ReplayQuoteProvider(QuoteProvider):
+    """Котировки из файла с записанными ответами API без обращения к сети.
+
+    Каждый вызов fetch выполняется с искусственной задержкой latency секунд, имитирующей запрос к API.
+    """
+
+    def __init__(self, path: str, latency: float = 0.0) -> None:
+        self.source = path
+        self.latency = latency
+        self.responses = read_recorded_quotes(path)
+
+    def fetch(self, endpoint: str, symbols: list[str]) -> list[dict]:
+        """Возвращает записанные ответы для символов symbols в том же порядке."""
+        if self.latency:
+            time.sleep(self.latency)
+        try:
+            return [self.responses[endpoint][symbol] for symbol in symbols]
+        except KeyError as e:
+            external_api_logger.error("Нет записанного ответа %s для символа %s в файле %s.", endpoint, e, self.source)
+            raise KeyError(f"Ошибка: {e}")
+
+
+class RecordingQuoteProvider(QuoteProvider):
+    """Запрашивает котировки у provider и дописывает полученные ответы в файл для ReplayQuoteProvider."""
+
+    def __init__(self, provider: QuoteProvider, path: str) -> None:
+        self.provider = provider
+        self.source = provider.source
+        self.path = path
+        self.responses = read_recorded_quotes(path)
+        self._lock = threading.Lock()
+
+    def fetch(self, endpoint: str, symbols: list[str]) -> list[dict]:
+        """Возвращает ответы provider и сохраняет их в файл."""
+        responses = self.provider.fetch(endpoint, symbols)
+        with self._lock:
+            self.responses.setdefault(endpoint, {}).update(zip(symbols, responses))
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.responses, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+        return responses
+
+
+def fetch_quotes(symbols: dict[str, str],
+                 provider: QuoteProvider,
+                 endpoint: str,
+                 field: str,
+                 cache: Optional[QuoteCache] = None) -> list[Optional[dict]]:
+    """Возвращает ответы provider по словарю symbols (ключ кэша: символ) в порядке ключей.
+
+    Если передан кэш, запрашиваются только отсутствующие в нем котировки, устаревшие обновляются в фоне.
+    В кэш попадают только ответы, содержащие поле field. Пока API недоступен, кэш продолжает
+    возвращать последние известные котировки, для отсутствующих в нем возвращается None.
+    """
+    def fetch_many(keys: list[str]) -> list[dict]:
+        return provider.fetch(endpoint, [symbols[key] for key in keys])
+
+    if cache is None:
+        return list(fetch_many(list(symbols)))
+    return cache.get_many(list(symbols), fetch_many, lambda response: field in response)
+
+
+@instrument()
+def get_currency_rates(parallel: bool = False,
+                       max_workers: int = MAX_WORKERS,
+                       timeout: Optional[float] = None,
+                       api_url: str = API_URL,
+                       cache: Optional[QuoteCache] = None,
+                       client: Optional[HttpClient] = None,
+                       batch_size: Optional[int] = None,
+                       provider: Optional[QuoteProvider] = None) -> list[dict]:
+    """Получает данные о курсе заданных валют к рублю.
+
+    Курсы запрашиваются у provider, по умолчанию - у TwelvedataProvider с параметрами parallel, max_workers,
+    timeout, api_url, client и batch_size (см. TwelvedataProvider). Если передан кэш котировок,
+    курсы берутся из него.
+    """
     file_name = os.path.join(ROOT_DIR, "user_settings.json")
+    source = api_url if provider is None else provider.source
     try:
-        external_api_logger.info(f"Чтение json-файла {file_name}.")
+        external_api_logger.info("Чтение json-файла %s.", file_name)
         with open(file_name) as f:
             data = json.load(f)
 
         valid_for_conversion = data["user_currencies"]
 
-        load_dotenv()
-        api_key = os.getenv('API_KEY_twelvedata')
+        if provider is None:
+            provider = TwelvedataProvider(api_url, None, parallel, max_workers, timeout, client, batch_size)
 
         currency_rates = []
         cur_to = "RUB"
-        external_api_logger.info("Запрос к API https://api.twelvedata.com/exchange_rate")
-        for cur in valid_for_conversion:
-            url = f"https://api.twelvedata.com/exchange_rate?symbol={cur}/{cur_to}&apikey={api_key}&source = docs"
-            response = requests.get(url).json()
+        external_api_logger.info("Запрос к API %s/exchange_rate", source)
+        symbols = {f"exchange_rate:{cur}/{cur_to}": f"{cur}/{cur_to}" for cur in valid_for_conversion}
+        responses = fetch_quotes(symbols, provider, "exchange_rate", "rate", cache)
 
+        for cur, response in zip(valid_for_conversion, responses):
+            if response is None:
+                external_api_logger.warning("Курс %s/%s недоступен.", cur, cur_to)
+                continue
             result = round(float(response["rate"]), 2)
 
             currency_rate = dict()
@@ -35,52 +239,69 @@ def get_currency_rates() -> list[dict]:
             currency_rate["rate"] = result
             currency_rates.append(currency_rate)
 
-        external_api_logger.info("Получены данные с API https://api.twelvedata.com/exchange_rate")
+        external_api_logger.info("Получены данные с API %s/exchange_rate", source)
         return currency_rates
 
     except FileNotFoundError as e:
-        external_api_logger.error(f"Json-файл {file_name} не найден.")
+        external_api_logger.error("Json-файл %s не найден.", file_name)
         raise FileNotFoundError(f"Ошибка чтения файла: {e}.")
 
     except requests.exceptions.RequestException as e:
-        external_api_logger.warning(f"Ошибка запроса к API https://api.twelvedata.com/exchange_rate: {e}.")
+        external_api_logger.warning("Ошибка запроса к API %s/exchange_rate: %s.", source, e)
         print("Ошибка запроса к API:", e)
         return []
 
 
-def get_stock_prices() -> list[dict]:
-    """Получает данные о cтоимости заданных акций из S&P500 в рублях."""
+@instrument()
+def get_stock_prices(parallel: bool = False,
+                     max_workers: int = MAX_WORKERS,
+                     timeout: Optional[float] = None,
+                     api_url: str = API_URL,
+                     cache: Optional[QuoteCache] = None,
+                     client: Optional[HttpClient] = None,
+                     batch_size: Optional[int] = None,
+                     provider: Optional[QuoteProvider] = None) -> list[dict]:
+    """Получает данные о cтоимости заданных акций из S&P500 в рублях.
+
+    Стоимость запрашивается у provider, по умолчанию - у TwelvedataProvider с параметрами parallel, max_workers,
+    timeout, api_url, client и batch_size (см. TwelvedataProvider). Если передан кэш котировок,
+    стоимость акций берется из него.
+    """
     file_name = os.path.join(ROOT_DIR, "user_settings.json")
+    source = api_url if provider is None else provider.source
     try:
-        external_api_logger.info(f"Чтение json-файла {file_name}.")
+        external_api_logger.info("Чтение json-файла %s.", file_name)
         with open(file_name) as f:
             data = json.load(f)
 
         valid_stocks = data["user_stocks"]
 
-        load_dotenv()
-        api_key = os.getenv('API_KEY_twelvedata')
+        if provider is None:
+            provider = TwelvedataProvider(api_url, None, parallel, max_workers, timeout, client, batch_size)
 
         stock_prices = []
-        external_api_logger.info("Запрос к API https://api.twelvedata.com/price")
-        for stock in valid_stocks:
-            url = f"https://api.twelvedata.com/price?symbol={stock}&apikey={api_key}&source=docs"
-            response = requests.get(url).json()
+        external_api_logger.info("Запрос к API %s/price", source)
+        symbols = {f"price:{stock}": stock for stock in valid_stocks}
+        responses = fetch_quotes(symbols, provider, "price", "price", cache)
 
+        for stock, response in zip(valid_stocks, responses):
+            if response is None:
+                external_api_logger.warning("Стоимость акции %s недоступна.", stock)
+                continue
             stock_price = dict()
             stock_price["stock"] = stock
             stock_price.update(response)
             stock_price["price"] = round(float(stock_price["price"]), 2)
             stock_prices.append(stock_price)
 
-        external_api_logger.info("Получены данные с API https://api.twelvedata.com/price")
+        external_api_logger.info("Получены данные с API %s/price", source)
         return stock_prices
 
     except FileNotFoundError as e:
-        external_api_logger.error(f"Json-файл {file_name} не найден.")
+        external_api_logger.error("Json-файл %s не найден.", file_name)
         raise FileNotFoundError(f"Ошибка чтения файла: {e}.")
 
     except requests.exceptions.RequestException as e:
-        external_api_logger.warning(f"Ошибка запроса к API https://api.twelvedata.com/price: {e}.")
+        external_api_logger.warning("Ошибка запроса к API %s/price: %s.", source, e)
         print("Ошибка запроса к API:", e)
         return []
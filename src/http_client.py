@@ -0,0 +1,176 @@
+import random
+import threading
+import time
+from typing import Callable, Optional, Union
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.logging_config import external_api_logger
+
+POOL_SIZE = 8
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT = 10
+RETRIES = 2
+BACKOFF_FACTOR = 0.2
+BACKOFF_MAX = 2.0
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+FAILURE_THRESHOLD = 5
+RESET_TIMEOUT = 30.0
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Запрос не выполнен, потому что сервис временно отключен автоматическим выключателем."""
+
+
+class CircuitBreaker:
+    """Автоматический выключатель: после failure_threshold ошибок подряд запросы отклоняются
+    в течение reset_timeout секунд, затем пропускается один пробный запрос.
+    """
+
+    def __init__(self,
+                 failure_threshold: int = FAILURE_THRESHOLD,
+                 reset_timeout: float = RESET_TIMEOUT,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Возвращает состояние выключателя: closed, open или half_open."""
+        with self._lock:
+            if self.opened_at is None:
+                return "closed"
+            if self.clock() - self.opened_at < self.reset_timeout:
+                return "open"
+            return "half_open"
+
+    def allow(self) -> bool:
+        """Проверяет, можно ли выполнить запрос."""
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if self.clock() - self.opened_at < self.reset_timeout or self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self) -> None:
+        """Замыкает выключатель после успешного запроса."""
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        """Учитывает ошибку запроса, при достижении порога размыкает выключатель."""
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self.failures >= self.failure_threshold:
+                self.opened_at = self.clock()
+
+
+class HttpClient:
+    """HTTP-клиент с пулом постоянных соединений, таймаутами, повторами и автоматическим выключателем.
+
+    Повторы выполняются при сетевых ошибках и ответах с кодами RETRY_STATUSES,
+    пауза между ними растет экспоненциально со случайным разбросом (full jitter).
+    Для каждого хоста используется отдельный выключатель.
+    """
+
+    def __init__(self,
+                 pool_size: int = POOL_SIZE,
+                 connect_timeout: float = CONNECT_TIMEOUT,
+                 read_timeout: float = READ_TIMEOUT,
+                 retries: int = RETRIES,
+                 backoff_factor: float = BACKOFF_FACTOR,
+                 backoff_max: float = BACKOFF_MAX,
+                 failure_threshold: int = FAILURE_THRESHOLD,
+                 reset_timeout: float = RESET_TIMEOUT,
+                 sleep: Callable[[float], None] = time.sleep) -> None:
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.sleep = sleep
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get_breaker(self, url: str) -> CircuitBreaker:
+        """Возвращает выключатель для хоста из адреса url."""
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            return self._breakers[host]
+
+    def get_backoff(self, attempt: int) -> float:
+        """Возвращает паузу перед повтором с номером attempt (начиная с 0)."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_factor * 2 ** attempt))
+
+    def get_json(self, url: str, timeout: Optional[float] = None) -> dict:
+        """Выполняет GET-запрос и возвращает JSON-ответ.
+
+        timeout задает общий таймаут подключения и чтения, по умолчанию используются connect_timeout и read_timeout.
+        """
+        breaker = self.get_breaker(url)
+        if not breaker.allow():
+            raise CircuitOpenError(f"Сервис {urlparse(url).netloc} временно недоступен.")
+
+        request_timeout: Union[float, tuple[float, float]] = (
+            (self.connect_timeout, self.read_timeout) if timeout is None else timeout
+        )
+        attempt = 0
+        while True:
+            try:
+                response = self.session.get(url, timeout=request_timeout)
+                if response.status_code in RETRY_STATUSES:
+                    response.raise_for_status()
+                result: dict = response.json()
+            except (requests.exceptions.ConnectionError,
+                    requests.exceptions.Timeout,
+                    requests.exceptions.HTTPError) as e:
+                if attempt >= self.retries:
+                    breaker.record_failure()
+                    raise
+                external_api_logger.warning("Ошибка запроса %s, повтор %s: %s.", urlparse(url).path, attempt + 1, e)
+                self.sleep(self.get_backoff(attempt))
+                attempt += 1
+                continue
+            except requests.exceptions.RequestException:
+                breaker.record_failure()
+                raise
+
+            breaker.record_success()
+            return result
+
+    def close(self) -> None:
+        """Закрывает соединения пула."""
+        self.session.close()
+
+
+_http_client: Optional[HttpClient] = None
+_http_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """Возвращает общий для процесса HTTP-клиент."""
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None:
+            _http_client = HttpClient()
+        return _http_client
@@ -0,0 +1,25 @@
+import importlib
+from typing import Any
+
+
+class LazyModule:
+    """Модуль, который импортируется при первом обращении к его атрибуту.
+
+    Полученные атрибуты сохраняются в объекте, поэтому повторное обращение не медленнее обычного.
+    """
+
+    def __init__(self, name: str) -> None:
+        self._name = name
+
+    def __getattr__(self, attr: str) -> Any:
+        value = getattr(importlib.import_module(self._name), attr)
+        setattr(self, attr, value)
+        return value
+
+    def __repr__(self) -> str:
+        return f"<lazy module '{self._name}'>"
+
+
+def lazy_import(name: str) -> Any:
+    """Возвращает модуль name, который будет импортирован при первом обращении к его атрибуту."""
+    return LazyModule(name)
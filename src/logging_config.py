@@ -1,56 +1,144 @@
+import atexit
+import json
 import logging
 import os.path
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
+from typing import Optional
 
 from config import ROOT_DIR
 
-Path(os.path.join(ROOT_DIR, "logs")).mkdir(parents=True, exist_ok=True)
-
-read_xlsx_logger = logging.getLogger("read_xlsx_logger")
-read_xlsx_handler = logging.FileHandler(os.path.join(ROOT_DIR, "logs", "read_xlsx.log"),
-                                        "w", encoding="utf-8")
-read_xlsx_formatter = logging.Formatter("%(asctime)s - %(filename)s - %(levelname)s - %(message)s",
-                                        datefmt="%Y-%m-%d %H:%M:%S")
-read_xlsx_handler.setFormatter(read_xlsx_formatter)
-read_xlsx_logger.addHandler(read_xlsx_handler)
-read_xlsx_logger.setLevel(logging.DEBUG)
-
-
-external_api_logger = logging.getLogger("external_api_logger")
-external_api_handler = logging.FileHandler(os.path.join(ROOT_DIR, "logs", "external_api.log"),
-                                           "w", encoding="utf-8")
-external_api_formatter = logging.Formatter("%(asctime)s - %(filename)s - %(levelname)s - %(message)s",
-                                           datefmt="%Y-%m-%d %H:%M:%S")
-external_api_handler.setFormatter(external_api_formatter)
-external_api_logger.addHandler(external_api_handler)
-external_api_logger.setLevel(logging.DEBUG)
-
-
-src_utils_logger = logging.getLogger("src_utils_logger")
-src_utils_handler = logging.FileHandler(os.path.join(ROOT_DIR, "logs", "src_utils.log"),
-                                        "w", encoding="utf-8")
-src_utils_formatter = logging.Formatter("%(asctime)s - %(filename)s - %(levelname)s - %(message)s",
-                                        datefmt="%Y-%m-%d %H:%M:%S")
-src_utils_handler.setFormatter(src_utils_formatter)
-src_utils_logger.addHandler(src_utils_handler)
-src_utils_logger.setLevel(logging.DEBUG)
-
-
-services_logger = logging.getLogger("services_logger")
-services_handler = logging.FileHandler(os.path.join(ROOT_DIR, "logs", "services.log"),
-                                       "w", encoding="utf-8")
-services_formatter = logging.Formatter("%(asctime)s - %(filename)s - %(levelname)s - %(message)s",
-                                       datefmt="%Y-%m-%d %H:%M:%S")
-services_handler.setFormatter(services_formatter)
-services_logger.addHandler(services_handler)
-services_logger.setLevel(logging.DEBUG)
-
-
-reports_logger = logging.getLogger("reports_logger")
-reports_handler = logging.FileHandler(os.path.join(ROOT_DIR, "logs", "reports.log"),
-                                      "w", encoding="utf-8")
-reports_formatter = logging.Formatter("%(asctime)s - %(filename)s - %(levelname)s - %(message)s",
-                                      datefmt="%Y-%m-%d %H:%M:%S")
-reports_handler.setFormatter(reports_formatter)
-reports_logger.addHandler(reports_handler)
-reports_logger.setLevel(logging.DEBUG)
+LOGS_DIR = os.path.join(ROOT_DIR, "logs")
+SETTINGS_PATH = os.path.join(ROOT_DIR, "user_settings.json")
+DEFAULT_LEVEL = "DEBUG"
+LOG_FORMAT = "%(asctime)s - %(filename)s - %(levelname)s - %(message)s"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+MAX_BYTES = 5 * 1024 * 1024
+BACKUP_COUNT = 3
+LOG_FILES = {
+    "read_xlsx_logger": "read_xlsx.log",
+    "external_api_logger": "external_api.log",
+    "src_utils_logger": "src_utils.log",
+    "services_logger": "services.log",
+    "reports_logger": "reports.log",
+    "views_logger": "views.log"
+}
+
+
+def read_log_levels(path: str = SETTINGS_PATH) -> dict[str, str]:
+    """Возвращает уровни логирования из раздела "log_levels" файла настроек."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            log_levels = json.load(f).get("log_levels", {})
+    except (OSError, ValueError, AttributeError):
+        return {}
+    return log_levels if isinstance(log_levels, dict) else {}
+
+
+class LogFileRouter(logging.Handler):
+    """Записывает записи каждого логгера в свой файл в каталоге logs. Файл открывается при первой записи.
+
+    Записи дописываются в конец файла, так как фоновый поток перезапускается (после stop и в дочерних
+    процессах) и не должен стирать записанное. Файл больше max_bytes переименовывается в <файл>.1
+    (хранится не больше backup_count копий).
+    """
+
+    def __init__(self,
+                 log_files: dict[str, str],
+                 logs_dir: str = LOGS_DIR,
+                 max_bytes: int = MAX_BYTES,
+                 backup_count: int = BACKUP_COUNT) -> None:
+        super().__init__()
+        self.log_files = log_files
+        self.logs_dir = logs_dir
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._handlers: dict[str, logging.Handler] = {}
+
+    def emit(self, record: logging.LogRecord) -> None:
+        handler = self._handlers.get(record.name)
+        if handler is None:
+            if record.name not in self.log_files:
+                return
+            Path(self.logs_dir).mkdir(parents=True, exist_ok=True)
+            handler = RotatingFileHandler(os.path.join(self.logs_dir, self.log_files[record.name]), "a",
+                                          self.max_bytes, self.backup_count, encoding="utf-8")
+            handler.setFormatter(logging.Formatter(LOG_FORMAT, datefmt=DATE_FORMAT))
+            self._handlers[record.name] = handler
+        handler.handle(record)
+
+    def close(self) -> None:
+        for handler in self._handlers.values():
+            handler.close()
+        self._handlers = {}
+        super().close()
+
+
+class LazyQueueHandler(QueueHandler):
+    """Передает записи в очередь, которую в фоновом потоке разбирает один QueueListener.
+
+    Поток и файлы логов создаются при первой записи (в каждом процессе отдельно). Сообщение
+    форматируется в фоновом потоке, поэтому аргументы записи не должны изменяться после вызова логгера.
+    """
+
+    def __init__(self, log_files: dict[str, str] = LOG_FILES, logs_dir: str = LOGS_DIR) -> None:
+        super().__init__(queue.SimpleQueue())
+        self.log_files = log_files
+        self.logs_dir = logs_dir
+        self._listener: Optional[QueueListener] = None
+        self._pid: Optional[int] = None
+        self._start_lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if self._pid != os.getpid():
+            self.start()
+        super().emit(record)
+
+    def start(self) -> None:
+        """Запускает фоновый поток записи логов в текущем процессе."""
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            self.queue = queue.SimpleQueue()
+            self._listener = QueueListener(self.queue, LogFileRouter(self.log_files, self.logs_dir))
+            self._listener.start()
+            # В дочерних процессах multiprocessing при выходе atexit не вызывается, только Finalize
+            import multiprocessing.util
+
+            atexit.register(self.stop)
+            multiprocessing.util.Finalize(None, self.stop, exitpriority=0)
+            self._pid = os.getpid()
+
+    def stop(self) -> None:
+        """Записывает оставшиеся записи и останавливает фоновый поток."""
+        with self._start_lock:
+            if self._listener is not None and self._pid == os.getpid():
+                self._listener.stop()
+                for handler in self._listener.handlers:
+                    handler.close()
+            self._listener = None
+            self._pid = None
+
+
+def setup_logger(name: str, handler: logging.Handler, log_levels: dict[str, str]) -> logging.Logger:
+    """Возвращает логгер name с общим обработчиком и уровнем из настроек."""
+    logger = logging.getLogger(name)
+    logger.addHandler(handler)
+    logger.setLevel(str(log_levels.get(name, DEFAULT_LEVEL)).upper())
+    return logger
+
+
+queue_handler = LazyQueueHandler()
+_log_levels = read_log_levels()
+
+read_xlsx_logger = setup_logger("read_xlsx_logger", queue_handler, _log_levels)
+external_api_logger = setup_logger("external_api_logger", queue_handler, _log_levels)
+src_utils_logger = setup_logger("src_utils_logger", queue_handler, _log_levels)
+services_logger = setup_logger("services_logger", queue_handler, _log_levels)
+reports_logger = setup_logger("reports_logger", queue_handler, _log_levels)
+views_logger = setup_logger("views_logger", queue_handler, _log_levels)
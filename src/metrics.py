@@ -0,0 +1,212 @@
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import deque
+from functools import wraps
+from typing import TYPE_CHECKING, Any, Callable, Optional, TypeVar, cast
+
+from src.lazy_import import lazy_import
+
+if TYPE_CHECKING:
+    import numpy as np
+else:
+    np = lazy_import("numpy")
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+MAX_SAMPLES = 10_000
+QUANTILES = (0.5, 0.95, 0.99)
+METRICS = {
+    "wall_seconds": "Время выполнения функции, с",
+    "cpu_seconds": "Процессорное время потока, выполнявшего функцию, с",
+    "input_rows": "Число строк во входных данных функции",
+    "memory_peak_bytes": "Пиковый объем памяти, выделенной во время вызова, байт"
+}
+
+
+def get_input_rows(args: tuple, kwargs: dict) -> Optional[int]:
+    """Возвращает число строк первого аргумента - DataFrame, Series или списка, либо None.
+
+    pandas не импортируется: если он еще не импортирован (или импортируется в другом потоке),
+    аргументов-DataFrame быть не может.
+    """
+    pandas = sys.modules.get("pandas")
+    if pandas is not None and hasattr(pandas, "Series"):
+        row_types: tuple[Any, ...] = (pandas.DataFrame, pandas.Series, list)
+    else:
+        row_types = (list,)
+    for value in (*args, *kwargs.values()):
+        if isinstance(value, row_types):
+            return len(value)
+    return None
+
+
+class FunctionMetrics:
+    """Последние max_samples измерений одной функции и число вызовов и ошибок за все время."""
+
+    def __init__(self, max_samples: int = MAX_SAMPLES) -> None:
+        self.calls = 0
+        self.errors = 0
+        self.totals = dict.fromkeys(METRICS, 0.0)
+        self.samples: dict[str, deque] = {metric: deque(maxlen=max_samples) for metric in METRICS}
+
+    def add(self, values: dict[str, Optional[float]], error: bool) -> None:
+        """Добавляет измерения одного вызова. Значения None не сохраняются."""
+        self.calls += 1
+        self.errors += error
+        for metric, value in values.items():
+            if value is not None:
+                self.totals[metric] += value
+                self.samples[metric].append(value)
+
+    def summary(self) -> dict:
+        """Возвращает число вызовов, ошибок и квантили p50/p95/p99 каждой метрики."""
+        summary: dict[str, Any] = {"calls": self.calls, "errors": self.errors}
+        for metric, samples in self.samples.items():
+            if not samples:
+                continue
+            quantiles = np.quantile(np.fromiter(samples, dtype=float), QUANTILES)
+            summary[metric] = {
+                "count": len(samples),
+                "sum": self.totals[metric],
+                **{f"p{round(q * 100)}": float(value) for q, value in zip(QUANTILES, quantiles)}
+            }
+        return summary
+
+
+class MetricsRegistry:
+    """Измерения вызовов функций, отмеченных декоратором instrument.
+
+    Для каждого вызова сохраняются время выполнения, процессорное время и число входных строк.
+    Если включен trace_memory, дополнительно сохраняется пиковый объем выделенной памяти (tracemalloc);
+    он измеряется только для внешнего вызова, при вложенных вызовах уже запущенная трассировка не сбрасывается.
+    """
+
+    def __init__(self, trace_memory: bool = False, max_samples: int = MAX_SAMPLES) -> None:
+        self.trace_memory = trace_memory
+        self.max_samples = max_samples
+        self._functions: dict[str, FunctionMetrics] = {}
+        self._lock = threading.Lock()
+
+    def record(self,
+               name: str,
+               wall_seconds: float,
+               cpu_seconds: float,
+               input_rows: Optional[int] = None,
+               memory_peak_bytes: Optional[int] = None,
+               error: bool = False) -> None:
+        """Сохраняет измерения одного вызова функции name."""
+        values = {
+            "wall_seconds": wall_seconds,
+            "cpu_seconds": cpu_seconds,
+            "input_rows": input_rows,
+            "memory_peak_bytes": memory_peak_bytes
+        }
+        with self._lock:
+            if name not in self._functions:
+                self._functions[name] = FunctionMetrics(self.max_samples)
+            self._functions[name].add(values, error)
+
+    def summary(self) -> dict[str, dict]:
+        """Возвращает сводку измерений по каждой функции."""
+        with self._lock:
+            return {name: metrics.summary() for name, metrics in sorted(self._functions.items())}
+
+    def to_json(self) -> str:
+        """Возвращает сводку измерений JSON-строкой."""
+        return json.dumps(self.summary(), ensure_ascii=False, indent=4)
+
+    def to_prometheus(self) -> str:
+        """Возвращает сводку измерений в текстовом формате Prometheus (метрики типа summary)."""
+        summary = self.summary()
+        lines = [
+            "# HELP function_calls_total Число вызовов функции",
+            "# TYPE function_calls_total counter",
+            *(f'function_calls_total{{function="{name}"}} {stats["calls"]}' for name, stats in summary.items()),
+            "# HELP function_errors_total Число вызовов функции, завершившихся исключением",
+            "# TYPE function_errors_total counter",
+            *(f'function_errors_total{{function="{name}"}} {stats["errors"]}' for name, stats in summary.items())
+        ]
+        for metric, description in METRICS.items():
+            lines += [f"# HELP function_{metric} {description}", f"# TYPE function_{metric} summary"]
+            for name, stats in summary.items():
+                if metric not in stats:
+                    continue
+                for q in QUANTILES:
+                    value = stats[metric][f"p{round(q * 100)}"]
+                    lines.append(f'function_{metric}{{function="{name}",quantile="{q}"}} {value!r}')
+                lines.append(f'function_{metric}_sum{{function="{name}"}} {stats[metric]["sum"]!r}')
+                lines.append(f'function_{metric}_count{{function="{name}"}} {stats[metric]["count"]}')
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str, fmt: str = "json") -> None:
+        """Записывает сводку измерений в файл в формате "json" или "prometheus"."""
+        if fmt == "json":
+            text = self.to_json()
+        elif fmt == "prometheus":
+            text = self.to_prometheus()
+        else:
+            raise ValueError(f"Неизвестный формат метрик: {fmt}")
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+
+    def clear(self) -> None:
+        """Удаляет все измерения."""
+        with self._lock:
+            self._functions = {}
+
+
+_metrics_registry: Optional[MetricsRegistry] = None
+_metrics_registry_lock = threading.Lock()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Возвращает общий для процесса реестр измерений."""
+    global _metrics_registry
+    with _metrics_registry_lock:
+        if _metrics_registry is None:
+            _metrics_registry = MetricsRegistry()
+        return _metrics_registry
+
+
+def instrument(name: Optional[str] = None, registry: Optional[MetricsRegistry] = None) -> Callable[[F], F]:
+    """Декоратор для измерения времени, процессорного времени, числа входных строк и памяти вызовов функции.
+
+    Измерения сохраняются в registry (по умолчанию - общий реестр get_metrics_registry) под именем
+    name (по умолчанию - "<модуль>.<функция>").
+    """
+    def wrapper(func: F) -> F:
+        metric_name = name or f"{func.__module__}.{func.__qualname__}"
+
+        @wraps(func)
+        def inner(*args: Any, **kwargs: Any) -> Any:
+            metrics_registry = registry or get_metrics_registry()
+            trace_memory = metrics_registry.trace_memory and not tracemalloc.is_tracing()
+            if trace_memory:
+                tracemalloc.start()
+            start_wall = time.perf_counter()
+            start_cpu = time.thread_time()
+            error = True
+            try:
+                result = func(*args, **kwargs)
+                error = False
+                return result
+
+            finally:
+                wall_seconds = time.perf_counter() - start_wall
+                cpu_seconds = time.thread_time() - start_cpu
+                memory_peak = None
+                if trace_memory:
+                    memory_peak = tracemalloc.get_traced_memory()[1]
+                    tracemalloc.stop()
+                metrics_registry.record(metric_name, wall_seconds, cpu_seconds, get_input_rows(args, kwargs),
+                                        memory_peak, error)
+
+        return cast(F, inner)
+    return wrapper
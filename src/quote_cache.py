@@ -0,0 +1,174 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+
+from config import ROOT_DIR
+from src.logging_config import external_api_logger
+
+CACHE_VERSION = 1
+DEFAULT_CACHE_PATH = os.path.join(ROOT_DIR, "data", "quotes.cache.json")
+DEFAULT_TTL = 15 * 60
+
+
+class QuoteCache:
+    """Кэш котировок с временем жизни записи и сохранением на диск.
+
+    Свежая запись возвращается из кэша. Устаревшая запись тоже возвращается сразу,
+    а ее обновление запускается в фоновом потоке (stale-while-revalidate).
+    Отсутствующие записи запрашиваются синхронно, при ошибке запроса вместо них возвращается None.
+    """
+
+    def __init__(self,
+                 path: Optional[str] = DEFAULT_CACHE_PATH,
+                 ttl: float = DEFAULT_TTL,
+                 ttls: Optional[dict[str, float]] = None,
+                 clock: Callable[[], float] = time.time) -> None:
+        self.path = path
+        self.ttl = ttl
+        self.ttls = ttls or {}
+        self.clock = clock
+        self._entries: dict[str, dict] = {}
+        self._refreshing: set[str] = set()
+        self._futures: list[Future] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._counters = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "refresh_errors": 0}
+        self._lock = threading.RLock()
+        self._load()
+
+    def get_ttl(self, key: str) -> float:
+        """Возвращает время жизни записи в секундах."""
+        return self.ttls.get(key, self.ttl)
+
+    def get_many(self,
+                 keys: list[str],
+                 fetch_many: Callable[[list[str]], list[dict]],
+                 is_valid: Callable[[dict], bool] = lambda value: True) -> list[Optional[dict]]:
+        """Возвращает значения для ключей keys в том же порядке.
+
+        fetch_many получает список ключей и возвращает значения в том же порядке.
+        Значения, не прошедшие проверку is_valid, возвращаются, но не сохраняются в кэш.
+        Если запрос отсутствующих ключей завершился ошибкой, для них возвращается None, а значения
+        остальных ключей - из кэша. Если в кэше нет ни одного ключа, ошибка передается вызывающему.
+        """
+        now = self.clock()
+        values: dict[str, Optional[dict]] = {}
+        stale_keys = []
+        missing_keys = []
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                entry = self._entries.get(key)
+                if entry is None:
+                    missing_keys.append(key)
+                    self._counters["misses"] += 1
+                    continue
+                values[key] = entry["value"]
+                if now - entry["fetched_at"] < self.get_ttl(key):
+                    self._counters["hits"] += 1
+                else:
+                    self._counters["stale_hits"] += 1
+                    if key not in self._refreshing:
+                        stale_keys.append(key)
+
+            if stale_keys:
+                self._refreshing.update(stale_keys)
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="quote_cache")
+                self._futures = [future for future in self._futures if not future.done()]
+                self._futures.append(self._executor.submit(self._refresh, stale_keys, fetch_many, is_valid))
+
+        if missing_keys:
+            external_api_logger.info("Нет в кэше котировок: %s.", ', '.join(missing_keys))
+            try:
+                values.update(self._store(missing_keys, fetch_many(missing_keys), is_valid))
+            except Exception as e:
+                if not values:
+                    raise
+                external_api_logger.warning("Ошибка запроса котировок %s: %s. Возвращаются котировки из кэша.",
+                                            ', '.join(missing_keys), e)
+                values.update(dict.fromkeys(missing_keys))
+
+        return [values[key] for key in keys]
+
+    def wait(self) -> None:
+        """Ожидает завершения запущенных фоновых обновлений."""
+        with self._lock:
+            futures = self._futures
+            self._futures = []
+        for future in futures:
+            future.result()
+
+    def stats(self) -> dict:
+        """Возвращает счетчики попаданий, промахов и фоновых обновлений кэша."""
+        with self._lock:
+            return {**self._counters, "size": len(self._entries)}
+
+    def clear(self) -> None:
+        """Удаляет все записи и файл кэша."""
+        with self._lock:
+            self._entries = {}
+            if self.path is not None and os.path.exists(self.path):
+                os.remove(self.path)
+
+    def _refresh(self,
+                 keys: list[str],
+                 fetch_many: Callable[[list[str]], list[dict]],
+                 is_valid: Callable[[dict], bool]) -> None:
+        try:
+            external_api_logger.info("Фоновое обновление котировок: %s.", ', '.join(keys))
+            self._store(keys, fetch_many(keys), is_valid)
+            with self._lock:
+                self._counters["refreshes"] += 1
+        except Exception as e:
+            external_api_logger.warning("Ошибка фонового обновления котировок: %s.", e)
+            with self._lock:
+                self._counters["refresh_errors"] += 1
+        finally:
+            with self._lock:
+                self._refreshing.difference_update(keys)
+
+    def _store(self, keys: list[str], values: list[dict], is_valid: Callable[[dict], bool]) -> dict[str, dict]:
+        fetched_at = self.clock()
+        fetched = dict(zip(keys, values))
+        with self._lock:
+            for key, value in fetched.items():
+                if is_valid(value):
+                    self._entries[key] = {"value": value, "fetched_at": fetched_at}
+            self._save()
+        return fetched
+
+    def _load(self) -> None:
+        if self.path is None:
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+
+        if isinstance(data, dict) and data.get("version") == CACHE_VERSION:
+            self._entries = data.get("entries", {})
+            external_api_logger.info("Загружено котировок из кэша %s: %s.", self.path, len(self._entries))
+
+    def _save(self) -> None:
+        if self.path is None:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": CACHE_VERSION, "entries": self._entries}, f)
+        os.replace(tmp_path, self.path)
+
+
+_quote_cache: Optional[QuoteCache] = None
+_quote_cache_lock = threading.Lock()
+
+
+def get_quote_cache() -> QuoteCache:
+    """Возвращает общий для процесса кэш котировок."""
+    global _quote_cache
+    with _quote_cache_lock:
+        if _quote_cache is None:
+            _quote_cache = QuoteCache()
+        return _quote_cache
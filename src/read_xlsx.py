@@ -1,23 +1,204 @@
-import pandas as pd
+from __future__ import annotations
 
+import glob
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import TYPE_CHECKING, Iterator, Optional, Union
+
+from src.date_index import sort_transactions_by_date
+from src.lazy_import import lazy_import
 from src.logging_config import read_xlsx_logger
+from src.schema import apply_compact_schema
+from src.xlsx_cache import load_cached_transactions, save_cached_transactions
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+else:
+    np = lazy_import("numpy")
+    pd = lazy_import("pandas")
+
+DEFAULT_CHUNK_SIZE = 50_000
+FLOAT_COLUMNS = ["Сумма операции", "Сумма платежа", "Кэшбэк", "MCC", "Сумма операции с округлением"]
+INT_COLUMNS = ["Бонусы (включая кэшбэк)", "Округление на инвесткопилку"]
+PARTITION_MONTH_PATTERN = re.compile(r"(?<!\d)(\d{4})[-_.]?(0[1-9]|1[0-2])(?!\d)")
 
 
-def read_transactions_excel(filepath: str) -> pd.DataFrame:
+def read_transactions_excel(filepath: str, use_cache: bool = True, compact: bool = False) -> pd.DataFrame:
     """Считывает финансовые операции из XLSX-файла"""
     try:
-        read_xlsx_logger.info(f"Чтение XLSX-файла {filepath}.")
+        use_cache = use_cache and os.path.exists(filepath)
+        if use_cache:
+            cached_df = load_cached_transactions(filepath)
+            if cached_df is not None:
+                return apply_compact_schema(cached_df) if compact else cached_df
+
+        read_xlsx_logger.info("Чтение XLSX-файла %s.", filepath)
         transactions_df = pd.read_excel(filepath)
 
         transactions_df["Дата операции"] = pd.to_datetime(transactions_df["Дата операции"], format="%d.%m.%Y %H:%M:%S")
 
-        read_xlsx_logger.info(f"XLSX-файл {filepath} преобразован в объект DataFrame.")
-        return transactions_df
+        read_xlsx_logger.info("XLSX-файл %s преобразован в объект DataFrame.", filepath)
+        if use_cache:
+            save_cached_transactions(filepath, transactions_df)
+        return apply_compact_schema(transactions_df) if compact else transactions_df
 
     except FileNotFoundError as e:
-        read_xlsx_logger.error(f"XLSX-файл {filepath} не найден.")
+        read_xlsx_logger.error("XLSX-файл %s не найден.", filepath)
         raise FileNotFoundError(f"Ошибка чтения файла: {e}.")
 
     except StopIteration as e:
-        read_xlsx_logger.error(f"XLSX-файл {filepath} не содержит данные.")
+        read_xlsx_logger.error("XLSX-файл %s не содержит данные.", filepath)
         raise StopIteration(f"Ошибка чтения файла: {e}.")
+
+
+def iter_transactions_excel(filepath: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """Построчно считывает финансовые операции из XLSX-файла и возвращает их фрагментами."""
+    if chunk_size <= 0:
+        raise ValueError(f"Размер фрагмента должен быть положительным: {chunk_size}.")
+
+    from openpyxl import load_workbook  # type: ignore[import-untyped]
+
+    try:
+        read_xlsx_logger.info("Потоковое чтение XLSX-файла %s.", filepath)
+        workbook = load_workbook(filepath, read_only=True, data_only=True)
+
+    except FileNotFoundError as e:
+        read_xlsx_logger.error("XLSX-файл %s не найден.", filepath)
+        raise FileNotFoundError(f"Ошибка чтения файла: {e}.")
+
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            read_xlsx_logger.warning("XLSX-файл %s не содержит данные.", filepath)
+            return
+
+        chunk = []
+        for row in rows:
+            if all(value is None for value in row):
+                continue
+            chunk.append(row)
+            if len(chunk) == chunk_size:
+                yield make_transactions_chunk(header, chunk)
+                chunk = []
+
+        if chunk:
+            yield make_transactions_chunk(header, chunk)
+        read_xlsx_logger.info("Потоковое чтение XLSX-файла %s завершено.", filepath)
+
+    finally:
+        workbook.close()
+
+
+def make_transactions_chunk(header: tuple, rows: list[tuple]) -> pd.DataFrame:
+    """Создает типизированный DataFrame из строк XLSX-файла."""
+    chunk_df = pd.DataFrame.from_records(rows, columns=list(header))
+
+    for column in chunk_df.columns:
+        if column in FLOAT_COLUMNS:
+            chunk_df[column] = chunk_df[column].astype("float64")
+        elif column in INT_COLUMNS and chunk_df[column].notna().all():
+            chunk_df[column] = chunk_df[column].astype("int64")
+        elif chunk_df[column].dtype == object:
+            chunk_df[column] = chunk_df[column].where(chunk_df[column].notna(), np.nan)
+
+    if "Дата операции" in chunk_df.columns:
+        chunk_df["Дата операции"] = pd.to_datetime(chunk_df["Дата операции"], format="%d.%m.%Y %H:%M:%S")
+
+    return chunk_df
+
+
+def find_statement_files(path: str) -> list[str]:
+    """Возвращает отсортированный список XLSX-файлов из каталога или по шаблону пути."""
+    pattern = os.path.join(path, "*.xlsx") if os.path.isdir(path) else path
+    return sorted(filepath for filepath in glob.glob(pattern)
+                  if not os.path.basename(filepath).startswith("~$"))
+
+
+def get_partition_month(filepath: str) -> Optional[str]:
+    """Возвращает месяц выписки в формате 'ГГГГ-ММ' по имени файла или None, если месяц не указан."""
+    match = PARTITION_MONTH_PATTERN.search(os.path.basename(filepath))
+    if match is None:
+        return None
+    return f"{match.group(1)}-{match.group(2)}"
+
+
+def select_statement_files(filepaths: list[str],
+                           start_date: Optional[datetime] = None,
+                           end_date: Optional[datetime] = None) -> list[str]:
+    """Отбирает файлы, месяц которых пересекается с диапазоном дат [start_date, end_date].
+
+    Файлы без месяца в имени отбираются всегда, так как их диапазон неизвестен до чтения.
+    """
+    start_month = pd.Period(start_date, "M") if start_date is not None else None
+    end_month = pd.Period(end_date, "M") if end_date is not None else None
+
+    selected = []
+    for filepath in filepaths:
+        month = get_partition_month(filepath)
+        if month is not None:
+            period = pd.Period(month, "M")
+            if (start_month is not None and period < start_month) or (end_month is not None and period > end_month):
+                continue
+        selected.append(filepath)
+
+    read_xlsx_logger.info("Отобрано %s из %s файлов выписок.", len(selected), len(filepaths))
+    return selected
+
+
+def read_statement_partition(filepath: str) -> pd.DataFrame:
+    """Считывает XLSX-файл выписки и добавляет метаданные партиции."""
+    transactions_df = read_transactions_excel(filepath)
+    transactions_df.columns = [str(column).strip() for column in transactions_df.columns]
+
+    for column in FLOAT_COLUMNS:
+        if column in transactions_df.columns:
+            transactions_df[column] = transactions_df[column].astype("float64")
+
+    month = get_partition_month(filepath)
+    if month is None and not transactions_df.empty:
+        month = transactions_df["Дата операции"].max().strftime("%Y-%m")
+
+    transactions_df["Файл выписки"] = os.path.basename(filepath)
+    transactions_df["Месяц выписки"] = month
+    return transactions_df
+
+
+def read_transactions_partitions(path: str,
+                                 start_date: Optional[datetime] = None,
+                                 end_date: Optional[datetime] = None,
+                                 max_workers: Optional[int] = None) -> pd.DataFrame:
+    """Параллельно считывает выписки из каталога или по шаблону и объединяет их в один DataFrame.
+
+    Файлы, месяц которых не пересекается с диапазоном дат, не открываются.
+    """
+    filepaths = select_statement_files(find_statement_files(path), start_date, end_date)
+    if not filepaths:
+        read_xlsx_logger.error("Файлы выписок по пути %s не найдены.", path)
+        raise FileNotFoundError(f"Ошибка чтения файлов: выписки по пути {path} не найдены.")
+
+    if max_workers == 1 or len(filepaths) == 1:
+        partitions = [read_statement_partition(filepath) for filepath in filepaths]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            partitions = list(executor.map(read_statement_partition, filepaths))
+
+    transactions_df = sort_transactions_by_date(pd.concat(partitions, ignore_index=True))
+    read_xlsx_logger.info("Объединено %s файлов выписок по пути %s.", len(filepaths), path)
+    return transactions_df
+
+
+def read_transactions_range(transactions: Union[pd.DataFrame, str],
+                            start_date: Optional[datetime] = None,
+                            end_date: Optional[datetime] = None) -> pd.DataFrame:
+    """Возвращает транзакции для выборки по диапазону дат [start_date, end_date].
+
+    DataFrame возвращается без изменений. Для каталога или шаблона пути к выпискам считываются
+    только файлы, месяц которых пересекается с диапазоном (см. read_transactions_partitions).
+    """
+    if isinstance(transactions, str):
+        return read_transactions_partitions(transactions, start_date, end_date)
+    return transactions
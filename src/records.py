@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, Any, Iterator, Optional, TextIO
+
+from src.lazy_import import lazy_import
+from src.schema import restore_default_schema
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+else:
+    np = lazy_import("numpy")
+    pd = lazy_import("pandas")
+
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+CHUNK_SIZE = 10_000
+TRANSACTION_FILL_VALUES = {"Номер карты": None, "Кэшбэк": 0, "MCC": None}
+
+
+def to_native(value: Any) -> Any:
+    """Преобразует скаляр numpy в объект Python, остальные значения возвращает без изменений."""
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def make_column_values(values: pd.Series, date_format: str = DATE_FORMAT, fill_value: Any = None) -> list:
+    """Возвращает значения столбца списком объектов Python.
+
+    Даты форматируются строкой date_format, пустые значения заменяются на fill_value.
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        values = values.astype(object)
+    if pd.api.types.is_datetime64_any_dtype(values):
+        formatted = values.dt.strftime(date_format)
+    else:
+        formatted = values
+
+    is_null = values.isna()
+    if is_null.any():
+        formatted = formatted.astype(object).where(~is_null, fill_value)
+    column_values: list = formatted.tolist()
+    return column_values
+
+
+def make_records(transactions_df: pd.DataFrame,
+                 date_format: str = DATE_FORMAT,
+                 fill_values: Optional[dict[str, Any]] = None) -> list[dict]:
+    """Возвращает строки DataFrame списком словарей из объектов Python.
+
+    Преобразование выполняется по столбцам: суммы переводятся в рубли, даты форматируются строкой date_format,
+    пустые значения заменяются на значение из fill_values для столбца или на None. Столбцы из fill_values,
+    которых нет в DataFrame, добавляются со значением для пустой ячейки.
+    """
+    fill_values = fill_values or {}
+    default_df = restore_default_schema(transactions_df)
+
+    columns = {column: make_column_values(default_df[column], date_format, fill_values.get(column))
+               for column in default_df.columns}
+    for column, fill_value in fill_values.items():
+        if column not in columns:
+            columns[column] = [fill_value] * len(default_df)
+
+    names = list(columns)
+    return [dict(zip(names, row)) for row in zip(*columns.values())]
+
+
+def iter_records_json(transactions_df: pd.DataFrame,
+                      fill_values: Optional[dict[str, Any]] = None,
+                      chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """Возвращает по частям JSON-массив строк DataFrame, такой же, как json.dumps(make_records(...), indent=4).
+
+    Словари создаются для chunk_size строк за раз, поэтому память не зависит от размера DataFrame.
+    """
+    if transactions_df.empty:
+        yield "[]"
+        return
+
+    yield "[\n"
+    for start in range(0, len(transactions_df), chunk_size):
+        records = make_records(transactions_df.iloc[start:start + chunk_size], fill_values=fill_values)
+        if start:
+            yield ",\n"
+        yield json.dumps(records, ensure_ascii=False, indent=4, default=str)[2:-2]
+    yield "\n]"
+
+
+def write_records_json(file: TextIO,
+                       transactions_df: pd.DataFrame,
+                       fill_values: Optional[dict[str, Any]] = None,
+                       chunk_size: int = CHUNK_SIZE) -> int:
+    """Записывает JSON-массив строк DataFrame в файл (например, сокет, открытый через makefile("w")).
+
+    Возвращает число записанных строк.
+    """
+    for chunk in iter_records_json(transactions_df, fill_values, chunk_size):
+        file.write(chunk)
+    return len(transactions_df)
@@ -0,0 +1,230 @@
+import atexit
+import hashlib
+import json
+import os
+import queue
+import reprlib
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Any, Optional
+
+from src.logging_config import reports_logger
+
+MAX_BYTES = 10 * 1024 * 1024
+BACKUP_COUNT = 3
+MAX_VALUE_LENGTH = 200
+MAX_REPR_LEVEL = 3
+HEAD_ROWS = 5
+
+
+def fingerprint(text: str) -> str:
+    """Возвращает короткий отпечаток строки."""
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+def short_repr(value: Any, max_length: int = MAX_VALUE_LENGTH) -> str:
+    """Возвращает repr значения, в котором вложенные коллекции и строки ограничены max_length элементами."""
+    limited = reprlib.Repr()
+    limited.maxlevel = MAX_REPR_LEVEL
+    limited.maxstring = limited.maxother = max_length
+    limited.maxlist = limited.maxtuple = limited.maxdict = max_length
+    limited.maxset = limited.maxfrozenset = limited.maxdeque = limited.maxarray = max_length
+    return limited.repr(value)
+
+
+def snapshot_value(value: Any, max_length: int = MAX_VALUE_LENGTH) -> Any:
+    """Возвращает неизменяемый снимок значения для записи в репорт.
+
+    Вызывается в потоке вызывающей функции, поэтому изменение значения после вызова не попадает в репорт,
+    а очередь не удерживает само значение. Числа, None и строки возвращаются как есть. DataFrame и Series
+    заменяются размером, столбцами и первыми строками, repr остальных объектов обрезается до max_length символов.
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    pandas = sys.modules.get("pandas")
+    if pandas is not None and hasattr(pandas, "Series") and isinstance(value, (pandas.DataFrame, pandas.Series)):
+        snapshot: dict[str, Any] = {"type": type(value).__name__, "shape": list(value.shape)}
+        if isinstance(value, pandas.DataFrame):
+            snapshot["columns"] = [str(column) for column in value.columns]
+        snapshot["head"] = repr(value.head(HEAD_ROWS))[:max_length]
+        return snapshot
+
+    try:
+        text = short_repr(value, max_length)
+    except Exception as e:
+        return {"type": type(value).__name__, "repr_error": str(e)}
+    if len(text) <= max_length:
+        return text
+    snapshot = {"type": type(value).__name__, "head": text[:max_length]}
+    if hasattr(value, "__len__"):
+        snapshot["length"] = len(value)
+    return snapshot
+
+
+def summarize_value(value: Any, max_length: int = MAX_VALUE_LENGTH) -> Any:
+    """Возвращает значение снимка для записи в репорт.
+
+    Строки длиннее max_length заменяются длиной, отпечатком и первыми max_length символами,
+    остальные значения возвращаются как есть. Строки неизменяемы, поэтому отпечаток считается в фоновом потоке.
+    """
+    if not isinstance(value, str) or len(value) <= max_length:
+        return value
+    return {
+        "type": "str",
+        "length": len(value),
+        "fingerprint": fingerprint(value),
+        "head": value[:max_length]
+    }
+
+
+def make_report_entry(entry: dict, max_length: int = MAX_VALUE_LENGTH) -> dict:
+    """Возвращает запись репорта со снимками аргументов и результата (см. snapshot_value)."""
+    report_entry = {
+        **entry,
+        "time": time.time(),
+        "args": [snapshot_value(arg, max_length) for arg in entry["args"]],
+        "kwargs": {key: snapshot_value(value, max_length) for key, value in entry["kwargs"].items()}
+    }
+    if "result" in entry:
+        report_entry["result"] = snapshot_value(entry["result"], max_length)
+    return report_entry
+
+
+def make_report_record(entry: dict, max_length: int = MAX_VALUE_LENGTH) -> dict:
+    """Возвращает запись репорта с сокращенными аргументами и результатом."""
+    record = {
+        "time": datetime.fromtimestamp(entry["time"]).strftime("%Y-%m-%d %H:%M:%S.%f"),
+        "function": entry["function"],
+        "status": entry["status"],
+        "duration_ms": round(entry["duration"] * 1000, 3),
+        "args": [summarize_value(arg, max_length) for arg in entry["args"]],
+        "kwargs": {key: summarize_value(value, max_length) for key, value in entry["kwargs"].items()}
+    }
+    if entry["status"] == "ok":
+        record["result"] = summarize_value(entry["result"], max_length)
+    else:
+        record["error"] = entry["error"]
+    return record
+
+
+class ReportSink:
+    """Очередь записей репорта с фоновой записью в файлы.
+
+    Записи дописываются в файл в формате JSON lines. Файл больше max_bytes переименовывается
+    в <файл>.1 (предыдущие копии сдвигаются, хранится не больше backup_count копий).
+    Вызывающий поток снимает неизменяемые снимки аргументов и результата (snapshot_value) и ставит
+    запись в очередь, отпечатки длинных строк, форматирование и запись на диск выполняются в фоновом потоке.
+    """
+
+    def __init__(self,
+                 max_bytes: int = MAX_BYTES,
+                 backup_count: int = BACKUP_COUNT,
+                 max_length: int = MAX_VALUE_LENGTH) -> None:
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.max_length = max_length
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def write(self, path: str, **entry: Any) -> None:
+        """Ставит запись репорта со снимками аргументов и результата в очередь на запись в файл path."""
+        report_entry = make_report_entry(entry, self.max_length)
+        self._start()
+        self._queue.put((path, report_entry))
+
+    def flush(self) -> None:
+        """Ожидает записи на диск всех поставленных в очередь записей."""
+        if self._thread is not None:
+            self._queue.join()
+
+    def close(self) -> None:
+        """Записывает оставшиеся записи и останавливает фоновый поток."""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="report_sink", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            lines_by_path: dict[str, list[str]] = {}
+            for item in batch:
+                if item is not None:
+                    path, entry = item
+                    lines_by_path.setdefault(path, []).append(self._format(entry))
+            for path, lines in lines_by_path.items():
+                self._append(path, lines)
+
+            for _ in batch:
+                self._queue.task_done()
+            if None in batch:
+                return
+
+    def _format(self, entry: dict) -> str:
+        try:
+            record = make_report_record(entry, self.max_length)
+        except Exception as e:
+            reports_logger.warning("Ошибка формирования записи репорта %s: %s", entry.get('function'), e)
+            record = {"function": entry.get("function"), "status": entry.get("status"), "report_error": str(e)}
+        return json.dumps(record, ensure_ascii=False, default=str) + "\n"
+
+    def _append(self, path: str, lines: list[str]) -> None:
+        try:
+            size = os.path.getsize(path) if os.path.exists(path) else 0
+            file = open(path, "a", encoding="utf-8")
+            try:
+                for line in lines:
+                    line_size = len(line.encode("utf-8"))
+                    if size and size + line_size > self.max_bytes:
+                        file.close()
+                        self._rotate(path)
+                        file = open(path, "a", encoding="utf-8")
+                        size = 0
+                    file.write(line)
+                    size += line_size
+            finally:
+                file.close()
+
+        except OSError as e:
+            reports_logger.error("Ошибка записи репорта в файл %s: %s", path, e)
+
+    def _rotate(self, path: str) -> None:
+        if self.backup_count < 1:
+            os.remove(path)
+            return
+        for i in range(self.backup_count - 1, 0, -1):
+            if os.path.exists(f"{path}.{i}"):
+                os.replace(f"{path}.{i}", f"{path}.{i + 1}")
+        os.replace(path, f"{path}.1")
+        reports_logger.info("Файл репорта %s переименован в %s.1", path, path)
+
+
+_report_sink: Optional[ReportSink] = None
+_report_sink_lock = threading.Lock()
+
+
+def get_report_sink() -> ReportSink:
+    """Возвращает общую для процесса очередь записей репорта. При выходе из процесса очередь записывается на диск."""
+    global _report_sink
+    with _report_sink_lock:
+        if _report_sink is None:
+            _report_sink = ReportSink()
+            atexit.register(_report_sink.close)
+        return _report_sink
@@ -1,45 +1,85 @@
+from __future__ import annotations
+
 import json
 import os
 from datetime import datetime, timedelta
-from typing import Optional
-
-import pandas as pd
-from dateutil.relativedelta import relativedelta
+from typing import TYPE_CHECKING, Optional, Union
 
 from config import ROOT_DIR
+from src.date_index import select_date_range
+from src.lazy_import import lazy_import
 from src.logging_config import reports_logger
+from src.metrics import instrument
+from src.read_xlsx import read_transactions_range
+from src.records import to_native
 from src.reports_decorator import report
+from src.schema import is_compact
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+else:
+    np = lazy_import("numpy")
+    pd = lazy_import("pandas")
 
 
 # @report()
+@instrument()
 @report(filename=os.path.join(ROOT_DIR, "data", "reports.txt"))
-def get_spending_by_category(transactions: pd.DataFrame,
+def get_spending_by_category(transactions: Union[pd.DataFrame, str],
                              category: str,
                              date_str: Optional[str] = None) -> str:
-    """Возвращает JSON-ответ с тратами по категории за последние три месяца от заданной даты."""
+    """Возвращает JSON-ответ с тратами по категории за последние три месяца от заданной даты.
+
+    Вместо DataFrame можно передать каталог или шаблон пути к месячным выпискам, тогда считываются
+    только выписки за эти три месяца.
+    """
     try:
         start_date, end_date = get_date_information(date_str)
 
         spending_by_date_category = get_spending_by_date_category(transactions, category, start_date, end_date)
 
-        spending_by_category = json.dumps(spending_by_date_category, ensure_ascii=False, indent=4, default=str)
+        spending_by_category = json.dumps(spending_by_date_category, ensure_ascii=False, indent=4)
         reports_logger.info("Данные о тратах по категории преобразованы в JSON-строку")
 
         return spending_by_category
 
     except KeyError as e:
-        reports_logger.error(f"Ошибка преобразования данных: {e}")
+        reports_logger.error("Ошибка преобразования данных: %s", e)
+        raise KeyError(f"Ошибка: {e}")
+
+
+@instrument()
+@report(filename=os.path.join(ROOT_DIR, "data", "reports.txt"))
+def get_spending_by_categories(transactions: Union[pd.DataFrame, str],
+                               categories: Optional[list[str]] = None,
+                               date_str: Optional[str] = None) -> str:
+    """Возвращает JSON-ответ с тратами по всем или заданным категориям за последние три месяца от заданной даты."""
+    try:
+        start_date, end_date = get_date_information(date_str)
+
+        spending_by_date_categories = get_spending_by_date_categories(transactions, categories, start_date, end_date)
+
+        spending_by_categories = json.dumps(spending_by_date_categories, ensure_ascii=False, indent=4)
+        reports_logger.info("Данные о тратах по категориям преобразованы в JSON-строку")
+
+        return spending_by_categories
+
+    except KeyError as e:
+        reports_logger.error("Ошибка преобразования данных: %s", e)
         raise KeyError(f"Ошибка: {e}")
 
 
 def get_date_information(date_str: Optional[str] = None) -> tuple[datetime, datetime]:
     """Возвращает начальную и конечную даты для фильтрации транзакций."""
+    from dateutil.relativedelta import relativedelta
+
     try:
         if not date_str:
             date_obj = datetime.now()
         else:
             date_obj = datetime.strptime(date_str, "%Y-%m-%d %H:%M:%S")
-        reports_logger.info(f"Дата {date_str} преобразована в объект datetime")
+        reports_logger.info("Дата %s преобразована в объект datetime", date_str)
 
         start_date = date_obj.replace(day=1) - relativedelta(months=2)
         end_date = date_obj + timedelta(days=1)
@@ -47,30 +87,51 @@ def get_date_information(date_str: Optional[str] = None) -> tuple[datetime, date
         return start_date, end_date
 
     except ValueError as e:
-        reports_logger.error(f"Некорректный формат даты {date_str}")
+        reports_logger.error("Некорректный формат даты %s", date_str)
         raise ValueError(f"Некорректный формат даты: {e}")
 
 
-def get_spending_by_date_category(transactions_df: pd.DataFrame,
+def get_spending_by_date_category(transactions_df: Union[pd.DataFrame, str],
                                   category: str,
                                   start_date: datetime,
                                   end_date: datetime) -> dict:
-    """Возвращает траты по заданной дате и категории."""
-    try:
-        filtered_transactions = transactions_df[(transactions_df["Категория"] == category) &
-                                                (transactions_df["Дата операции"] >= start_date) &
-                                                (transactions_df["Дата операции"] < end_date)]
+    """Возвращает траты по заданной дате и категории.
 
-        total_spends = filtered_transactions[filtered_transactions["Сумма операции"] < 0]["Сумма операции"].sum()
-        reports_logger.info("Получены траты по заданной дате и категории")
+    Траты считаются так же, как в get_spending_by_date_categories, поэтому результаты совпадают.
+    """
+    return get_spending_by_date_categories(transactions_df, [category], start_date, end_date)[0]
 
-        spending_by_date_category = {
-            "category": category,
-            "spending": abs(total_spends)
-        }
 
-        return spending_by_date_category
+def get_spending_by_date_categories(transactions_df: Union[pd.DataFrame, str],
+                                    categories: Optional[list[str]],
+                                    start_date: datetime,
+                                    end_date: datetime) -> list[dict]:
+    """Возвращает траты по заданной дате для каждой категории одной группировкой.
+
+    Если категории не заданы, возвращаются все категории с транзакциями за период. Суммы складываются
+    в копейках, поэтому не зависят от порядка сложения.
+    """
+    try:
+        transactions_df = read_transactions_range(transactions_df, start_date, end_date)
+        date_transactions = select_date_range(transactions_df, start_date, end_date)
+        if categories is None:
+            categories = sorted(date_transactions["Категория"].dropna().unique())
+        expenses = date_transactions[date_transactions["Сумма операции"] < 0]
+
+        amounts = expenses["Сумма операции"].to_numpy(dtype="float64")
+        if not is_compact(transactions_df):
+            amounts = np.round(amounts * 100)
+        spends = pd.Series(amounts, index=expenses.index).groupby(expenses["Категория"].astype(object)).sum() / 100
+        spends = spends.reindex(categories, fill_value=0.0)
+        reports_logger.info("Получены траты по заданной дате и категориям")
+
+        spending_by_date_categories = [
+            {"category": category, "spending": to_native(abs(total_spends))}
+            for category, total_spends in spends.items()
+        ]
+
+        return spending_by_date_categories
 
     except KeyError as e:
-        reports_logger.error(f"Ошибка фильтрации транзакций: {e}")
+        reports_logger.error("Ошибка фильтрации транзакций: %s", e)
         raise KeyError(f"Ошибка: {e}")
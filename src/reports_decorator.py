@@ -1,29 +1,32 @@
 import os.path
+import time
 from functools import wraps
 from typing import Any, Callable, Optional
 
 from config import ROOT_DIR
+from src.report_sink import get_report_sink
 
 
 def report(filename: Optional[str] = None) -> Any:
-    """Декоратор для записи репорта работы функции в файл."""
+    """Декоратор для записи репорта работы функции в файл.
+
+    Записи в формате JSON lines дописываются в файл в фоновом потоке (см. src.report_sink.ReportSink).
+    """
     def wrapper(func: Callable) -> Callable:
         @wraps(func)
         def inner(*args: Any, **kwargs: Any) -> Any:
             path = filename or os.path.join(ROOT_DIR, "data", "report.txt")
-            with open(path, "w", encoding="utf-8") as file:
-                try:
-                    result = func(*args, **kwargs)
-                    log = (f"Function {func.__name__} ok" +
-                           f"\nFunction {func.__name__} called with args:\n {args} \nand kwargs: {kwargs}. " +
-                           f"\nResult: {result}")
-                    file.write(log)
-                    return result
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+                get_report_sink().write(path, function=func.__name__, status="ok", args=args, kwargs=kwargs,
+                                        result=result, duration=time.perf_counter() - start)
+                return result
 
-                except Exception as e:
-                    log = f"{func.__name__} error: {e} Inputs: {args}, {kwargs}\n\n"
-                    file.write(log)
-                    raise e
+            except Exception as e:
+                get_report_sink().write(path, function=func.__name__, status="error", args=args, kwargs=kwargs,
+                                        error=str(e), duration=time.perf_counter() - start)
+                raise e
 
         return inner
     return wrapper
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from src.lazy_import import lazy_import
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+else:
+    np = lazy_import("numpy")
+    pd = lazy_import("pandas")
+
+
+AMOUNT_COLUMNS = ["Сумма операции", "Сумма платежа", "Сумма операции с округлением"]
+CATEGORICAL_COLUMNS = ["Номер карты", "Статус", "Валюта операции", "Валюта платежа", "Категория"]
+DOWNCAST_COLUMNS = ["Кэшбэк", "MCC"]
+KOPECKS_ATTR = "amounts_in_kopecks"
+
+
+def apply_compact_schema(transactions_df: pd.DataFrame) -> pd.DataFrame:
+    """Возвращает DataFrame с компактной схемой.
+
+    Текстовые столбцы с небольшим числом значений хранятся как категории, суммы - как целое число копеек (int64),
+    кэшбэк и MCC понижаются до float32, если это не приводит к потере точности. Если в суммах есть пропуски,
+    все суммы остаются в рублях (float64): копейки отличаются от рублей по целому типу, см. is_compact.
+    """
+    compact_df = transactions_df.copy()
+
+    for column in CATEGORICAL_COLUMNS:
+        if column in compact_df.columns:
+            compact_df[column] = compact_df[column].astype("category")
+
+    amount_columns = [column for column in AMOUNT_COLUMNS if column in compact_df.columns]
+    if compact_df[amount_columns].notna().all(axis=None):
+        for column in amount_columns:
+            compact_df[column] = (compact_df[column] * 100).round().astype("int64")
+
+    for column in DOWNCAST_COLUMNS:
+        if column in compact_df.columns:
+            downcast = compact_df[column].astype("float32")
+            if downcast.astype("float64").equals(compact_df[column].astype("float64")):
+                compact_df[column] = downcast
+
+    compact_df.attrs[KOPECKS_ATTR] = True
+    return compact_df
+
+
+def restore_default_schema(transactions_df: pd.DataFrame) -> pd.DataFrame:
+    """Возвращает DataFrame со схемой, которую формирует read_transactions_excel."""
+    if not is_compact(transactions_df) and not transactions_df.attrs.get(KOPECKS_ATTR, False):
+        return transactions_df
+
+    default_df = transactions_df.copy()
+    for column in default_df.columns:
+        if column in AMOUNT_COLUMNS:
+            if pd.api.types.is_integer_dtype(default_df[column].dtype):
+                default_df[column] = default_df[column].astype("float64") / 100
+        elif column in DOWNCAST_COLUMNS:
+            default_df[column] = default_df[column].astype("float64")
+        elif isinstance(default_df[column].dtype, pd.CategoricalDtype):
+            default_df[column] = default_df[column].astype(object).where(default_df[column].notna(), np.nan)
+
+    default_df.attrs.pop(KOPECKS_ATTR, None)
+    return default_df
+
+
+def is_compact(transactions_df: pd.DataFrame) -> bool:
+    """Проверяет, хранятся ли суммы в DataFrame в копейках.
+
+    Суммы в копейках - целые числа в столбце "Сумма операции" и отметка KOPECKS_ATTR в attrs. Pandas теряет attrs
+    при многих операциях (merge, построение из записей), поэтому целые суммы операций без отметки не принимаются:
+    по ним нельзя определить, в рублях они или в копейках.
+    """
+    if "Сумма операции" not in transactions_df.columns:
+        return False
+    if not pd.api.types.is_integer_dtype(transactions_df["Сумма операции"].dtype):
+        return False
+    if not transactions_df.attrs.get(KOPECKS_ATTR, False):
+        raise ValueError("Целые суммы операций без отметки единицы измерения: используйте суммы в рублях (float64) "
+                         "или apply_compact_schema")
+    return True
+
+
+def to_rubles(amount: Any, transactions_df: pd.DataFrame) -> Any:
+    """Переводит сумму или серию сумм, посчитанную по DataFrame, в рубли."""
+    if is_compact(transactions_df):
+        return amount / 100
+    return amount
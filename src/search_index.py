@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING
+
+from src.lazy_import import lazy_import
+from src.utils import factorize_sorted
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+else:
+    np = lazy_import("numpy")
+    pd = lazy_import("pandas")
+
+SEARCH_COLUMNS = ["Описание", "Категория"]
+NGRAM_SIZE = 3
+REGEX_SPECIAL_CHARS = set(".^$*+?{}[]\\|()")
+FUZZY_COLUMN = "Описание"
+FUZZY_THRESHOLD = 0.3
+FUZZY_LIMIT = 10
+
+
+def get_ngrams(text: str, size: int = NGRAM_SIZE) -> set[str]:
+    """Возвращает множество подстрок длины size."""
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+def get_word_trigrams(text: str) -> set[str]:
+    """Возвращает триграммы слов текста в нижнем регистре, дополненных двумя пробелами в начале и одним в конце."""
+    trigrams: set[str] = set()
+    for word in re.findall(r"\w+", text.lower()):
+        trigrams.update(get_ngrams(f"  {word} "))
+    return trigrams
+
+
+def is_plain_query(search_str: str) -> bool:
+    """Проверяет, что запрос не содержит специальных символов регулярных выражений и ищется как подстрока."""
+    return not REGEX_SPECIAL_CHARS.intersection(search_str)
+
+
+class ValueRows:
+    """Номера строк для каждого различного значения столбца."""
+
+    def __init__(self, codes: np.ndarray, n_values: int) -> None:
+        self._row_order = np.argsort(codes, kind="stable")
+        self._value_starts = np.concatenate([[0], np.cumsum(np.bincount(codes, minlength=n_values))])
+
+    def get_rows(self, value_id: int) -> np.ndarray:
+        """Возвращает номера строк со значением value_id по возрастанию."""
+        return self._row_order[self._value_starts[value_id]:self._value_starts[value_id + 1]]
+
+
+class ColumnSearchIndex:
+    """Инвертированный индекс по n-граммам различных значений столбца в нижнем регистре.
+
+    Для каждой n-граммы хранится список номеров значений, в которых она встречается, а для каждого значения -
+    номера строк. Пустое значение индексируется как строка "nan", так же как при поиске по str(значение).
+    """
+
+    def __init__(self, values: pd.Series) -> None:
+        codes, uniques = factorize_sorted(values)
+        codes = np.where(codes < 0, len(uniques), codes)
+        self.values = [str(value).lower() for value in uniques] + ["nan"]
+        self.rows = ValueRows(codes, len(self.values))
+
+        postings: dict[str, list[int]] = {}
+        for value_id, value in enumerate(self.values):
+            for ngram in get_ngrams(value):
+                postings.setdefault(ngram, []).append(value_id)
+        self._postings = {ngram: np.array(value_ids) for ngram, value_ids in postings.items()}
+
+    def find_values(self, query: str) -> np.ndarray:
+        """Возвращает номера значений, содержащих подстроку query (query в нижнем регистре)."""
+        if len(query) < NGRAM_SIZE:
+            candidates = np.arange(len(self.values))
+        else:
+            posting_lists = []
+            for ngram in get_ngrams(query):
+                if ngram not in self._postings:
+                    return np.array([], dtype="int64")
+                posting_lists.append(self._postings[ngram])
+            posting_lists.sort(key=len)
+            candidates = posting_lists[0]
+            for posting_list in posting_lists[1:]:
+                candidates = np.intersect1d(candidates, posting_list, assume_unique=True)
+
+        return np.array([value_id for value_id in candidates if query in self.values[value_id]], dtype="int64")
+
+    def find_rows(self, query: str) -> np.ndarray:
+        """Возвращает номера строк (в произвольном порядке), значение которых содержит подстроку query."""
+        value_ids = self.find_values(query)
+        if not len(value_ids):
+            return np.array([], dtype="int64")
+        return np.concatenate([self.rows.get_rows(value_id) for value_id in value_ids])
+
+
+class SearchIndex:
+    """Индекс для поиска транзакций по подстроке в описании или категории без учета регистра.
+
+    Строится один раз на версию данных: get_dataset().get_index("search_index", build_search_index).
+    """
+
+    def __init__(self, transactions_df: pd.DataFrame) -> None:
+        self.n_rows = len(transactions_df)
+        self.columns = {column: ColumnSearchIndex(transactions_df[column]) for column in SEARCH_COLUMNS}
+
+    def search(self, search_str: str) -> np.ndarray:
+        """Возвращает номера строк по возрастанию, в описании или категории которых есть подстрока search_str."""
+        query = search_str.lower()
+        if not query:
+            return np.arange(self.n_rows)
+        found = np.zeros(self.n_rows, dtype=bool)
+        for column_index in self.columns.values():
+            found[column_index.find_rows(query)] = True
+        return np.flatnonzero(found)
+
+
+def build_search_index(transactions_df: pd.DataFrame) -> SearchIndex:
+    """Строит индекс поиска по описанию и категории транзакций."""
+    return SearchIndex(transactions_df)
+
+
+class FuzzySearchIndex:
+    """Индекс нечеткого поиска по различным значениям описания транзакций.
+
+    Сходство запроса и значения - доля общих триграмм слов (как similarity в pg_trgm):
+    |A ∩ B| / |A ∪ B|. Сходство считается только для различных значений, число общих триграмм -
+    по спискам значений для каждой триграммы запроса, затем найденные значения разворачиваются в строки.
+    """
+
+    def __init__(self, values: pd.Series) -> None:
+        codes, uniques = factorize_sorted(values)
+        self.values = [str(value) for value in uniques]
+        self.rows = ValueRows(np.where(codes < 0, len(uniques), codes), len(uniques) + 1)
+
+        trigram_sets = [get_word_trigrams(value) for value in self.values]
+        self._sizes = np.array([len(trigrams) for trigrams in trigram_sets], dtype="int64")
+        postings: dict[str, list[int]] = {}
+        for value_id, trigrams in enumerate(trigram_sets):
+            for trigram in trigrams:
+                postings.setdefault(trigram, []).append(value_id)
+        self._postings = {trigram: np.array(value_ids) for trigram, value_ids in postings.items()}
+
+    def search(self,
+               search_str: str,
+               threshold: float = FUZZY_THRESHOLD,
+               limit: int = FUZZY_LIMIT) -> list[tuple[int, float]]:
+        """Возвращает не более limit пар (номер значения, сходство) со сходством не ниже threshold.
+
+        Пары упорядочены по убыванию сходства, при равном сходстве - по значению.
+        """
+        query_trigrams = get_word_trigrams(search_str)
+        posting_lists = [self._postings[trigram] for trigram in query_trigrams if trigram in self._postings]
+        if not posting_lists:
+            return []
+
+        overlap = np.bincount(np.concatenate(posting_lists), minlength=len(self.values))
+        scores = overlap / (len(query_trigrams) + self._sizes - overlap)
+        candidates = np.flatnonzero((overlap > 0) & (scores >= threshold))
+        ranked = candidates[np.lexsort((candidates, -scores[candidates]))][:limit]
+        return [(int(value_id), float(scores[value_id])) for value_id in ranked]
+
+
+def build_fuzzy_index(transactions_df: pd.DataFrame) -> FuzzySearchIndex:
+    """Строит индекс нечеткого поиска по описанию транзакций."""
+    return FuzzySearchIndex(transactions_df[FUZZY_COLUMN])
+
+
+def scan_transactions_df(transactions_df: pd.DataFrame, search_str: str) -> np.ndarray:
+    """Возвращает номера строк по возрастанию, в описании или категории которых найдено регулярное выражение.
+
+    Регулярное выражение проверяется один раз для каждого различного значения столбца.
+    """
+    pattern = re.compile(search_str, re.IGNORECASE)
+    found = np.zeros(len(transactions_df), dtype=bool)
+    for column in SEARCH_COLUMNS:
+        if column not in transactions_df:
+            found |= bool(pattern.search(""))
+            continue
+        codes, uniques = factorize_sorted(transactions_df[column])
+        matches = np.array([bool(pattern.search(str(value))) for value in uniques] + [bool(pattern.search("nan"))])
+        found |= matches[codes]
+    return np.flatnonzero(found)
+
+
+def scan_transactions(transactions: list[dict], search_str: str) -> list[dict]:
+    """Возвращает транзакции, в описании или категории которых найдено регулярное выражение search_str."""
+    pattern = re.compile(search_str, re.IGNORECASE)
+    return [transact for transact in transactions
+            if pattern.search(str(transact.get("Описание", "")))
+            or pattern.search(str(transact.get("Категория", "")))]
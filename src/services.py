@@ -1,41 +1,100 @@
+from __future__ import annotations
+
+import base64
+import hashlib
 import json
-import os
 import re
+from datetime import datetime
+from typing import TYPE_CHECKING, Optional, TextIO
 
-import pandas as pd
-
-from config import ROOT_DIR
+from src.dataset import get_dataset
+from src.date_index import select_date_range
+from src.lazy_import import lazy_import
 from src.logging_config import services_logger
-from src.read_xlsx import read_transactions_excel
+from src.metrics import instrument
+from src.records import TRANSACTION_FILL_VALUES, make_records, write_records_json
+from src.schema import restore_default_schema
+from src.search_index import (
+    FUZZY_LIMIT,
+    FUZZY_THRESHOLD,
+    FuzzySearchIndex,
+    SearchIndex,
+    build_fuzzy_index,
+    build_search_index,
+    is_plain_query,
+    scan_transactions_df
+)
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+else:
+    np = lazy_import("numpy")
+    pd = lazy_import("pandas")
+
+PAGE_SIZE = 100
 
 
+@instrument()
 def get_transactions_list() -> list[dict]:
-    """Считывает финансовые операции из XLSX-файла и возвращает в виде списка."""
-    filepath = os.path.join(ROOT_DIR, "data", "operations.xlsx")
+    """Возвращает финансовые операции из общего набора транзакций в виде списка."""
+    dataset = get_dataset()
+    filepath = dataset.filepath
     try:
-        services_logger.info(f"Чтение XLSX-файла {filepath}.")
-        transactions_df = read_transactions_excel(filepath)
-        transactions_list = transactions_df.to_dict(orient="records")
-        services_logger.info(f"XLSX-файл {filepath} преобразован в Python объект.")
+        services_logger.info("Получение транзакций из файла %s.", filepath)
+        transactions_df = dataset.frame
+        transactions_list = restore_default_schema(transactions_df).to_dict(orient="records")
+        services_logger.info("XLSX-файл %s преобразован в Python объект.", filepath)
 
         return transactions_list
 
     except AttributeError as e:
-        services_logger.error(f"Ошибка преобразования XLSX-файла {filepath} в Python объект: {e}.")
+        services_logger.error("Ошибка преобразования XLSX-файла %s в Python объект: %s.", filepath, e)
         raise AttributeError(f"Ошибка: {e}.")
 
 
+def get_transactions_frame() -> pd.DataFrame:
+    """Возвращает DataFrame общего набора транзакций без копирования.
+
+    DataFrame используется всеми функциями совместно, его нельзя изменять на месте.
+    """
+    dataset = get_dataset()
+    services_logger.info("Получение транзакций из файла %s.", dataset.filepath)
+    return dataset.frame
+
+
+def make_transactions_json(transactions_df: pd.DataFrame) -> str:
+    """Возвращает JSON-строку со списком транзакций.
+
+    Пустой кэшбэк заменяется на 0, остальные пустые значения - на null, даты записываются как "ГГГГ-ММ-ДД ЧЧ:ММ:СС".
+    """
+    transactions = make_records(transactions_df, fill_values=TRANSACTION_FILL_VALUES)
+    return json.dumps(transactions, ensure_ascii=False, indent=4, default=str)
+
+
+@instrument()
 def get_profitable_cashback_categories(data: list[dict], month: int, year: int) -> str:
     """Возвращает JSON-ответ с анализом категорий кэшбэка за указанный период."""
-    try:
-        transactions_df = pd.DataFrame.from_records(data)
+    return get_profitable_cashback_categories_df(pd.DataFrame.from_records(data), month, year)
+
 
-        filtered_transactions = transactions_df[(transactions_df["Дата операции"].dt.month == month) &
-                                                (transactions_df["Дата операции"].dt.year == year) &
-                                                (transactions_df["Кэшбэк"].notna())]
+@instrument()
+def get_profitable_cashback_categories_df(transactions_df: pd.DataFrame, month: int, year: int) -> str:
+    """Возвращает JSON-ответ с анализом категорий кэшбэка за указанный период по DataFrame транзакций."""
+    from dateutil.relativedelta import relativedelta  # type: ignore[import-untyped]
+
+    try:
+        if 1 <= month <= 12:
+            start_date = datetime(year, month, 1)
+            month_transactions = select_date_range(transactions_df, start_date, start_date + relativedelta(months=1))
+        else:
+            month_transactions = transactions_df.iloc[0:0]
+        month_transactions = restore_default_schema(month_transactions[["Категория", "Кэшбэк"]])
+        filtered_transactions = month_transactions[month_transactions["Кэшбэк"].notna()]
         services_logger.info("Транзакции отфильтрованы по дате")
 
-        profit_cashback = filtered_transactions.groupby("Категория")["Кэшбэк"].sum().sort_values(ascending=False)
+        profit_cashback = (filtered_transactions.groupby("Категория", observed=True)["Кэшбэк"].sum()
+                           .sort_values(ascending=False))
         services_logger.info("Получены данные о кэшбэке")
         profit_cashback_categories = profit_cashback.to_dict()
         for key, value in profit_cashback_categories.items():
@@ -47,54 +106,224 @@ def get_profitable_cashback_categories(data: list[dict], month: int, year: int)
         return profit_cashback_categories_json
 
     except KeyError as e:
-        services_logger.error(f"Ошибка фильтрации транзакций: {e}")
+        services_logger.error("Ошибка фильтрации транзакций: %s", e)
         raise KeyError(f"Ошибка: {e}")
 
 
-def make_simple_search(search_str: str) -> str:
-    """Возвращает JSON-ответ со всеми транзакциями, содержащими запрос в описании или категории."""
-    transactions = get_transactions_list()
+@instrument()
+def make_simple_search(search_str: str, use_index: bool = True) -> str:
+    """Возвращает JSON-ответ со всеми транзакциями, содержащими запрос в описании или категории.
 
-    pattern = re.compile(search_str, re.IGNORECASE)
+    Запрос без специальных символов регулярных выражений ищется как подстрока без учета регистра
+    по индексу n-грамм, который строится один раз на версию данных. Остальные запросы (или use_index=False)
+    проверяются регулярным выражением.
+    """
+    dataset = get_dataset()
+    search_index = dataset.get_index("search_index", build_search_index) if use_index else None
+    return make_simple_search_df(dataset.frame, search_str, search_index)
 
-    target_transactions = [transact for transact in transactions
-                           if pattern.search(str(transact.get("Описание", "")))
-                           or pattern.search(str(transact.get("Категория", "")))]
-    services_logger.info(f"Транзакции отфильтрованы по запросу {search_str}")
 
-    for item in target_transactions:
-        item["Номер карты"] = None if pd.isna(item.get("Номер карты")) else item["Номер карты"]
-        item["Кэшбэк"] = 0 if pd.isna(item.get("Кэшбэк")) else item["Кэшбэк"]
-        item["MCC"] = None if pd.isna(item.get("MCC")) else item["MCC"]
+@instrument()
+def make_simple_search_df(transactions_df: pd.DataFrame,
+                          search_str: str,
+                          search_index: Optional[SearchIndex] = None) -> str:
+    """Возвращает JSON-ответ с транзакциями из DataFrame, содержащими запрос в описании или категории.
 
-    simple_search = json.dumps(target_transactions, ensure_ascii=False, indent=4, default=str)
+    Если передан индекс, построенный по transactions_df, запрос без специальных символов регулярных выражений
+    ищется по нему. Иначе регулярное выражение проверяется для каждого различного описания и категории.
+    """
+    rows = find_simple_search_rows(transactions_df, search_str, search_index)
+
+    simple_search = make_transactions_json(transactions_df.iloc[rows])
     services_logger.info("Данные о транзакциях преобразованы в JSON-строку")
 
     return simple_search
 
 
+def find_simple_search_rows(transactions_df: pd.DataFrame,
+                            search_str: str,
+                            search_index: Optional[SearchIndex] = None) -> np.ndarray:
+    """Возвращает номера строк по возрастанию, в описании или категории которых есть запрос."""
+    if search_index is not None and is_plain_query(search_str):
+        rows = search_index.search(search_str)
+    else:
+        rows = scan_transactions_df(transactions_df, search_str)
+    services_logger.info("Транзакции отфильтрованы по запросу %s", search_str)
+    return rows
+
+
+@instrument()
+def write_simple_search(file: TextIO, search_str: str, use_index: bool = True) -> int:
+    """Записывает в файл JSON-массив транзакций, содержащих запрос в описании или категории, как make_simple_search.
+
+    Транзакции преобразуются и записываются частями, поэтому широкий запрос не требует памяти под весь ответ.
+    Возвращает число записанных транзакций.
+    """
+    dataset = get_dataset()
+    search_index = dataset.get_index("search_index", build_search_index) if use_index else None
+    transactions_df = dataset.frame
+    rows = find_simple_search_rows(transactions_df, search_str, search_index)
+
+    count = write_records_json(file, transactions_df.iloc[rows], TRANSACTION_FILL_VALUES)
+    services_logger.info("Записано транзакций по запросу %s: %s", search_str, count)
+
+    return count
+
+
+@instrument()
+def make_simple_search_page(search_str: str,
+                            limit: int = PAGE_SIZE,
+                            cursor: Optional[str] = None,
+                            use_index: bool = True) -> str:
+    """Возвращает JSON-ответ с одной страницей результатов make_simple_search.
+
+    Ответ содержит не более limit транзакций («transactions») и курсор следующей страницы («next_cursor»),
+    который передается в следующий вызов с тем же запросом. На последней странице курсор равен null.
+    """
+    dataset = get_dataset()
+    search_index = dataset.get_index("search_index", build_search_index) if use_index else None
+    transactions_df = dataset.frame
+    rows = find_simple_search_rows(transactions_df, search_str, search_index)
+
+    return make_page_json(transactions_df, rows, f"simple_search:{search_str}", dataset.version, limit, cursor)
+
+
+@instrument()
+def make_fuzzy_search(search_str: str, threshold: float = FUZZY_THRESHOLD, limit: int = FUZZY_LIMIT) -> str:
+    """Возвращает JSON-ответ с транзакциями, описание которых похоже на запрос (например, с опечаткой).
+
+    Сходство описаний с запросом считается по триграммам, в ответ попадают транзакции не более чем limit
+    наиболее похожих описаний со сходством не ниже threshold. Транзакции упорядочены по убыванию сходства
+    описания, сходство указывается в поле «Сходство».
+    """
+    dataset = get_dataset()
+    fuzzy_index = dataset.get_index("fuzzy_index", build_fuzzy_index)
+    return make_fuzzy_search_df(dataset.frame, search_str, threshold, limit, fuzzy_index)
+
+
+@instrument()
+def make_fuzzy_search_df(transactions_df: pd.DataFrame,
+                         search_str: str,
+                         threshold: float = FUZZY_THRESHOLD,
+                         limit: int = FUZZY_LIMIT,
+                         fuzzy_index: Optional[FuzzySearchIndex] = None) -> str:
+    """Возвращает JSON-ответ с транзакциями из DataFrame, описание которых похоже на запрос.
+
+    fuzzy_index должен быть построен по transactions_df, если он не передан, индекс строится заново.
+    """
+    if fuzzy_index is None:
+        fuzzy_index = build_fuzzy_index(transactions_df)
+    matches = fuzzy_index.search(search_str, threshold, limit)
+    services_logger.info("Найдено описаний, похожих на запрос %s: %s", search_str, len(matches))
+
+    rows = [fuzzy_index.rows.get_rows(value_id) for value_id, _ in matches]
+    scores = np.repeat([round(score, 3) for _, score in matches], [len(value_rows) for value_rows in rows])
+    selected_rows = np.concatenate(rows) if rows else np.array([], dtype="int64")
+    target_transactions = transactions_df.iloc[selected_rows].assign(Сходство=scores)
+
+    fuzzy_search = make_transactions_json(target_transactions)
+    services_logger.info("Данные о транзакциях преобразованы в JSON-строку")
+
+    return fuzzy_search
+
+
+@instrument()
 def search_for_transfers_to_individuals(data: list[dict]) -> str:
     """Возвращает JSON-ответ со всеми транзакциями, которые относятся к переводам физлицам."""
-    try:
-        transactions_df = pd.DataFrame.from_records(data)
+    return search_for_transfers_to_individuals_df(pd.DataFrame.from_records(data))
 
-        pattern = re.compile(r"\b[А-Я][а-я]+ [А-Я]\.")
 
-        filtered_transactions = transactions_df[(transactions_df["Категория"] == "Переводы") &
-                                                (transactions_df["Описание"].str.contains(pattern))]
-        services_logger.info("Получены транзакции - переводы физлицам")
+@instrument()
+def search_for_transfers_to_individuals_df(transactions_df: pd.DataFrame) -> str:
+    """Возвращает JSON-ответ со всеми транзакциями из DataFrame, которые относятся к переводам физлицам."""
+    rows = find_transfers_to_individuals_rows(transactions_df)
+
+    transfers_to_individuals_json = make_transactions_json(transactions_df.iloc[rows])
+    services_logger.info("Данные о переводах физлицам преобразованы в JSON-строку")
 
-        transfers_to_individuals = filtered_transactions.to_dict(orient="records")
-        for item in transfers_to_individuals:
-            item["Номер карты"] = None if pd.isna(item.get("Номер карты")) else item["Номер карты"]
-            item["Кэшбэк"] = 0 if pd.isna(item.get("Кэшбэк")) else item["Кэшбэк"]
-            item["MCC"] = None if pd.isna(item.get("MCC")) else item["MCC"]
+    return transfers_to_individuals_json
 
-        transfers_to_individuals_json = json.dumps(transfers_to_individuals, ensure_ascii=False, indent=4, default=str)
-        services_logger.info("Данные о переводах физлицам преобразованы в JSON-строку")
 
-        return transfers_to_individuals_json
+def find_transfers_to_individuals_rows(transactions_df: pd.DataFrame) -> np.ndarray:
+    """Возвращает номера строк по возрастанию, которые относятся к переводам физлицам."""
+    try:
+        pattern = re.compile(r"\b[А-Я][а-я]+ [А-Я]\.")
+
+        transfer_rows = np.flatnonzero((transactions_df["Категория"] == "Переводы").to_numpy())
+        descriptions = transactions_df["Описание"].iloc[transfer_rows].astype(str)
+        rows = transfer_rows[descriptions.str.contains(pattern).to_numpy()]
+        services_logger.info("Получены транзакции - переводы физлицам")
+
+        return rows
 
     except KeyError as e:
-        services_logger.error(f"Ошибка фильтрации транзакций: {e}")
+        services_logger.error("Ошибка фильтрации транзакций: %s", e)
         raise KeyError(f"Ошибка: {e}")
+
+
+@instrument()
+def write_transfers_to_individuals(file: TextIO, transactions_df: pd.DataFrame) -> int:
+    """Записывает в файл JSON-массив переводов физлицам частями. Возвращает число записанных транзакций."""
+    rows = find_transfers_to_individuals_rows(transactions_df)
+
+    count = write_records_json(file, transactions_df.iloc[rows], TRANSACTION_FILL_VALUES)
+    services_logger.info("Записано переводов физлицам: %s", count)
+
+    return count
+
+
+@instrument()
+def search_for_transfers_to_individuals_page(limit: int = PAGE_SIZE, cursor: Optional[str] = None) -> str:
+    """Возвращает JSON-ответ с одной страницей переводов физлицам из общего набора транзакций.
+
+    Формат ответа и курсора - как у make_simple_search_page.
+    """
+    dataset = get_dataset()
+    transactions_df = dataset.frame
+    rows = find_transfers_to_individuals_rows(transactions_df)
+
+    return make_page_json(transactions_df, rows, "transfers_to_individuals", dataset.version, limit, cursor)
+
+
+def make_cursor(query: str, version: int, row: int) -> str:
+    """Возвращает курсор страницы: запрос, версию данных и номер последней выданной строки."""
+    state = {"query": hashlib.sha1(query.encode("utf-8")).hexdigest()[:16], "version": version, "row": row}
+    return base64.urlsafe_b64encode(json.dumps(state).encode("utf-8")).decode("ascii")
+
+
+def read_cursor(cursor: str, query: str, version: int) -> int:
+    """Возвращает номер последней выданной строки из курсора, выданного для того же запроса и версии данных."""
+    try:
+        state = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        expected_query = hashlib.sha1(query.encode("utf-8")).hexdigest()[:16]
+        if state["query"] != expected_query or state["version"] != version:
+            raise ValueError("курсор выдан для другого запроса или версии данных")
+        return int(state["row"])
+
+    except (ValueError, KeyError, TypeError) as e:
+        services_logger.error("Некорректный курсор %s: %s", cursor, e)
+        raise ValueError(f"Некорректный курсор: {e}")
+
+
+def make_page_json(transactions_df: pd.DataFrame,
+                   rows: np.ndarray,
+                   query: str,
+                   version: int,
+                   limit: int,
+                   cursor: Optional[str] = None) -> str:
+    """Возвращает JSON-ответ со страницей транзакций из строк rows (по возрастанию), следующих за курсором."""
+    if limit < 1:
+        services_logger.error("Некорректный размер страницы %s", limit)
+        raise ValueError(f"Некорректный размер страницы: {limit}")
+
+    start = 0 if cursor is None else int(np.searchsorted(rows, read_cursor(cursor, query, version), side="right"))
+    page_rows = rows[start:start + limit]
+    has_next = start + limit < len(rows)
+
+    page = {
+        "transactions": make_records(transactions_df.iloc[page_rows], fill_values=TRANSACTION_FILL_VALUES),
+        "next_cursor": make_cursor(query, version, int(page_rows[-1])) if has_next else None
+    }
+    services_logger.info("Сформирована страница из %s транзакций", len(page_rows))
+
+    return json.dumps(page, ensure_ascii=False, indent=4, default=str)
@@ -1,13 +1,32 @@
+from __future__ import annotations
+
 import json
 from datetime import datetime, timedelta
+from decimal import ROUND_HALF_UP, Decimal
+from typing import TYPE_CHECKING, Any, Iterable, Optional, Sequence, Union
 
-import pandas as pd
-
+from src.date_index import DETECT_ORDER, select_date_range
+from src.lazy_import import lazy_import
 from src.logging_config import src_utils_logger
+from src.metrics import instrument
+from src.read_xlsx import read_transactions_range
+from src.records import make_records
+from src.schema import KOPECKS_ATTR, is_compact, restore_default_schema, to_rubles
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+else:
+    np = lazy_import("numpy")
+    pd = lazy_import("pandas")
 
+REDUCE_KEYS = ["Номер карты", "Категория", "Знак операции"]
+TOP_TRANSACTION_KEYS = ["date", "amount", "category", "description"]
 
+
+@instrument()
 def get_information_home_page(date_str: str,
-                              transactions: pd.DataFrame,
+                              transactions: Union[pd.DataFrame, str],
                               currency_rates: list[dict],
                               stock_prices: list[dict]) -> str:
     """Создает json-строку для страницы 'Главная'."""
@@ -31,8 +50,9 @@ def get_information_home_page(date_str: str,
     return parsed_result
 
 
+@instrument()
 def get_events_information(date_str: str,
-                           transactions: pd.DataFrame,
+                           transactions: Union[pd.DataFrame, str],
                            currency_rates: list[dict],
                            stock_prices: list[dict],
                            data_range: str = "M") -> str:
@@ -40,20 +60,7 @@ def get_events_information(date_str: str,
     date_obj, start_date, end_date = get_date_obj_information(date_str, data_range)
 
     transactions_df = filter_transactions(transactions, start_date, end_date, date_obj)
-
-    total_amount_expenses = get_total_expenses(transactions_df)
-    top_categories_expenses = get_top_categories_expenses(transactions_df)
-    transfers_and_cash_expenses = get_transfers_and_cash_expenses(transactions_df)
-    expenses = dict()
-    expenses.update(total_amount_expenses)
-    expenses["main"] = top_categories_expenses
-    expenses["transfers_and_cash"] = transfers_and_cash_expenses
-
-    total_amount_income = get_total_income(transactions_df)
-    top_categories_income = get_top_categories_income(transactions_df)
-    income = dict()
-    income.update(total_amount_income)
-    income["main"] = top_categories_income
+    expenses, income = get_expenses_and_income(transactions_df)
 
     result = {
         "expenses": expenses,
@@ -68,11 +75,44 @@ def get_events_information(date_str: str,
     return parsed_result
 
 
+def get_expenses_and_income(transactions_df: pd.DataFrame) -> tuple[dict, dict]:
+    """Возвращает данные о расходах и поступлениях для страницы 'События'.
+
+    Все суммы выводятся из одной свертки транзакций по категории и знаку операции.
+    """
+    return make_expenses_and_income(get_category_totals(transactions_df))
+
+
+def make_expenses_and_income(totals: pd.DataFrame) -> tuple[dict, dict]:
+    """Формирует данные о расходах и поступлениях для страницы 'События' по свертке get_category_totals."""
+    amounts = totals.set_index("Категория")["Сумма операции"]
+    signs = totals["Знак операции"].to_numpy()
+    has_category = totals["Категория"].notna().to_numpy()
+
+    category_amounts = amounts[has_category].groupby(level=0, observed=True).sum()
+    expense_amounts = amounts[signs < 0]
+    income_amounts = amounts[signs > 0]
+    transfers_and_cash = expense_amounts[expense_amounts.index.isin(["Переводы", "Наличные"])]
+
+    expenses = {
+        "total_amount": abs(round_rubles(to_rubles(expense_amounts.sum(), totals))),
+        "main": make_top_categories_expenses(to_rubles(category_amounts, totals)),
+        "transfers_and_cash": make_transfers_and_cash_expenses(to_rubles(transfers_and_cash, totals))
+    }
+    income = {
+        "total_amount": round_rubles(to_rubles(income_amounts.sum(), totals)),
+        "main": make_top_categories_income(to_rubles(income_amounts[has_category[signs > 0]], totals))
+    }
+    src_utils_logger.info("Получены суммы расходов и поступлений по категориям")
+
+    return expenses, income
+
+
 def get_date_obj_information(date_str: str, data_range: str = "M") -> tuple[datetime, datetime, datetime]:
     """Возвращает начальную и конечную даты для фильтрации транзакций."""
     try:
         date_obj = datetime.strptime(date_str, "%Y-%m-%d %H:%M:%S")
-        src_utils_logger.info(f"Дата {date_str} преобразована в объект datetime")
+        src_utils_logger.info("Дата %s преобразована в объект datetime", date_str)
         end_date = date_obj + timedelta(days=1)
 
         if data_range == "W":
@@ -88,10 +128,37 @@ def get_date_obj_information(date_str: str, data_range: str = "M") -> tuple[date
         return date_obj, start_date, end_date
 
     except ValueError as e:
-        src_utils_logger.error(f"Некорректный формат даты {date_str}")
+        src_utils_logger.error("Некорректный формат даты %s", date_str)
         raise ValueError(f"Некорректный формат даты: {e}")
 
 
+def get_date_windows(date_strs: Sequence[str],
+                     data_range: str = "M") -> tuple[pd.DatetimeIndex, pd.DatetimeIndex, pd.DatetimeIndex]:
+    """Возвращает даты, начальные и конечные даты для фильтрации транзакций по набору дат.
+
+    Результат для каждой даты совпадает с get_date_obj_information.
+    """
+    try:
+        dates = pd.DatetimeIndex(pd.to_datetime(list(date_strs), format="%Y-%m-%d %H:%M:%S"))
+        src_utils_logger.info("Даты преобразованы в объекты datetime: %s", len(dates))
+    except ValueError as e:
+        src_utils_logger.error("Некорректный формат даты в наборе дат")
+        raise ValueError(f"Некорректный формат даты: {e}")
+
+    end_dates = dates + pd.Timedelta(days=1)
+    if data_range == "W":
+        days_back = np.asarray((dates.dayofweek + 1) % 7 - 1)
+    elif data_range == "M":
+        days_back = np.asarray(dates.day - 1)
+    elif data_range == "Y":
+        days_back = np.asarray(dates.dayofyear - 1)
+    else:
+        days_back = np.zeros(len(dates), dtype="int64")
+    start_dates = dates - pd.to_timedelta(days_back, unit="D")
+
+    return dates, start_dates, end_dates
+
+
 def get_greeting(date_obj: datetime) -> str:
     """Возвращает приветствие в зависимости от текущего времени."""
     if 6 <= date_obj.hour < 12:
@@ -104,70 +171,110 @@ def get_greeting(date_obj: datetime) -> str:
         return "Доброй ночи"
 
 
-def filter_transactions(transactions_df: pd.DataFrame,
+def filter_transactions(transactions_df: Union[pd.DataFrame, str],
                         start_date: datetime,
                         end_date: datetime,
-                        date_obj: datetime) -> pd.DataFrame:
-    """Возвращает транзакции, отфильтрованные по дате."""
+                        date_obj: datetime,
+                        date_order: Optional[str] = DETECT_ORDER) -> pd.DataFrame:
+    """Возвращает транзакции, отфильтрованные по дате.
+
+    Вместо DataFrame можно передать каталог или шаблон пути к месячным выпискам, тогда считываются
+    только выписки за месяцы диапазона. date_order - порядок дат DataFrame, см. select_date_range.
+    """
     try:
+        if isinstance(transactions_df, str):
+            date_order = DETECT_ORDER
         if start_date == date_obj:
-            filtered_transactions = transactions_df[(transactions_df["Дата операции"] <= end_date)]
+            transactions_df = read_transactions_range(transactions_df, end_date=end_date)
+            filtered_transactions = select_date_range(transactions_df, end_date=end_date, include_end=True,
+                                                      date_order=date_order)
         else:
-            filtered_transactions = transactions_df[(transactions_df["Дата операции"] >= start_date) &
-                                                    (transactions_df["Дата операции"] < end_date)]
+            transactions_df = read_transactions_range(transactions_df, start_date, end_date)
+            filtered_transactions = select_date_range(transactions_df, start_date, end_date, date_order=date_order)
 
         src_utils_logger.info("Транзакции отфильтрованы по дате")
         return filtered_transactions
 
     except KeyError as e:
-        src_utils_logger.error(f"Ошибка фильтрации транзакций по дате: {e}")
+        src_utils_logger.error("Ошибка фильтрации транзакций по дате: %s", e)
         raise KeyError(f"Ошибка: {e}")
 
 
 def get_card_spent_cashback(transactions_df: pd.DataFrame) -> list[dict]:
-    """Возвращает общую сумму расходов, кешбэк по каждой карте."""
+    """Возвращает общую сумму расходов, кешбэк по каждой карте.
+
+    Суммы считаются в копейках, как в дневном кубе, чтобы итоги не зависели от порядка сложения.
+    """
     try:
-        result = transactions_df.groupby("Номер карты").agg({"Сумма операции": "sum", "Кэшбэк": "sum"})
+        codes, cards = factorize_sorted(transactions_df["Номер карты"])
+        amounts = transactions_df["Сумма операции"].to_numpy(dtype="float64")
+        if not is_compact(transactions_df):
+            amounts = np.round(amounts * 100)
+        cashback = np.round(transactions_df["Кэшбэк"].to_numpy(dtype="float64") * 100)
+
+        result = make_card_totals(codes, cards, np.nan_to_num(amounts), np.nan_to_num(cashback),
+                                  np.ones(len(codes)), transactions_df["Кэшбэк"].dtype)
         src_utils_logger.info("Получены сумма расходов, кешбэк по каждой карте")
 
-        result_dict = result.to_dict(orient="index")
-
-        cards_info = []
-        for key, value in result_dict.items():
-            card_info = dict()
-            card_info["last_digits"] = str(key)[-4:]
-            card_info["total_spent"] = abs(round(value["Сумма операции"], 2))
-            card_info["cashback"] = value["Кэшбэк"]
-            cards_info.append(card_info)
-
-        return cards_info
+        return make_card_spent_cashback(result)
 
     except KeyError as e:
-        src_utils_logger.error(f"Ошибка при получении данных по каждой карте: {e}")
+        src_utils_logger.error("Ошибка при получении данных по каждой карте: %s", e)
         raise KeyError(f"Ошибка: {e}")
 
 
+def make_card_totals(card_codes: np.ndarray,
+                     cards: pd.Index,
+                     amounts: np.ndarray,
+                     cashback: np.ndarray,
+                     counts: np.ndarray,
+                     cashback_dtype: Any) -> pd.DataFrame:
+    """Создает суммы операций в рублях и кешбэк по картам из сумм в копейках по кодам factorize_sorted.
+
+    Карты без операций (counts) не включаются, кешбэк приводится к cashback_dtype, если он целочисленный.
+    """
+    valid = card_codes >= 0
+    codes = card_codes[valid]
+    card_counts = np.bincount(codes, counts[valid], minlength=len(cards))
+    card_amounts = np.bincount(codes, amounts[valid], minlength=len(cards)) / 100
+    card_cashback = pd.Series(np.bincount(codes, cashback[valid], minlength=len(cards)) / 100)
+    if pd.api.types.is_integer_dtype(cashback_dtype):
+        card_cashback = card_cashback.astype(cashback_dtype)
+
+    present = card_counts > 0
+    return pd.DataFrame({"Сумма операции": card_amounts[present], "Кэшбэк": card_cashback[present].to_numpy()},
+                        index=cards[present])
+
+
+def make_card_spent_cashback(card_totals: pd.DataFrame) -> list[dict]:
+    """Формирует список с суммой расходов и кешбэком по каждой карте.
+
+    card_totals - суммы операций в рублях и кешбэк, индексированные номером карты.
+    """
+    cards = make_records(card_totals.rename_axis("Номер карты").reset_index())
+
+    return [{"last_digits": str(card["Номер карты"])[-4:],
+             "total_spent": abs(round(card["Сумма операции"], 2)),
+             "cashback": card["Кэшбэк"]}
+            for card in cards]
+
+
 def get_top_five_transactions(transactions_df: pd.DataFrame) -> list[dict]:
-    """Возвращает топ-5 транзакций по сумме платежа."""
+    """Возвращает топ-5 транзакций по сумме платежа, при равных суммах - в порядке транзакций."""
     try:
-        top_transactions = transactions_df.sort_values("Сумма операции с округлением", ascending=False).head(5)
+        top_order = (transactions_df["Сумма операции с округлением"].reset_index(drop=True)
+                     .sort_values(ascending=False, kind="stable").index[:5])
+        top_transactions = transactions_df.iloc[top_order][["Дата операции", "Сумма операции", "Категория",
+                                                            "Описание"]]
         src_utils_logger.info("Транзакции отсортированы по сумме платежа")
 
-        top_transactions_dict = top_transactions.to_dict(orient="index")
+        top_transactions = restore_default_schema(top_transactions)
+        top_transactions = top_transactions.assign(**{"Сумма операции": top_transactions["Сумма операции"].abs()})
 
-        top_five_transactions = []
-        for key, value in top_transactions_dict.items():
-            top_transact = dict()
-            top_transact["date"] = value["Дата операции"].strftime("%d.%m.%Y")
-            top_transact["amount"] = abs(value["Сумма операции"])
-            top_transact["category"] = value["Категория"]
-            top_transact["description"] = value["Описание"]
-            top_five_transactions.append(top_transact)
-
-        return top_five_transactions
+        return make_records(top_transactions.set_axis(TOP_TRANSACTION_KEYS, axis=1), date_format="%d.%m.%Y")
 
     except KeyError as e:
-        src_utils_logger.error(f"Ошибка при сортировке транзакций по сумме платежа: {e}")
+        src_utils_logger.error("Ошибка при сортировке транзакций по сумме платежа: %s", e)
         raise KeyError(f"Ошибка: {e}")
 
 
@@ -175,14 +282,15 @@ def get_total_expenses(transactions_df: pd.DataFrame) -> dict:
     """Возвращает общую сумму расходов."""
     try:
         total_amount = transactions_df[transactions_df["Сумма операции"] < 0]["Сумма операции"].sum()
+        total_amount = to_rubles(total_amount, transactions_df)
         src_utils_logger.info("Получена сумма расходов")
 
-        total_expenses = {"total_amount": abs(int(round(float(total_amount), 0)))}
+        total_expenses = {"total_amount": abs(round_rubles(total_amount))}
 
         return total_expenses
 
     except KeyError as e:
-        src_utils_logger.error(f"Ошибка при получении суммы расходов: {e}")
+        src_utils_logger.error("Ошибка при получении суммы расходов: %s", e)
         raise KeyError(f"Ошибка: {e}")
 
 
@@ -190,39 +298,29 @@ def get_total_income(transactions_df: pd.DataFrame) -> dict:
     """Возвращает общую сумму поступлений."""
     try:
         total_amount = transactions_df[transactions_df["Сумма операции"] > 0]["Сумма операции"].sum()
+        total_amount = to_rubles(total_amount, transactions_df)
         src_utils_logger.info("Получена сумма поступлений")
 
-        total_income = {"total_amount": int(round(float(total_amount), 0))}
+        total_income = {"total_amount": round_rubles(total_amount)}
 
         return total_income
 
     except KeyError as e:
-        src_utils_logger.error(f"Ошибка при получении суммы поступлений: {e}")
+        src_utils_logger.error("Ошибка при получении суммы поступлений: %s", e)
         raise KeyError(f"Ошибка: {e}")
 
 
 def get_top_categories_expenses(transactions_df: pd.DataFrame) -> list[dict]:
     """Возвращает сумму расходов по 8 категориям."""
     try:
-        result = transactions_df.groupby("Категория")["Сумма операции"].sum().loc[lambda x: x < 0].sort_values()
-        other_category = result.iloc[7:].sum()
+        result = transactions_df.groupby("Категория", observed=True)["Сумма операции"].sum()
+        result = to_rubles(result, transactions_df)
         src_utils_logger.info("Получена сумма расходов по категориям")
 
-        result_list = result.reset_index().to_dict(orient="records")
-        categories = [item for item in result_list[:7]]
-        categories.append({
-            "Категория": "Остальное",
-            "Сумма операции": float(other_category)})
-
-        for item in categories:
-            item["category"] = item.pop("Категория")
-            item["amount"] = item.pop("Сумма операции")
-            item["amount"] = abs(int(round(float(item["amount"]), 0)))
-
-        return categories
+        return make_top_categories_expenses(result)
 
     except KeyError as e:
-        src_utils_logger.error(f"Ошибка при получении суммы расходов по категориям: {e}")
+        src_utils_logger.error("Ошибка при получении суммы расходов по категориям: %s", e)
         raise KeyError(f"Ошибка: {e}")
 
 
@@ -230,20 +328,14 @@ def get_top_categories_income(transactions_df: pd.DataFrame) -> list[dict]:
     """Возвращает сумму поступлений по категориям."""
     try:
         result = (transactions_df[transactions_df["Сумма операции"] > 0].
-                  groupby("Категория")["Сумма операции"].sum().sort_values(ascending=False))
+                  groupby("Категория", observed=True)["Сумма операции"].sum())
+        result = to_rubles(result, transactions_df)
         src_utils_logger.info("Получена сумма поступлений по категориям")
 
-        categories = result.reset_index().to_dict(orient="records")
-
-        for item in categories:
-            item["category"] = item.pop("Категория")
-            item["amount"] = item.pop("Сумма операции")
-            item["amount"] = int(round(float(item["amount"]), 0))
-
-        return categories
+        return make_top_categories_income(result)
 
     except KeyError as e:
-        src_utils_logger.error(f"Ошибка при получении суммы поступлений по категориям: {e}")
+        src_utils_logger.error("Ошибка при получении суммы поступлений по категориям: %s", e)
         raise KeyError(f"Ошибка: {e}")
 
 
@@ -252,23 +344,207 @@ def get_transfers_and_cash_expenses(transactions_df: pd.DataFrame) -> list[dict]
     try:
         transfers_and_cash = (transactions_df[transactions_df["Категория"].isin(["Переводы", "Наличные"]) &
                                               (transactions_df["Сумма операции"] < 0)].
-                              groupby("Категория")["Сумма операции"].sum().sort_values())
+                              groupby("Категория", observed=True)["Сумма операции"].sum())
+        transfers_and_cash = to_rubles(transfers_and_cash, transactions_df)
         src_utils_logger.info("Получена сумма расходов по категориям 'Наличные' и 'Переводы'")
 
-        if "Переводы" not in transfers_and_cash:
-            transfers_and_cash.loc["Переводы"] = 0
-        if "Наличные" not in transfers_and_cash:
-            transfers_and_cash.loc["Наличные"] = 0
+        return make_transfers_and_cash_expenses(transfers_and_cash)
+
+    except KeyError as e:
+        src_utils_logger.error("Ошибка при получении данных по категориям 'Наличные' и 'Переводы': %s", e)
+        raise KeyError(f"Ошибка: {e}")
+
+
+def make_top_categories_expenses(category_amounts: pd.Series) -> list[dict]:
+    """Формирует список из 7 категорий с наибольшими расходами и категории 'Остальное'.
+
+    category_amounts - итоговые суммы операций по категориям, расходом считается отрицательная сумма.
+    """
+    result = category_amounts.loc[lambda x: x < 0].sort_values()
+    other_category = result.iloc[7:].sum()
+
+    categories = [{"category": category, "amount": abs(round_rubles(amount))}
+                  for category, amount in result.iloc[:7].items()]
+    categories.append({"category": "Остальное", "amount": abs(round_rubles(other_category))})
+
+    return categories
+
+
+def make_top_categories_income(category_income: pd.Series) -> list[dict]:
+    """Формирует список категорий, упорядоченный по убыванию суммы поступлений."""
+    result = category_income.sort_values(ascending=False)
+    return [{"category": category, "amount": round_rubles(amount)} for category, amount in result.items()]
+
+
+def make_transfers_and_cash_expenses(transfers_and_cash: pd.Series) -> list[dict]:
+    """Формирует список расходов по категориям 'Переводы' и 'Наличные', отсутствующие категории дополняются нулем."""
+    result = [(category, amount) for category, amount in transfers_and_cash.sort_values().items()]
+    for category in ("Переводы", "Наличные"):
+        if category not in transfers_and_cash:
+            result.append((category, 0))
+
+    return [{"category": category, "amount": abs(round_rubles(amount))} for category, amount in result]
+
+
+def round_rubles(amount: Any) -> int:
+    """Округляет сумму в рублях до целого, половина рубля округляется от нуля.
+
+    Сумма сначала округляется до копеек, поэтому погрешность сложения float не влияет на результат:
+    суммы, посчитанные в копейках и в рублях, округляются одинаково.
+    """
+    kopecks = Decimal(str(round(float(amount), 2)))
+    return int(kopecks.quantize(Decimal("1"), rounding=ROUND_HALF_UP))
 
-        transfers_and_cash_list = transfers_and_cash.reset_index().to_dict(orient="records")
 
-        for item in transfers_and_cash_list:
-            item["category"] = item.pop("Категория")
-            item["amount"] = item.pop("Сумма операции")
-            item["amount"] = abs(int(round(float(item["amount"]), 0)))
+def get_category_totals(transactions_df: pd.DataFrame) -> pd.DataFrame:
+    """Сворачивает транзакции в суммы по категории и знаку операции за один проход.
 
-        return transfers_and_cash_list
+    Суммы считаются в копейках, чтобы итоги по категориям не зависели от порядка сложения.
+    Транзакции без категории сохраняются в свертке, так как входят в общие суммы расходов и поступлений.
+    """
+    try:
+        amounts = transactions_df["Сумма операции"].to_numpy(dtype="float64")
+        if not is_compact(transactions_df):
+            amounts = np.round(amounts * 100)
+        codes, categories = factorize_sorted(transactions_df["Категория"])
+
+        keys = get_category_sign_keys(codes, np.sign(amounts), len(categories))
+        valid = keys >= 0
+        size = (len(categories) + 1) * 3
+        totals = make_category_totals(np.bincount(keys[valid], weights=amounts[valid], minlength=size),
+                                      np.bincount(keys[valid], minlength=size),
+                                      categories,
+                                      isinstance(transactions_df["Категория"].dtype, pd.CategoricalDtype))
+        src_utils_logger.info("Транзакции свернуты по категории и знаку операции")
+
+        return totals
 
     except KeyError as e:
-        src_utils_logger.error(f"Ошибка при получении данных по категориям 'Наличные' и 'Переводы': {e}")
+        src_utils_logger.error("Ошибка при свертке транзакций по категориям: %s", e)
         raise KeyError(f"Ошибка: {e}")
+
+
+def factorize_sorted(values: pd.Series) -> tuple[np.ndarray, pd.Index]:
+    """Возвращает коды значений и список значений в порядке, в котором их группирует groupby.
+
+    Пустым значениям соответствует код -1.
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.codes.to_numpy(dtype="int64"), values.cat.categories
+    codes, uniques = pd.factorize(values, sort=True)
+    return codes.astype("int64"), pd.Index(uniques)
+
+
+def get_category_sign_keys(codes: np.ndarray, signs: np.ndarray, n_categories: int) -> np.ndarray:
+    """Возвращает номера пар (категория, знак операции), упорядоченные как в get_category_totals.
+
+    Пустая категория идет после остальных, операциям без суммы соответствует номер -1.
+    """
+    codes = np.where(codes < 0, n_categories, codes)
+    keys = codes * 3 + np.nan_to_num(signs).astype("int64") + 1
+    return np.where(np.isnan(signs), -1, keys)
+
+
+def make_category_totals(sums: np.ndarray,
+                         counts: np.ndarray,
+                         categories: pd.Index,
+                         categorical: bool = False) -> pd.DataFrame:
+    """Создает свертку по категории и знаку операции из сумм и числа операций по номерам get_category_sign_keys."""
+    present = np.flatnonzero(counts)
+    category_codes = present // 3
+
+    totals = pd.DataFrame({
+        "Категория": pd.Categorical.from_codes(np.where(category_codes < len(categories), category_codes, -1),
+                                               categories),
+        "Знак операции": (present % 3 - 1).astype("float64"),
+        "Сумма операции": sums[present].round().astype("int64")
+    })
+    if not categorical:
+        totals["Категория"] = totals["Категория"].astype(object).where(totals["Категория"].notna(), np.nan)
+    totals.attrs[KOPECKS_ATTR] = True
+    return totals
+
+
+def reduce_transactions(transactions_df: pd.DataFrame, by_day: bool = False) -> pd.DataFrame:
+    """Сворачивает транзакции в суммы по карте, категории и знаку операции (и по дню, если задано by_day).
+
+    Функции расчета расходов, поступлений и данных по картам дают на свернутом DataFrame
+    тот же результат, что и на исходных транзакциях.
+    """
+    try:
+        amounts = transactions_df["Сумма операции"]
+        keys = [transactions_df["Номер карты"], transactions_df["Категория"],
+                pd.Series(np.sign(amounts), index=transactions_df.index, name="Знак операции")]
+        if by_day:
+            keys.insert(0, transactions_df["Дата операции"].dt.normalize().rename("День"))
+
+        reduced = (transactions_df.groupby(keys, dropna=False, sort=False, observed=True)
+                   .agg(**{"Сумма операции": ("Сумма операции", "sum"),
+                           "Кэшбэк": ("Кэшбэк", "sum"),
+                           "Количество операций": ("Сумма операции", "size")})
+                   .reset_index())
+        if is_compact(transactions_df):
+            reduced.attrs[KOPECKS_ATTR] = True
+        src_utils_logger.info("Транзакции свернуты по карте, категории и знаку операции")
+
+        return reduced
+
+    except KeyError as e:
+        src_utils_logger.error("Ошибка при свертке транзакций: %s", e)
+        raise KeyError(f"Ошибка: {e}")
+
+
+def merge_reduced_transactions(reduced_parts: Iterable[pd.DataFrame]) -> pd.DataFrame:
+    """Объединяет частичные свертки транзакций в одну."""
+    reduced_parts = list(reduced_parts)
+    merged = (pd.concat(reduced_parts, ignore_index=True)
+              .groupby(REDUCE_KEYS, dropna=False, sort=False, observed=True)
+              [["Сумма операции", "Кэшбэк", "Количество операций"]].sum()
+              .reset_index())
+    if any(is_compact(part) for part in reduced_parts):
+        merged.attrs[KOPECKS_ATTR] = True
+    return merged
+
+
+@instrument()
+def aggregate_transactions_chunks(chunks: Iterable[pd.DataFrame],
+                                  start_date: Optional[datetime] = None,
+                                  end_date: Optional[datetime] = None,
+                                  date_obj: Optional[datetime] = None) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Агрегирует поток фрагментов транзакций с ограниченным расходом памяти.
+
+    Возвращает свертку для функций расчета расходов, поступлений и данных по картам
+    и транзакции-кандидаты для get_top_five_transactions. Кандидаты идут в порядке исходных транзакций,
+    поэтому при равных суммах топ совпадает с топом по всем транзакциям.
+    """
+    reduced: Optional[pd.DataFrame] = None
+    top_candidates: Optional[pd.DataFrame] = None
+
+    for chunk in chunks:
+        if start_date is not None and end_date is not None and date_obj is not None:
+            chunk = filter_transactions(chunk, start_date, end_date, date_obj)
+
+        chunk_reduced = reduce_transactions(chunk)
+        reduced = chunk_reduced if reduced is None else merge_reduced_transactions([reduced, chunk_reduced])
+
+        chunk_top = keep_top_candidates(chunk)
+        if top_candidates is not None:
+            chunk_top = pd.concat([top_candidates, chunk_top], ignore_index=True)
+        top_candidates = keep_top_candidates(chunk_top)
+
+    if reduced is None or top_candidates is None:
+        empty = pd.DataFrame(columns=REDUCE_KEYS + ["Сумма операции", "Кэшбэк", "Количество операций"])
+        return empty, pd.DataFrame()
+
+    src_utils_logger.info("Фрагменты транзакций агрегированы")
+    return reduced, top_candidates
+
+
+def keep_top_candidates(transactions_df: pd.DataFrame, size: int = 5) -> pd.DataFrame:
+    """Оставляет транзакции, которые могут попасть в топ по сумме платежа, сохраняя их порядок."""
+    amounts = transactions_df["Сумма операции с округлением"]
+    if len(amounts) <= size:
+        return transactions_df
+    threshold = amounts.nlargest(size).iloc[-1]
+    top_candidates: pd.DataFrame = transactions_df[amounts >= threshold]
+    return top_candidates
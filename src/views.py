@@ -1,22 +1,82 @@
-import os
+from __future__ import annotations
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from typing import TYPE_CHECKING, Any, Callable, Optional, TypeVar
+
+from src.cube import DailyCube, build_daily_cube, get_events_information_cube, get_information_home_page_cube
+from src.dataset import get_dataset
+from src.external_api import BATCH_SIZE, QuoteProvider, get_currency_rates, get_stock_prices
+from src.lazy_import import lazy_import
+from src.logging_config import views_logger
+from src.quote_cache import get_quote_cache
+
+if TYPE_CHECKING:
+    import pandas as pd
+else:
+    pd = lazy_import("pandas")
+
+T = TypeVar("T")
+
 
-from config import ROOT_DIR
-from src.external_api import get_currency_rates, get_stock_prices
-from src.read_xlsx import read_transactions_excel
-from src.utils import get_events_information, get_information_home_page
+def run_stage(timings: dict[str, float], stage: str, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Выполняет этап расчета страницы и записывает его длительность в секундах в timings[stage]."""
+    start = time.perf_counter()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        timings[stage] = time.perf_counter() - start
+
+
+def load_transactions() -> tuple[pd.DataFrame, DailyCube, Optional[str]]:
+    """Возвращает общий набор транзакций, построенный по нему дневной куб и порядок дат операций."""
+    dataset = get_dataset()
+    return dataset.frame, dataset.get_index("daily_cube", build_daily_cube), dataset.date_order
 
 
 def get_inform_for_veb_page(date_str: str = datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                            data_range: str = "M") -> tuple:
-    """Возвращает JSON-строку для страницы 'Главная'"""
-    filepath = os.path.join(ROOT_DIR, "data", "operations.xlsx")
-    transactions = read_transactions_excel(filepath)
-    currency_rates = get_currency_rates()
-    stock_prices = get_stock_prices()
+                            data_range: str = "M",
+                            parallel: bool = False,
+                            provider: Optional[QuoteProvider] = None,
+                            use_cache: bool = True,
+                            timings: Optional[dict[str, float]] = None) -> tuple:
+    """Возвращает JSON-строку для страницы 'Главная'
+
+    Загрузка транзакций, запрос курсов валют и запрос стоимости акций выполняются одновременно,
+    затем данные страниц 'Главная' и 'События' рассчитываются параллельно по общим данным.
+    При parallel=True запросы по отдельным символам тоже отправляются одновременно.
+    Котировки берутся из общего кэша (если use_cache=True) и обновляются по истечении времени жизни,
+    недостающие запрашиваются у provider, по умолчанию - у API twelvedata списками символов.
+    Длительность этапов в секундах записывается в timings, если словарь передан.
+    """
+    stage_timings: dict[str, float] = {} if timings is None else timings
+    start = time.perf_counter()
+    cache = get_quote_cache() if use_cache else None
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        transactions_future = executor.submit(run_stage, stage_timings, "transactions", load_transactions)
+        currency_rates_future = executor.submit(run_stage, stage_timings, "currency_rates", get_currency_rates,
+                                                parallel=parallel, cache=cache, batch_size=BATCH_SIZE,
+                                                provider=provider)
+        stock_prices_future = executor.submit(run_stage, stage_timings, "stock_prices", get_stock_prices,
+                                              parallel=parallel, cache=cache, batch_size=BATCH_SIZE,
+                                              provider=provider)
+        transactions, cube, date_order = transactions_future.result()
+        currency_rates = currency_rates_future.result()
+        stock_prices = stock_prices_future.result()
 
-    inform_for_home_page = get_information_home_page(date_str, transactions, currency_rates, stock_prices)
+        home_page_future = executor.submit(run_stage, stage_timings, "home_page", get_information_home_page_cube,
+                                           date_str, transactions, cube, currency_rates, stock_prices, date_order)
+        events_future = executor.submit(run_stage, stage_timings, "events_page", get_events_information_cube,
+                                        date_str, transactions, cube, currency_rates, stock_prices, data_range)
+        inform_for_home_page = home_page_future.result()
+        events_information = events_future.result()
 
-    events_information = get_events_information(date_str, transactions, currency_rates, stock_prices, data_range,)
+    stage_timings["total"] = time.perf_counter() - start
+    if views_logger.isEnabledFor(logging.INFO):
+        views_logger.info("Время этапов страницы: %s", ", ".join(f"{stage} {seconds * 1000:.1f} мс"
+                                                                 for stage, seconds in stage_timings.items()))
 
     return inform_for_home_page, events_information
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import hashlib
+import importlib.util
+import json
+import os
+from typing import TYPE_CHECKING, Optional
+
+from src.lazy_import import lazy_import
+from src.logging_config import read_xlsx_logger
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+else:
+    np = lazy_import("numpy")
+    pd = lazy_import("pandas")
+
+CACHE_VERSION = 1
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def is_cache_available() -> bool:
+    """Проверяет, установлен ли pyarrow, необходимый для колоночного кэша."""
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def get_cache_paths(filepath: str) -> tuple[str, str]:
+    """Возвращает пути к файлу кэша и файлу его метаданных рядом с XLSX-файлом."""
+    base_path = os.path.splitext(filepath)[0]
+    return f"{base_path}.cache.feather", f"{base_path}.cache.json"
+
+
+def get_file_hash(filepath: str) -> str:
+    """Возвращает SHA-256 содержимого файла."""
+    file_hash = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for block in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            file_hash.update(block)
+    return file_hash.hexdigest()
+
+
+def get_workbook_fingerprint(filepath: str, with_hash: bool = True) -> dict:
+    """Возвращает размер, время изменения и хеш содержимого XLSX-файла."""
+    stat = os.stat(filepath)
+    fingerprint: dict = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    if with_hash:
+        fingerprint["sha256"] = get_file_hash(filepath)
+    return fingerprint
+
+
+def read_cache_meta(meta_path: str) -> Optional[dict]:
+    """Считывает метаданные кэша, если они существуют и корректны."""
+    try:
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+    if not isinstance(meta, dict) or meta.get("version") != CACHE_VERSION:
+        return None
+    return meta
+
+
+def write_cache_meta(meta_path: str, meta: dict) -> None:
+    """Атомарно записывает метаданные кэша."""
+    tmp_path = f"{meta_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, meta_path)
+
+
+def is_cache_valid(filepath: str, meta: dict) -> bool:
+    """Проверяет, соответствует ли кэш текущему состоянию XLSX-файла.
+
+    Размер сравнивается всегда, при совпадении времени изменения кэш считается актуальным.
+    Если изменилось только время (файл скопирован или «тронут»), сверяется хеш содержимого.
+    """
+    fingerprint = get_workbook_fingerprint(filepath, with_hash=False)
+    if fingerprint["size"] != meta.get("size"):
+        return False
+    if fingerprint["mtime_ns"] == meta.get("mtime_ns"):
+        return True
+    if get_file_hash(filepath) != meta.get("sha256"):
+        return False
+
+    meta["mtime_ns"] = fingerprint["mtime_ns"]
+    write_cache_meta(get_cache_paths(filepath)[1], meta)
+    return True
+
+
+def load_cached_transactions(filepath: str) -> Optional[pd.DataFrame]:
+    """Возвращает DataFrame из кэша или None, если кэш отсутствует или устарел."""
+    if not is_cache_available():
+        return None
+
+    cache_path, meta_path = get_cache_paths(filepath)
+    meta = read_cache_meta(meta_path)
+    if meta is None or not os.path.exists(cache_path):
+        return None
+
+    if not is_cache_valid(filepath, meta):
+        read_xlsx_logger.info("Кэш %s устарел.", cache_path)
+        return None
+
+    try:
+        transactions_df = pd.read_feather(cache_path)
+    except (OSError, ValueError) as e:
+        read_xlsx_logger.warning("Не удалось прочитать кэш %s: %s.", cache_path, e)
+        return None
+
+    object_columns = transactions_df.select_dtypes(include="object").columns
+    for column in object_columns:
+        transactions_df[column] = transactions_df[column].where(transactions_df[column].notna(), np.nan)
+
+    read_xlsx_logger.info("Транзакции загружены из кэша %s.", cache_path)
+    return transactions_df
+
+
+def save_cached_transactions(filepath: str, transactions_df: pd.DataFrame) -> None:
+    """Сохраняет DataFrame в колоночный кэш рядом с XLSX-файлом."""
+    if not is_cache_available():
+        read_xlsx_logger.warning("pyarrow не установлен, кэш XLSX-файлов отключен.")
+        return
+
+    cache_path, meta_path = get_cache_paths(filepath)
+    try:
+        meta = get_workbook_fingerprint(filepath)
+        meta["version"] = CACHE_VERSION
+
+        if os.path.exists(meta_path):
+            os.remove(meta_path)
+
+        tmp_path = f"{cache_path}.tmp"
+        transactions_df.to_feather(tmp_path)
+        os.replace(tmp_path, cache_path)
+        write_cache_meta(meta_path, meta)
+        read_xlsx_logger.info("Транзакции сохранены в кэш %s.", cache_path)
+
+    except (OSError, ValueError) as e:
+        read_xlsx_logger.warning("Не удалось сохранить кэш %s: %s.", cache_path, e)
+
+
+def invalidate_cache(filepath: str) -> None:
+    """Удаляет кэш XLSX-файла."""
+    for path in get_cache_paths(filepath):
+        if os.path.exists(path):
+            os.remove(path)
@@ -1,3 +1,6 @@
+import os
+from pathlib import Path
+
 import pandas as pd
 import pytest
 
@@ -96,3 +99,22 @@ def filtered_transactions_invalid_list() -> list[dict]:
     })
 
     return transact_df.to_dict(orient="records")
+
+
+@pytest.fixture
+def statements_dir(tmp_path: Path) -> str:
+    for month, amount in [("2021-10", -100.0), ("2021-11", -200.0), ("2021-12", 300.0)]:
+        pd.DataFrame({
+            "Дата операции": [f"15.{month[5:]}.{month[:4]} 12:00:00", f"01.{month[5:]}.{month[:4]} 09:00:00"],
+            "Сумма операции": [amount, amount * 2],
+            "Категория": ["Супермаркеты", "Переводы"]
+        }).to_excel(os.path.join(tmp_path, f"statement_{month}.xlsx"), index=False)
+    return str(tmp_path)
+
+
+@pytest.fixture(scope="session")
+def operations_transactions() -> pd.DataFrame:
+    from config import ROOT_DIR
+    from src.read_xlsx import read_transactions_excel
+
+    return read_transactions_excel(os.path.join(ROOT_DIR, "data", "operations.xlsx"), use_cache=False)
@@ -0,0 +1,96 @@
+import json
+import random
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator
+from urllib.parse import parse_qs, urlparse
+
+
+class QuoteStubServer(ThreadingHTTPServer):
+    """Локальный сервер, имитирующий API котировок: отвечает с задержкой и запоминает запрошенные символы.
+
+    Символы можно передать списком через запятую, тогда ответ содержит котировки по каждому символу.
+    С вероятностью failure_rate вместо котировки возвращается ответ 503.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, latency: float, failure_rate: float = 0.0, seed: int = 0) -> None:
+        super().__init__(("127.0.0.1", 0), QuoteStubHandler)
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.random = random.Random(seed)
+        self.symbols: list[str] = []
+        self.connections = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}"
+
+
+class QuoteStubHandler(BaseHTTPRequestHandler):
+    server: QuoteStubServer
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def setup(self) -> None:
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        symbol = parse_qs(url.query)["symbol"][0]
+        with self.server.lock:
+            self.server.symbols.append(symbol)
+            failed = self.server.random.random() < self.server.failure_rate
+        time.sleep(self.server.latency)
+
+        if failed:
+            self.send_error(503)
+            return
+
+        if url.path not in ("/exchange_rate", "/price"):
+            self.send_error(404)
+            return
+
+        quotes = {quote_symbol: get_stub_body(url.path, quote_symbol) for quote_symbol in symbol.split(",")}
+        body = quotes[symbol] if len(quotes) == 1 else quotes
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+def get_stub_body(path: str, symbol: str) -> dict:
+    """Возвращает ответ сервера на запрос котировки одного символа."""
+    if path == "/exchange_rate":
+        return {"symbol": symbol, "rate": str(get_stub_quote(symbol))}
+    return {"price": str(get_stub_quote(symbol))}
+
+
+def get_stub_quote(symbol: str) -> float:
+    """Возвращает котировку, которую сервер отдает для символа."""
+    return 10 + sum(ord(char) for char in symbol) / 7
+
+
+@contextmanager
+def run_quote_stub(latency: float = 0.0, failure_rate: float = 0.0, seed: int = 0) -> Iterator[QuoteStubServer]:
+    """Запускает сервер котировок в фоновом потоке."""
+    server = QuoteStubServer(latency, failure_rate, seed)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
@@ -0,0 +1,177 @@
+import json
+from datetime import datetime
+from typing import Optional
+
+import pandas as pd
+import pytest
+
+from src.cube import (
+    build_daily_cube,
+    get_events_information_batch,
+    get_events_information_cube,
+    get_information_home_page_batch,
+    get_information_home_page_cube,
+    get_window_bounds
+)
+from src.date_index import select_date_range, sort_transactions_by_date
+from src.schema import apply_compact_schema
+from src.utils import (
+    filter_transactions,
+    get_card_spent_cashback,
+    get_events_information,
+    get_expenses_and_income,
+    get_information_home_page,
+    get_total_expenses,
+    make_card_spent_cashback,
+    make_expenses_and_income,
+    reduce_transactions
+)
+
+
+@pytest.fixture
+def timed_transactions(filtered_transactions: pd.DataFrame) -> pd.DataFrame:
+    transactions = filtered_transactions.copy()
+    transactions["Дата операции"] += pd.to_timedelta([i * 3 for i in range(len(transactions))], unit="h")
+    return sort_transactions_by_date(transactions)
+
+
+def test_build_daily_cube(filtered_transactions: pd.DataFrame) -> None:
+    cube = build_daily_cube(filtered_transactions)
+
+    totals = cube.window()
+
+    assert list(cube.days.astype(str)) == ["2023-02-02", "2023-02-03", "2023-02-04", "2023-02-05"]
+    assert len(cube.keys) == len(totals)
+    assert totals["Количество операций"].sum() == len(filtered_transactions)
+    assert totals["Сумма операции"].sum() / 100 == filtered_transactions["Сумма операции"].sum()
+    assert totals["Кэшбэк"].sum() == 12000
+
+
+def test_build_daily_cube_invalid(filtered_transactions_invalid: pd.DataFrame) -> None:
+    with pytest.raises(KeyError):
+        build_daily_cube(filtered_transactions_invalid)
+
+
+@pytest.mark.parametrize("start_date, end_date, include_end", [
+    (datetime(2023, 2, 3), datetime(2023, 2, 5), False),
+    (datetime(2023, 2, 2, 13), datetime(2023, 2, 4, 6), False),
+    (None, datetime(2023, 2, 3, 9), True),
+    (datetime(2023, 2, 3, 9), None, False),
+])
+def test_window(timed_transactions: pd.DataFrame,
+                start_date: Optional[datetime],
+                end_date: Optional[datetime],
+                include_end: bool) -> None:
+    cube = build_daily_cube(timed_transactions)
+    expected = reduce_transactions(select_date_range(timed_transactions, start_date, end_date, include_end))
+
+    result = cube.window(start_date, end_date, include_end)
+
+    assert (result["Количество операций"] > 0).all()
+    assert result["Количество операций"].sum() == expected["Количество операций"].sum()
+    assert result["Сумма операции"].sum() / 100 == expected["Сумма операции"].sum()
+    assert result["Кэшбэк"].sum() / 100 == expected["Кэшбэк"].sum()
+
+
+def test_window_empty(filtered_transactions: pd.DataFrame) -> None:
+    cube = build_daily_cube(filtered_transactions)
+
+    assert cube.window(datetime(2023, 2, 5), datetime(2023, 2, 3)).empty
+    assert cube.window(datetime(2024, 1, 1)).empty
+
+
+@pytest.mark.parametrize("start_date, end_date, date_obj, expected", [
+    (datetime(2023, 2, 2, 12), datetime(2023, 2, 4, 12), datetime(2023, 2, 3, 12), 1801),
+    (datetime(2023, 2, 4, 12), datetime(2023, 2, 4, 12, 0, 1), datetime(2023, 2, 4, 12), 4101),
+    (datetime(2023, 2, 3, 1), datetime(2023, 2, 3, 5), datetime(2023, 2, 3, 4), 0),
+])
+def test_get_window_bounds(timed_transactions: pd.DataFrame,
+                           start_date: datetime,
+                           end_date: datetime,
+                           date_obj: datetime,
+                           expected: int) -> None:
+    cube = build_daily_cube(timed_transactions)
+
+    result = cube.windows(*get_window_bounds([start_date], [end_date], [date_obj]))
+
+    assert get_total_expenses(result[0]) == {"total_amount": expected}
+    assert get_total_expenses(filter_transactions(timed_transactions, start_date, end_date, date_obj)) == {
+        "total_amount": expected}
+
+
+def test_card_and_category_totals(timed_transactions: pd.DataFrame) -> None:
+    cube = build_daily_cube(timed_transactions)
+    window = select_date_range(timed_transactions, datetime(2023, 2, 2, 13), datetime(2023, 2, 4, 6))
+
+    sums = cube.window_sums([datetime(2023, 2, 2, 13)], [datetime(2023, 2, 4, 6)], [False])
+    row = {column: values[0] for column, values in sums.items()}
+
+    assert make_card_spent_cashback(cube.card_totals(row)) == get_card_spent_cashback(window)
+    assert make_expenses_and_income(cube.category_totals(row)) == get_expenses_and_income(window)
+
+
+@pytest.mark.parametrize("date_str", ["2023-02-02 10:00:00", "2023-02-04 00:00:00", "2023-02-04 13:30:00",
+                                      "2023-02-05 23:59:59", "2023-02-12 09:00:00"])
+@pytest.mark.parametrize("data_range", ["W", "M", "Y", "D"])
+def test_get_events_information_cube(timed_transactions: pd.DataFrame, date_str: str, data_range: str) -> None:
+    for transactions in (timed_transactions, apply_compact_schema(timed_transactions)):
+        cube = build_daily_cube(transactions)
+
+        result = get_events_information_cube(date_str, transactions, cube, [], [], data_range)
+
+        assert result == get_events_information(date_str, timed_transactions, [], [], data_range)
+
+
+@pytest.mark.parametrize("date_str", ["2023-02-02 10:00:00", "2023-02-04 13:30:00", "2023-02-12 09:00:00"])
+def test_get_information_home_page_cube(timed_transactions: pd.DataFrame, date_str: str) -> None:
+    cube = build_daily_cube(timed_transactions)
+    currency_rates = [{"currency": "USD", "rate": 90.5}]
+
+    result = get_information_home_page_cube(date_str, timed_transactions, cube, currency_rates, [])
+
+    assert result == get_information_home_page(date_str, timed_transactions, currency_rates, [])
+
+
+@pytest.mark.parametrize("data_range", ["W", "M", "Y", "D"])
+def test_get_events_information_batch(timed_transactions: pd.DataFrame, data_range: str) -> None:
+    date_strs = [f"2023-02-{day:02d} {hour:02d}:30:00" for day in range(1, 8) for hour in (0, 11, 23)]
+    cube = build_daily_cube(timed_transactions)
+
+    result = get_events_information_batch(date_strs, timed_transactions, cube, [], [], data_range)
+
+    assert result == [get_events_information(date_str, timed_transactions, [], [], data_range)
+                      for date_str in date_strs]
+
+
+def test_get_information_home_page_batch(timed_transactions: pd.DataFrame) -> None:
+    date_strs = ["2023-02-05 23:59:59", "2023-02-01 08:00:00", "2023-02-03 12:00:00", "2023-02-03 12:00:00"]
+    cube = build_daily_cube(timed_transactions)
+
+    result = get_information_home_page_batch(date_strs, timed_transactions, cube, [], [])
+
+    assert result == [get_information_home_page(date_str, timed_transactions, [], []) for date_str in date_strs]
+
+
+def test_get_information_home_page_batch_fractional_cashback(timed_transactions: pd.DataFrame) -> None:
+    transactions = timed_transactions.copy()
+    transactions["Кэшбэк"] = [31.52, 0.0, 18.61, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0]
+    date_strs = ["2023-02-05 23:59:59", "2023-02-03 12:00:00"]
+    cube = build_daily_cube(transactions)
+
+    result = get_information_home_page_batch(date_strs, transactions, cube, [], [])
+
+    assert result == [get_information_home_page(date_str, transactions, [], []) for date_str in date_strs]
+    assert json.loads(result[0])["cards"][0] == {"last_digits": "4556", "total_spent": 10100.5, "cashback": 50.13}
+
+
+def test_get_information_home_page_batch_empty(timed_transactions: pd.DataFrame) -> None:
+    cube = build_daily_cube(timed_transactions)
+
+    assert get_information_home_page_batch([], timed_transactions, cube, [], []) == []
+
+
+def test_get_events_information_batch_invalid_date(timed_transactions: pd.DataFrame) -> None:
+    cube = build_daily_cube(timed_transactions)
+
+    with pytest.raises(ValueError, match="Некорректный формат даты"):
+        get_events_information_batch(["2023-02-05 23:59:59", "05.02.2023"], timed_transactions, cube, [], [])
@@ -0,0 +1,95 @@
+from typing import Any
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from src.dataset import TransactionDataset, get_dataset
+
+
+@pytest.fixture
+def fake_df() -> pd.DataFrame:
+    return pd.DataFrame({
+        "Дата операции": pd.to_datetime(["01.01.2021 12:00:00"], format="%d.%m.%Y %H:%M:%S"),
+        "Сумма операции": [-100.0]
+    })
+
+
+@patch("src.dataset.read_transactions_excel")
+def test_dataset_reads_file_once(mock_read_excel: Any, fake_df: pd.DataFrame) -> None:
+    mock_read_excel.return_value = fake_df
+    dataset = TransactionDataset("fake/path.xlsx")
+
+    assert not dataset.is_loaded
+    first = dataset.frame
+    second = dataset.frame
+
+    assert first is second
+    assert first["Дата операции"].is_monotonic_decreasing
+    assert dataset.is_loaded
+    assert dataset.version == 1
+    mock_read_excel.assert_called_once_with("fake/path.xlsx", compact=False)
+
+
+@patch("src.dataset.read_transactions_excel")
+def test_dataset_reload(mock_read_excel: Any, fake_df: pd.DataFrame) -> None:
+    mock_read_excel.return_value = fake_df
+    dataset = TransactionDataset("fake/path.xlsx")
+    dataset.get_index("rows", len)
+
+    dataset.reload()
+
+    assert mock_read_excel.call_count == 2
+    assert dataset.version == 2
+    assert dataset.get_index("rows", lambda df: "rebuilt") == "rebuilt"
+
+
+@patch("src.dataset.build_date_order")
+@patch("src.dataset.read_transactions_excel")
+def test_dataset_date_order(mock_read_excel: Any, mock_build_date_order: Any, fake_df: pd.DataFrame) -> None:
+    mock_read_excel.return_value = fake_df
+    mock_build_date_order.return_value = "desc"
+    dataset = TransactionDataset("fake/path.xlsx")
+
+    assert dataset.date_order == "desc"
+    assert dataset.date_order == "desc"
+    mock_build_date_order.assert_called_once()
+
+    dataset.reload()
+
+    assert dataset.date_order == "desc"
+    assert mock_build_date_order.call_count == 2
+
+
+@patch("src.dataset.read_transactions_excel")
+def test_dataset_invalidate(mock_read_excel: Any, fake_df: pd.DataFrame) -> None:
+    mock_read_excel.return_value = fake_df
+    dataset = TransactionDataset("fake/path.xlsx")
+    _ = dataset.frame
+
+    dataset.invalidate()
+
+    assert not dataset.is_loaded
+    _ = dataset.frame
+    assert mock_read_excel.call_count == 2
+    assert dataset.version == 2
+
+
+@patch("src.dataset.read_transactions_excel")
+def test_dataset_get_index_cached(mock_read_excel: Any, fake_df: pd.DataFrame) -> None:
+    mock_read_excel.return_value = fake_df
+    dataset = TransactionDataset("fake/path.xlsx")
+    calls = []
+
+    def builder(frame: pd.DataFrame) -> int:
+        calls.append(frame)
+        return len(frame)
+
+    assert dataset.get_index("rows", builder) == 1
+    assert dataset.get_index("rows", builder) == 1
+    assert len(calls) == 1
+
+
+def test_get_dataset_shared() -> None:
+    assert get_dataset("fake/path.xlsx") is get_dataset("fake/path.xlsx")
+    assert get_dataset("fake/path.xlsx") is not get_dataset("other/path.xlsx")
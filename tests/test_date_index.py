@@ -0,0 +1,122 @@
+from datetime import datetime
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from src.date_index import build_date_order, get_date_order, select_date_range, sort_transactions_by_date
+
+
+def test_sort_transactions_by_date(filtered_transactions: pd.DataFrame) -> None:
+    shuffled = filtered_transactions.sample(frac=1, random_state=0)
+
+    result = sort_transactions_by_date(shuffled)
+
+    assert result["Дата операции"].is_monotonic_decreasing
+    assert result.index.tolist() == list(range(len(shuffled)))
+    assert sort_transactions_by_date(filtered_transactions) is filtered_transactions
+
+
+def test_sort_transactions_by_date_does_not_change_input(filtered_transactions: pd.DataFrame) -> None:
+    shuffled = filtered_transactions.sample(frac=1, random_state=0)
+
+    sort_transactions_by_date(shuffled)
+    sort_transactions_by_date(filtered_transactions)
+
+    assert shuffled.attrs == {}
+    assert filtered_transactions.attrs == {}
+
+
+def test_sort_transactions_by_date_with_empty_date(filtered_transactions: pd.DataFrame) -> None:
+    transactions = filtered_transactions.copy()
+    transactions.loc[0, "Дата операции"] = pd.NaT
+
+    result = sort_transactions_by_date(transactions)
+
+    assert result is transactions
+
+
+@pytest.mark.parametrize("dates, expected", [
+    (["2023-02-01", "2023-02-02", "2023-02-02"], "asc"),
+    (["2023-02-03", "2023-02-02", "2023-02-01"], "desc"),
+    (["2023-02-02", "2023-02-01", "2023-02-03"], None),
+    (["2023-02-01", None, "2023-02-03"], None),
+])
+def test_get_date_order(dates: list, expected: str) -> None:
+    assert get_date_order(pd.Series(pd.to_datetime(dates))) == expected
+
+
+@pytest.mark.parametrize("start_date, end_date, include_end, expected", [
+    (datetime(2023, 2, 3), datetime(2023, 2, 5), False, 4),
+    (datetime(2023, 2, 3), datetime(2023, 2, 5), True, 7),
+    (None, datetime(2023, 2, 3), False, 2),
+    (datetime(2023, 2, 4), None, False, 5),
+    (datetime(2023, 3, 1), datetime(2023, 4, 1), False, 0),
+    (datetime(2023, 2, 5), datetime(2023, 2, 1), False, 0),
+])
+def test_select_date_range(filtered_transactions: pd.DataFrame,
+                           start_date: datetime,
+                           end_date: datetime,
+                           include_end: bool,
+                           expected: int) -> None:
+    ascending = sort_transactions_by_date(filtered_transactions)
+    descending = sort_transactions_by_date(filtered_transactions.iloc[::-1].reset_index(drop=True))
+    unsorted = filtered_transactions.sample(frac=1, random_state=0)
+
+    for transactions in (ascending, descending, unsorted):
+        result = select_date_range(transactions, start_date, end_date, include_end)
+        assert len(result) == expected
+        if start_date is not None:
+            assert (result["Дата операции"] >= start_date).all()
+
+
+def test_select_date_range_is_slice(filtered_transactions: pd.DataFrame) -> None:
+    transactions = sort_transactions_by_date(filtered_transactions)
+
+    result = select_date_range(transactions, datetime(2023, 2, 3), datetime(2023, 2, 5))
+
+    assert result.index.tolist() == [2, 3, 4, 5]
+    assert result["Сумма операции"].to_numpy().base is not None
+
+
+def test_select_date_range_with_date_order(filtered_transactions: pd.DataFrame) -> None:
+    ascending = sort_transactions_by_date(filtered_transactions)
+    descending = sort_transactions_by_date(filtered_transactions.iloc[::-1].reset_index(drop=True))
+    orders = [build_date_order(ascending), build_date_order(descending)]
+
+    with patch("src.date_index.get_date_order", side_effect=AssertionError("даты не должны проверяться")):
+        results = [select_date_range(transactions, datetime(2023, 2, 3), datetime(2023, 2, 5), date_order=order)
+                   for transactions, order in zip((ascending, descending), orders)]
+        unordered = select_date_range(ascending, datetime(2023, 2, 3), datetime(2023, 2, 5), date_order=None)
+
+    assert orders == ["asc", "desc"]
+    assert [len(result) for result in results] == [4, 4]
+    assert results[0]["Сумма операции"].to_numpy().base is not None
+    assert unordered.index.tolist() == [2, 3, 4, 5]
+
+
+def test_select_date_range_ignores_reordered(filtered_transactions: pd.DataFrame) -> None:
+    transactions = sort_transactions_by_date(filtered_transactions).sort_values("Сумма операции")
+
+    result = select_date_range(transactions, datetime(2023, 2, 3), datetime(2023, 2, 5))
+
+    assert len(result) == 4
+
+
+def test_select_date_range_after_concat(filtered_transactions: pd.DataFrame) -> None:
+    transactions = sort_transactions_by_date(filtered_transactions)
+    combined = pd.concat([transactions, transactions.iloc[:4]], ignore_index=True)
+
+    result = select_date_range(combined, datetime(2023, 2, 2), datetime(2023, 2, 3))
+
+    assert len(result) == 4
+
+
+def test_select_date_range_after_date_reassignment(filtered_transactions: pd.DataFrame) -> None:
+    transactions = sort_transactions_by_date(filtered_transactions).copy()
+    transactions["Дата операции"] = transactions["Дата операции"].sample(frac=1, random_state=1).to_numpy()
+
+    result = select_date_range(transactions, datetime(2023, 2, 5))
+
+    assert len(result) == 3
+    assert (result["Дата операции"] >= datetime(2023, 2, 5)).all()
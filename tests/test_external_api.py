@@ -1,13 +1,28 @@
-from typing import Any
+import json
+import os
+import time
+from typing import Any, Iterator
 from unittest.mock import Mock, mock_open, patch
 
 import pytest
 import requests
 
-from src.external_api import get_currency_rates, get_stock_prices
+from config import ROOT_DIR
+from src.external_api import BATCH_SIZE, get_currency_rates, get_stock_prices, split_batch_response
+from src.http_client import HttpClient
+from src.quote_cache import QuoteCache
+from tests.quote_stub import QuoteStubServer, get_stub_quote, run_quote_stub
 
 
-@patch("src.external_api.requests.get")
+@pytest.fixture(autouse=True)
+def http_client() -> Iterator[HttpClient]:
+    client = HttpClient(sleep=lambda seconds: None)
+    with patch("src.external_api.get_http_client", return_value=client):
+        yield client
+    client.close()
+
+
+@patch("src.http_client.requests.Session.get")
 @patch("src.external_api.os.getenv", return_value="fake_api_key")
 @patch("src.external_api.json.load")
 @patch("builtins.open", new_callable=mock_open, read_data='{"user_currencies": ["USD", "EUR"]}')
@@ -43,7 +58,7 @@ def test_get_currency_rates_file_not_found(mock_open_file: Any) -> None:
     mock_open_file.assert_called_once()
 
 
-@patch("src.external_api.requests.get")
+@patch("src.http_client.requests.Session.get")
 @patch("src.external_api.os.getenv", return_value="fake_api_key")
 @patch("src.external_api.json.load")
 @patch("builtins.open", new_callable=mock_open, read_data='{"user_currencies": ["USD", "EUR"]}')
@@ -62,7 +77,7 @@ def test_get_currency_rates_request_exception(mock_open_file: Any,
     assert result == []
 
 
-@patch("src.external_api.requests.get")
+@patch("src.http_client.requests.Session.get")
 @patch("src.external_api.os.getenv", return_value="fake_api_key")
 @patch("src.external_api.json.load")
 @patch("builtins.open", new_callable=mock_open, read_data='{"user_currencies": ["USD", "EUR"]}')
@@ -98,7 +113,7 @@ def test_get_stock_prices_file_not_found(mock_open_file: Any) -> None:
     mock_open_file.assert_called_once()
 
 
-@patch("src.external_api.requests.get")
+@patch("src.http_client.requests.Session.get")
 @patch("src.external_api.os.getenv", return_value="fake_api_key")
 @patch("src.external_api.json.load")
 @patch("builtins.open", new_callable=mock_open, read_data='{"user_stocks": ["AAPL", "MSFT"]}')
@@ -115,3 +130,113 @@ def test_get_stock_prices_request_exception(mock_open_file: Any,
     result = get_stock_prices()
 
     assert result == []
+
+
+@pytest.fixture
+def quote_stub() -> Iterator[QuoteStubServer]:
+    with run_quote_stub(latency=0.2) as server:
+        yield server
+
+
+@pytest.fixture
+def user_settings() -> dict:
+    with open(os.path.join(ROOT_DIR, "user_settings.json")) as f:
+        settings: dict = json.load(f)
+    return settings
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_get_currency_rates_stub(quote_stub: QuoteStubServer, user_settings: dict, parallel: bool) -> None:
+    result = get_currency_rates(parallel=parallel, api_url=quote_stub.url)
+
+    assert result == [{"currency": currency, "rate": round(get_stub_quote(f"{currency}/RUB"), 2)}
+                      for currency in user_settings["user_currencies"]]
+
+
+def test_get_stock_prices_parallel(quote_stub: QuoteStubServer, user_settings: dict) -> None:
+    start = time.perf_counter()
+    result = get_stock_prices(parallel=True, api_url=quote_stub.url)
+    elapsed = time.perf_counter() - start
+
+    assert result == [{"stock": stock, "price": round(get_stub_quote(stock), 2)}
+                      for stock in user_settings["user_stocks"]]
+    assert sorted(quote_stub.symbols) == sorted(user_settings["user_stocks"])
+    assert elapsed < 0.2 * len(user_settings["user_stocks"]) / 2
+
+
+def test_get_stock_prices_parallel_max_workers(quote_stub: QuoteStubServer, user_settings: dict) -> None:
+    start = time.perf_counter()
+    result = get_stock_prices(parallel=True, max_workers=1, api_url=quote_stub.url)
+    elapsed = time.perf_counter() - start
+
+    assert [stock_price["stock"] for stock_price in result] == user_settings["user_stocks"]
+    assert quote_stub.symbols == user_settings["user_stocks"]
+    assert elapsed >= 0.2 * len(user_settings["user_stocks"])
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_get_stock_prices_timeout(quote_stub: QuoteStubServer, parallel: bool) -> None:
+    result = get_stock_prices(parallel=parallel, timeout=0.05, api_url=quote_stub.url)
+
+    assert result == []
+
+
+def test_get_stock_prices_cache(quote_stub: QuoteStubServer, user_settings: dict) -> None:
+    cache = QuoteCache(None)
+
+    first = get_stock_prices(parallel=True, api_url=quote_stub.url, cache=cache)
+    second = get_stock_prices(parallel=True, api_url=quote_stub.url, cache=cache)
+
+    assert first == second
+    assert sorted(quote_stub.symbols) == sorted(user_settings["user_stocks"])
+    assert cache.stats()["hits"] == len(user_settings["user_stocks"])
+
+
+def test_get_stock_prices_cache_partial_error(quote_stub: QuoteStubServer, user_settings: dict) -> None:
+    cache = QuoteCache(None)
+    first_stock = user_settings["user_stocks"][0]
+    cache.get_many([f"price:{first_stock}"], lambda keys: [{"price": "150.123"}])
+
+    result = get_stock_prices(timeout=0.05, api_url=quote_stub.url, cache=cache)
+
+    assert result == [{"stock": first_stock, "price": 150.12}]
+
+
+@pytest.mark.parametrize("batch_size, expected_requests", [(120, 1), (2, 3), (1, 5)])
+def test_get_stock_prices_batched(quote_stub: QuoteStubServer,
+                                  user_settings: dict,
+                                  batch_size: int,
+                                  expected_requests: int) -> None:
+    result = get_stock_prices(api_url=quote_stub.url, batch_size=batch_size)
+
+    assert result == [{"stock": stock, "price": round(get_stub_quote(stock), 2)}
+                      for stock in user_settings["user_stocks"]]
+    assert len(quote_stub.symbols) == expected_requests
+    assert ",".join(quote_stub.symbols) == ",".join(user_settings["user_stocks"])
+
+
+def test_get_currency_rates_batched(quote_stub: QuoteStubServer, user_settings: dict) -> None:
+    result = get_currency_rates(api_url=quote_stub.url, batch_size=BATCH_SIZE)
+
+    assert result == [{"currency": currency, "rate": round(get_stub_quote(f"{currency}/RUB"), 2)}
+                      for currency in user_settings["user_currencies"]]
+    assert quote_stub.symbols == [",".join(f"{currency}/RUB" for currency in user_settings["user_currencies"])]
+
+
+def test_get_stock_prices_batched_cache(quote_stub: QuoteStubServer, user_settings: dict) -> None:
+    cache = QuoteCache(None)
+    cache.get_many(["price:AAPL"], lambda keys: [{"price": "1.0"}])
+
+    result = get_stock_prices(api_url=quote_stub.url, cache=cache, batch_size=BATCH_SIZE)
+
+    assert result[0] == {"stock": "AAPL", "price": 1.0}
+    assert quote_stub.symbols == [",".join(stock for stock in user_settings["user_stocks"] if stock != "AAPL")]
+
+
+@pytest.mark.parametrize("symbols, response, expected", [
+    (["AAPL"], {"price": "1.0"}, [{"price": "1.0"}]),
+    (["AAPL", "MSFT"], {"AAPL": {"price": "1.0"}, "MSFT": {"price": "2.0"}}, [{"price": "1.0"}, {"price": "2.0"}]),
+    (["AAPL", "MSFT"], {"code": 429}, [{"code": 429}, {"code": 429}]),
+])
+def test_split_batch_response(symbols: list[str], response: dict, expected: list[dict]) -> None:
+    assert split_batch_response(symbols, response) == expected
@@ -0,0 +1,142 @@
+from typing import Iterator
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from src.external_api import get_stock_prices
+from src.http_client import CircuitBreaker, CircuitOpenError, HttpClient
+from src.quote_cache import QuoteCache
+from tests.quote_stub import QuoteStubServer, get_stub_quote, run_quote_stub
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def client() -> Iterator[HttpClient]:
+    http_client = HttpClient(retries=2, failure_threshold=2, reset_timeout=60, sleep=lambda seconds: None)
+    yield http_client
+    http_client.close()
+
+
+@pytest.fixture
+def quote_stub() -> Iterator[QuoteStubServer]:
+    with run_quote_stub() as server:
+        yield server
+
+
+@pytest.fixture
+def failing_stub() -> Iterator[QuoteStubServer]:
+    with run_quote_stub(failure_rate=1.0) as server:
+        yield server
+
+
+def test_circuit_breaker() -> None:
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+    clock.now = 10
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.allow()
+
+
+def test_circuit_breaker_failed_probe() -> None:
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+
+    clock.now = 10
+    assert breaker.allow()
+    breaker.record_failure()
+
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+
+def test_http_client_keep_alive(client: HttpClient, quote_stub: QuoteStubServer) -> None:
+    results = [client.get_json(f"{quote_stub.url}/price?symbol={symbol}") for symbol in ["AAPL", "MSFT", "TSLA"]]
+
+    assert results == [{"price": str(get_stub_quote(symbol))} for symbol in ["AAPL", "MSFT", "TSLA"]]
+    assert quote_stub.connections == 1
+
+
+def test_http_client_retries(client: HttpClient) -> None:
+    responses = [Mock(status_code=503, raise_for_status=Mock(side_effect=requests.exceptions.HTTPError("503"))),
+                 requests.exceptions.ConnectionError("Ошибка сети"),
+                 Mock(status_code=200, json=Mock(return_value={"price": "1.0"}))]
+    with patch("src.http_client.requests.Session.get", side_effect=responses) as mock_get:
+        result = client.get_json("http://quotes/price?symbol=AAPL")
+
+    assert result == {"price": "1.0"}
+    assert mock_get.call_count == 3
+    assert client.get_breaker("http://quotes/price").state == "closed"
+
+
+def test_http_client_timeouts(client: HttpClient) -> None:
+    with patch("src.http_client.requests.Session.get",
+               return_value=Mock(status_code=200, json=Mock(return_value={}))) as mock_get:
+        client.get_json("http://quotes/price")
+        client.get_json("http://quotes/price", timeout=0.5)
+
+    assert mock_get.call_args_list[0].kwargs["timeout"] == (client.connect_timeout, client.read_timeout)
+    assert mock_get.call_args_list[1].kwargs["timeout"] == 0.5
+
+
+def test_http_client_backoff() -> None:
+    http_client = HttpClient(backoff_factor=0.1, backoff_max=0.3)
+
+    delays = [http_client.get_backoff(attempt) for attempt in range(5) for _ in range(100)]
+
+    assert all(0 <= delay <= 0.3 for delay in delays)
+    assert max(delays[:100]) <= 0.1
+    assert len(set(delays)) > 1
+
+
+def test_http_client_circuit_open(client: HttpClient, failing_stub: QuoteStubServer) -> None:
+    url = f"{failing_stub.url}/price?symbol=AAPL"
+    for _ in range(2):
+        with pytest.raises(requests.exceptions.HTTPError):
+            client.get_json(url)
+
+    with pytest.raises(CircuitOpenError):
+        client.get_json(url)
+
+    assert len(failing_stub.symbols) == 6
+
+
+def test_get_stock_prices_circuit_open(client: HttpClient, failing_stub: QuoteStubServer) -> None:
+    clock = FakeClock()
+    cache = QuoteCache(None, ttl=60, clock=clock)
+    stocks = ["AAPL", "MSFT"]
+    cached = cache.get_many([f"price:{stock}" for stock in stocks],
+                            lambda keys: [{"price": "100.0"} for _ in keys])
+    breaker = client.get_breaker(failing_stub.url)
+    breaker.record_failure()
+    breaker.record_failure()
+    clock.now = 120
+
+    with patch("src.external_api.json.load", return_value={"user_stocks": stocks}):
+        result = get_stock_prices(api_url=failing_stub.url, cache=cache, client=client)
+    cache.wait()
+
+    assert [{"price": "100.0"}] * 2 == cached
+    assert result == [{"stock": "AAPL", "price": 100.0}, {"stock": "MSFT", "price": 100.0}]
+    assert failing_stub.symbols == []
+    assert cache.stats()["refresh_errors"] == 1
@@ -0,0 +1,31 @@
+import subprocess
+import sys
+
+import pytest
+
+from config import ROOT_DIR
+from src.lazy_import import LazyModule, lazy_import
+
+
+def test_lazy_import() -> None:
+    module = lazy_import("json")
+
+    assert isinstance(module, LazyModule)
+    assert "dumps" not in vars(module)
+    assert module.dumps([1]) == "[1]"
+    assert "dumps" in vars(module)
+
+
+def test_lazy_import_missing_attribute() -> None:
+    with pytest.raises(AttributeError):
+        lazy_import("json").missing_attribute
+
+
+@pytest.mark.parametrize("module", ["src.utils", "src.services", "src.reports", "src.external_api", "src.views"])
+def test_import_without_heavy_dependencies(module: str) -> None:
+    code = (f"import sys, {module}; "
+            "print(','.join(name for name in ('pandas', 'numpy', 'requests', 'dotenv', 'dateutil', 'openpyxl') "
+            "if name in sys.modules))")
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT_DIR, capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == ""
@@ -0,0 +1,68 @@
+import json
+import logging
+import os
+from typing import Any
+
+from src.logging_config import LazyQueueHandler, LogFileRouter, read_log_levels, setup_logger
+
+
+def test_read_log_levels(tmp_path: Any) -> None:
+    path = tmp_path / "settings.json"
+    path.write_text(json.dumps({"log_levels": {"services_logger": "WARNING"}}), encoding="utf-8")
+
+    assert read_log_levels(str(path)) == {"services_logger": "WARNING"}
+    assert read_log_levels(str(tmp_path / "missing.json")) == {}
+
+
+def test_lazy_queue_handler(tmp_path: Any) -> None:
+    logs_dir = str(tmp_path / "logs")
+    handler = LazyQueueHandler({"test_lazy_logger": "test.log"}, logs_dir)
+    logger = setup_logger("test_lazy_logger", handler, {"test_lazy_logger": "warning"})
+    try:
+        assert not os.path.exists(logs_dir)
+
+        logger.info("Не записывается %s", "info")
+        assert not os.path.exists(logs_dir)
+
+        logger.warning("Записано %s строк", 10)
+        handler.stop()
+
+        with open(os.path.join(logs_dir, "test.log"), encoding="utf-8") as f:
+            lines = f.readlines()
+        assert len(lines) == 1
+        assert lines[0].endswith("WARNING - Записано 10 строк\n")
+
+    finally:
+        handler.stop()
+        logger.removeHandler(handler)
+
+
+def test_lazy_queue_handler_restarts(tmp_path: Any) -> None:
+    handler = LazyQueueHandler({"test_restart_logger": "test.log"}, str(tmp_path))
+    logger = setup_logger("test_restart_logger", handler, {})
+    try:
+        logger.info("Первая запись")
+        handler.stop()
+        logger.info("Вторая запись")
+        handler.stop()
+
+        with open(tmp_path / "test.log", encoding="utf-8") as f:
+            assert len(f.readlines()) == 2
+        assert logger.level == logging.DEBUG
+
+    finally:
+        logger.removeHandler(handler)
+
+
+def test_log_file_router_rotation(tmp_path: Any) -> None:
+    router = LogFileRouter({"test_rotation_logger": "test.log"}, str(tmp_path), max_bytes=200, backup_count=2)
+    try:
+        for i in range(30):
+            router.handle(logging.makeLogRecord({"name": "test_rotation_logger", "msg": f"Запись {i:02d}"}))
+    finally:
+        router.close()
+
+    assert sorted(os.listdir(tmp_path)) == ["test.log", "test.log.1", "test.log.2"]
+    assert all(os.path.getsize(tmp_path / name) <= 200 for name in os.listdir(tmp_path))
+    with open(tmp_path / "test.log", encoding="utf-8") as f:
+        assert f.readlines()[-1].endswith("Запись 29\n")
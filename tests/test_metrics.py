@@ -0,0 +1,114 @@
+import json
+import sys
+import types
+from typing import Any
+
+import pandas as pd
+import pytest
+
+from src.metrics import MetricsRegistry, get_input_rows, get_metrics_registry, instrument
+from src.utils import get_events_information
+
+
+def test_get_input_rows(filtered_transactions: pd.DataFrame) -> None:
+    assert get_input_rows((filtered_transactions, 1), {}) == 9
+    assert get_input_rows(("Связь",), {"data": [{}, {}]}) == 2
+    assert get_input_rows(("Связь",), {}) is None
+
+
+def test_get_input_rows_pandas_importing(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setitem(sys.modules, "pandas", types.ModuleType("pandas"))
+
+    assert get_input_rows(([1, 2, 3],), {}) == 3
+
+
+def test_instrument() -> None:
+    registry = MetricsRegistry()
+
+    @instrument(name="sum", registry=registry)
+    def sum_values(values: list) -> int:
+        return sum(values)
+
+    for n in range(1, 101):
+        sum_values(list(range(n)))
+
+    summary = registry.summary()["sum"]
+    assert summary["calls"] == 100
+    assert summary["errors"] == 0
+    assert summary["input_rows"]["p50"] == pytest.approx(50.5)
+    assert summary["input_rows"]["p99"] == pytest.approx(99.01)
+    assert summary["input_rows"]["sum"] == 5050
+    assert summary["wall_seconds"]["count"] == 100
+    assert "memory_peak_bytes" not in summary
+
+
+def test_instrument_error() -> None:
+    registry = MetricsRegistry()
+
+    @instrument(registry=registry)
+    def fail() -> None:
+        raise ValueError("Ошибка")
+
+    with pytest.raises(ValueError):
+        fail()
+
+    summary = registry.summary()
+    name = next(iter(summary))
+    assert name.endswith("fail")
+    assert summary[name]["calls"] == 1
+    assert summary[name]["errors"] == 1
+
+
+def test_instrument_trace_memory() -> None:
+    registry = MetricsRegistry(trace_memory=True)
+
+    @instrument(name="inner", registry=registry)
+    def inner() -> list:
+        return [0] * 100_000
+
+    @instrument(name="outer", registry=registry)
+    def outer() -> int:
+        return len(inner())
+
+    outer()
+
+    summary = registry.summary()
+    assert summary["outer"]["memory_peak_bytes"]["p50"] >= 800_000
+    assert "memory_peak_bytes" not in summary["inner"]
+
+
+def test_public_functions_are_instrumented(filtered_transactions: pd.DataFrame) -> None:
+    registry = get_metrics_registry()
+    registry.clear()
+
+    get_events_information("2023-02-05 12:00:00", filtered_transactions, [], [])
+
+    summary = registry.summary()
+    assert list(summary) == ["src.utils.get_events_information"]
+    assert summary["src.utils.get_events_information"]["input_rows"]["p50"] == 9
+
+
+def test_dump(tmp_path: Any) -> None:
+    registry = MetricsRegistry()
+    registry.record("f", 0.5, 0.25, input_rows=10)
+    registry.record("f", 1.5, 0.75, error=True)
+
+    registry.dump(str(tmp_path / "metrics.json"))
+    registry.dump(str(tmp_path / "metrics.prom"), fmt="prometheus")
+
+    with open(tmp_path / "metrics.json", encoding="utf-8") as f:
+        summary = json.load(f)
+    assert summary["f"]["calls"] == 2
+    assert summary["f"]["wall_seconds"]["p50"] == 1.0
+    assert summary["f"]["input_rows"]["count"] == 1
+
+    with open(tmp_path / "metrics.prom", encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert 'function_calls_total{function="f"} 2' in lines
+    assert 'function_errors_total{function="f"} 1' in lines
+    assert 'function_wall_seconds{function="f",quantile="0.5"} 1.0' in lines
+    assert 'function_wall_seconds_sum{function="f"} 2.0' in lines
+    assert 'function_input_rows_count{function="f"} 1' in lines
+
+    with pytest.raises(ValueError):
+        registry.dump(str(tmp_path / "metrics.txt"), fmt="xml")
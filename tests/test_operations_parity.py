@@ -0,0 +1,109 @@
+import json
+
+import pandas as pd
+import pytest
+
+from src.cube import build_daily_cube, get_events_information_batch, get_information_home_page_batch
+from src.date_index import sort_transactions_by_date
+from src.utils import (
+    filter_transactions,
+    get_date_obj_information,
+    get_events_information,
+    get_top_categories_expenses,
+    get_top_categories_income,
+    get_total_expenses,
+    get_total_income,
+    get_transfers_and_cash_expenses,
+    round_rubles
+)
+
+DATA_RANGES = ["W", "M", "Y", "ALL"]
+
+
+def get_events_per_call(date_str: str, transactions: pd.DataFrame, data_range: str) -> dict:
+    """Собирает страницу 'События' отдельными функциями, как до объединения агрегаций в одну свертку."""
+    date_obj, start_date, end_date = get_date_obj_information(date_str, data_range)
+    transactions_df = filter_transactions(transactions, start_date, end_date, date_obj)
+    return {
+        "expenses": {
+            "total_amount": get_total_expenses(transactions_df)["total_amount"],
+            "main": get_top_categories_expenses(transactions_df),
+            "transfers_and_cash": get_transfers_and_cash_expenses(transactions_df)
+        },
+        "income": {
+            "total_amount": get_total_income(transactions_df)["total_amount"],
+            "main": get_top_categories_income(transactions_df)
+        },
+        "currency_rates": [],
+        "stock_prices": []
+    }
+
+
+def get_sample_dates(transactions: pd.DataFrame, step: int = 40) -> list[str]:
+    dates = transactions["Дата операции"].drop_duplicates().sort_values()
+    return list(dates.dt.strftime("%Y-%m-%d %H:%M:%S").iloc[::step])
+
+
+@pytest.mark.parametrize("amount, expected", [
+    (2596.5, 2597),
+    (-2596.5, -2597),
+    (-2596.5000000000005, -2597),
+    (2023.4999999999998, 2024),
+    (800.49, 800),
+    (0.5, 1),
+    (0, 0),
+])
+def test_round_rubles(amount: float, expected: int) -> None:
+    assert round_rubles(amount) == expected
+
+
+@pytest.mark.parametrize("date_str, data_range, expected", [
+    ("2019-10-01 06:00:00", "W", 2597),
+    ("2018-02-14 17:00:00", "M", 197103),
+])
+def test_get_events_information_half_ruble(operations_transactions: pd.DataFrame,
+                                           date_str: str,
+                                           data_range: str,
+                                           expected: int) -> None:
+    result = json.loads(get_events_information(date_str, operations_transactions, [], [], data_range))
+
+    assert result["expenses"]["total_amount"] == expected
+
+
+@pytest.mark.parametrize("data_range", DATA_RANGES)
+def test_get_events_information_matches_per_call(operations_transactions: pd.DataFrame, data_range: str) -> None:
+    for date_str in get_sample_dates(operations_transactions):
+        result = json.loads(get_events_information(date_str, operations_transactions, [], [], data_range))
+
+        assert result == get_events_per_call(date_str, operations_transactions, data_range), date_str
+
+
+@pytest.mark.parametrize("data_range", DATA_RANGES)
+def test_get_events_information_batch_matches_per_call(operations_transactions: pd.DataFrame,
+                                                       data_range: str) -> None:
+    transactions = sort_transactions_by_date(operations_transactions)
+    date_strs = get_sample_dates(transactions)
+
+    result = get_events_information_batch(date_strs, transactions, build_daily_cube(transactions), [], [],
+                                          data_range)
+
+    for date_str, page in zip(date_strs, result):
+        assert json.loads(page) == get_events_per_call(date_str, operations_transactions, data_range), date_str
+
+
+def test_get_information_home_page_batch_matches_groupby(operations_transactions: pd.DataFrame) -> None:
+    transactions = sort_transactions_by_date(operations_transactions)
+    date_strs = get_sample_dates(transactions)
+
+    result = get_information_home_page_batch(date_strs, transactions, build_daily_cube(transactions), [], [])
+
+    for date_str, page in zip(date_strs, result):
+        date_obj, start_date, end_date = get_date_obj_information(date_str)
+        window = filter_transactions(operations_transactions, start_date, end_date, date_obj)
+        cards = window.groupby("Номер карты")[["Сумма операции", "Кэшбэк"]].sum()
+        expected = [{"last_digits": str(card)[-4:],
+                     "total_spent": abs(round(amount, 2)),
+                     "cashback": pytest.approx(cashback)}
+                    for card, amount, cashback in cards.itertuples()]
+
+        assert json.loads(page)["cards"] == expected, date_str
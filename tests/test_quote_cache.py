@@ -0,0 +1,131 @@
+import json
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+from src.quote_cache import QuoteCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+def make_fetch_many(calls: list[list[str]], version: int = 1) -> Callable[[list[str]], list[dict]]:
+    def fetch_many(keys: list[str]) -> list[dict]:
+        calls.append(keys)
+        return [{"symbol": key, "price": f"{version}.0"} for key in keys]
+    return fetch_many
+
+
+def test_quote_cache_miss_and_hit(tmp_path: Path, clock: FakeClock) -> None:
+    cache = QuoteCache(str(tmp_path / "quotes.json"), ttl=60, clock=clock)
+    calls: list[list[str]] = []
+
+    first = cache.get_many(["AAPL", "MSFT"], make_fetch_many(calls))
+    second = cache.get_many(["MSFT", "AAPL"], make_fetch_many(calls))
+
+    assert first == [{"symbol": "AAPL", "price": "1.0"}, {"symbol": "MSFT", "price": "1.0"}]
+    assert second == first[::-1]
+    assert calls == [["AAPL", "MSFT"]]
+    assert cache.stats() == {"hits": 2, "stale_hits": 0, "misses": 2, "refreshes": 0, "refresh_errors": 0, "size": 2}
+
+
+def test_quote_cache_stale_while_revalidate(tmp_path: Path, clock: FakeClock) -> None:
+    cache = QuoteCache(str(tmp_path / "quotes.json"), ttl=60, ttls={"TSLA": 10}, clock=clock)
+    calls: list[list[str]] = []
+    cache.get_many(["AAPL", "TSLA"], make_fetch_many(calls))
+
+    clock.now += 30
+    stale = cache.get_many(["AAPL", "TSLA"], make_fetch_many(calls, version=2))
+    cache.wait()
+    fresh = cache.get_many(["AAPL", "TSLA"], make_fetch_many(calls, version=3))
+
+    assert stale == [{"symbol": "AAPL", "price": "1.0"}, {"symbol": "TSLA", "price": "1.0"}]
+    assert fresh == [{"symbol": "AAPL", "price": "1.0"}, {"symbol": "TSLA", "price": "2.0"}]
+    assert calls == [["AAPL", "TSLA"], ["TSLA"]]
+    assert cache.stats()["stale_hits"] == 1
+    assert cache.stats()["refreshes"] == 1
+
+
+def test_quote_cache_refresh_error_keeps_stale_value(tmp_path: Path, clock: FakeClock) -> None:
+    cache = QuoteCache(str(tmp_path / "quotes.json"), ttl=60, clock=clock)
+    cache.get_many(["AAPL"], make_fetch_many([]))
+
+    def fail(keys: list[str]) -> list[dict]:
+        raise ConnectionError("нет сети")
+
+    clock.now += 120
+    result = cache.get_many(["AAPL"], fail)
+    cache.wait()
+
+    assert result == [{"symbol": "AAPL", "price": "1.0"}]
+    assert cache.get_many(["AAPL"], make_fetch_many([], version=2)) == result
+    assert cache.stats()["refresh_errors"] == 1
+
+
+def test_quote_cache_missing_error_keeps_cached_values(tmp_path: Path, clock: FakeClock) -> None:
+    cache = QuoteCache(str(tmp_path / "quotes.json"), ttl=60, clock=clock)
+    cache.get_many(["AAPL"], make_fetch_many([]))
+
+    def fail(keys: list[str]) -> list[dict]:
+        raise ConnectionError("нет сети")
+
+    assert cache.get_many(["AAPL", "MSFT"], fail) == [{"symbol": "AAPL", "price": "1.0"}, None]
+    with pytest.raises(ConnectionError):
+        cache.get_many(["MSFT"], fail)
+
+
+def test_quote_cache_persistence(tmp_path: Path, clock: FakeClock) -> None:
+    path = str(tmp_path / "quotes.json")
+    QuoteCache(path, ttl=60, clock=clock).get_many(["AAPL"], make_fetch_many([]))
+    calls: list[list[str]] = []
+
+    restarted = QuoteCache(path, ttl=60, clock=clock)
+
+    assert restarted.get_many(["AAPL"], make_fetch_many(calls)) == [{"symbol": "AAPL", "price": "1.0"}]
+    assert calls == []
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f)["entries"]["AAPL"]["fetched_at"] == 1000.0
+
+
+def test_quote_cache_corrupted_file(tmp_path: Path, clock: FakeClock) -> None:
+    path = tmp_path / "quotes.json"
+    path.write_text("{", encoding="utf-8")
+
+    cache = QuoteCache(str(path), clock=clock)
+
+    assert cache.stats()["size"] == 0
+
+
+def test_quote_cache_invalid_value_not_stored(clock: FakeClock) -> None:
+    cache = QuoteCache(None, clock=clock)
+    calls: list[list[str]] = []
+
+    def fetch_many(keys: list[str]) -> list[dict]:
+        calls.append(keys)
+        return [{"code": 429}]
+
+    assert cache.get_many(["AAPL"], fetch_many, lambda value: "price" in value) == [{"code": 429}]
+    assert cache.get_many(["AAPL"], fetch_many, lambda value: "price" in value) == [{"code": 429}]
+    assert calls == [["AAPL"], ["AAPL"]]
+
+
+def test_quote_cache_clear(tmp_path: Path, clock: FakeClock) -> None:
+    path = tmp_path / "quotes.json"
+    cache = QuoteCache(str(path), clock=clock)
+    cache.get_many(["AAPL"], make_fetch_many([]))
+
+    cache.clear()
+
+    assert not path.exists()
+    assert cache.stats()["size"] == 0
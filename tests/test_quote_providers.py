@@ -0,0 +1,88 @@
+import json
+import os
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from config import ROOT_DIR
+from src.external_api import (
+    RecordingQuoteProvider,
+    ReplayQuoteProvider,
+    TwelvedataProvider,
+    get_currency_rates,
+    get_stock_prices
+)
+from src.http_client import HttpClient
+from tests.quote_stub import QuoteStubServer, get_stub_quote, run_quote_stub
+
+RECORDED_PATH = os.path.join(ROOT_DIR, "data", "quotes_recorded.json")
+
+
+@pytest.fixture
+def quote_stub() -> Iterator[QuoteStubServer]:
+    with run_quote_stub() as server:
+        yield server
+
+
+@pytest.fixture
+def client() -> Iterator[HttpClient]:
+    http_client = HttpClient()
+    yield http_client
+    http_client.close()
+
+
+def test_twelvedata_provider_url() -> None:
+    provider = TwelvedataProvider("https://quotes", api_key="key")
+
+    assert provider.make_url("price", "AAPL,MSFT") == "https://quotes/price?symbol=AAPL,MSFT&apikey=key&source=docs"
+
+
+def test_twelvedata_provider_batches(quote_stub: QuoteStubServer, client: HttpClient) -> None:
+    provider = TwelvedataProvider(quote_stub.url, api_key="key", client=client, batch_size=2)
+
+    result = provider.fetch("price", ["AAPL", "MSFT", "TSLA"])
+
+    assert result == [{"price": str(get_stub_quote(symbol))} for symbol in ["AAPL", "MSFT", "TSLA"]]
+    assert quote_stub.symbols == ["AAPL,MSFT", "TSLA"]
+
+
+def test_replay_provider() -> None:
+    provider = ReplayQuoteProvider(RECORDED_PATH)
+
+    assert get_currency_rates(provider=provider) == [{"currency": "USD", "rate": 74.29},
+                                                     {"currency": "EUR", "rate": 84.07}]
+    assert get_stock_prices(provider=provider) == [{"stock": "AAPL", "price": 177.57},
+                                                   {"stock": "AMZN", "price": 3334.34},
+                                                   {"stock": "GOOGL", "price": 2893.59},
+                                                   {"stock": "MSFT", "price": 336.32},
+                                                   {"stock": "TSLA", "price": 1056.78}]
+
+
+def test_replay_provider_latency(monkeypatch: pytest.MonkeyPatch) -> None:
+    provider = ReplayQuoteProvider(RECORDED_PATH, latency=0.05)
+    sleeps: list[float] = []
+    monkeypatch.setattr("src.external_api.time.sleep", sleeps.append)
+
+    provider.fetch("price", ["AAPL", "MSFT"])
+
+    assert sleeps == [0.05]
+
+
+def test_replay_provider_missing_symbol() -> None:
+    provider = ReplayQuoteProvider(RECORDED_PATH)
+
+    with pytest.raises(KeyError):
+        provider.fetch("price", ["NVDA"])
+
+
+def test_recording_provider(tmp_path: Path, quote_stub: QuoteStubServer, client: HttpClient) -> None:
+    path = str(tmp_path / "quotes.json")
+    live = TwelvedataProvider(quote_stub.url, api_key="key", client=client)
+
+    recorded = get_stock_prices(provider=RecordingQuoteProvider(live, path))
+    replayed = get_stock_prices(provider=ReplayQuoteProvider(path))
+
+    assert replayed == recorded
+    with open(path, encoding="utf-8") as f:
+        assert list(json.load(f)) == ["price"]
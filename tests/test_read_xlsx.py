@@ -1,3 +1,6 @@
+import os
+from datetime import datetime
+from pathlib import Path
 from typing import Any
 from unittest.mock import patch
 
@@ -5,7 +8,15 @@ import pandas as pd
 import pytest
 from pandas._testing import assert_frame_equal
 
-from src.read_xlsx import read_transactions_excel
+from src.read_xlsx import (
+    find_statement_files,
+    get_partition_month,
+    iter_transactions_excel,
+    read_transactions_excel,
+    read_transactions_partitions,
+    read_transactions_range,
+    select_statement_files
+)
 
 
 @patch("src.read_xlsx.pd.read_excel")
@@ -44,3 +55,89 @@ def test_read_transactions_excel_empty(mock_read_excel: Any) -> None:
         read_transactions_excel("empty_file.xlsx")
 
     mock_read_excel.assert_called_once_with("empty_file.xlsx")
+
+
+def test_iter_transactions_excel(tmp_path: Path) -> None:
+    filepath = os.path.join(tmp_path, "operations.xlsx")
+    pd.DataFrame({
+        "Дата операции": ["01.01.2021 12:00:00", "02.01.2021 14:30:00", "03.01.2021 09:00:00"],
+        "Сумма операции": [-100.5, 200.0, -300.0],
+        "Кэшбэк": [None, None, 3.0],
+        "Категория": ["Супермаркеты", None, "Фастфуд"],
+        "Бонусы (включая кэшбэк)": [1, 0, 3]
+    }).to_excel(filepath, index=False)
+
+    chunks = list(iter_transactions_excel(filepath, chunk_size=2))
+
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    assert_frame_equal(pd.concat(chunks, ignore_index=True), read_transactions_excel(filepath, use_cache=False))
+    assert chunks[1]["Кэшбэк"].dtype == "float64"
+    assert chunks[0]["Кэшбэк"].dtype == "float64"
+
+
+def test_iter_transactions_excel_file_not_found() -> None:
+    with pytest.raises(FileNotFoundError):
+        next(iter_transactions_excel("nonexistent_file.xlsx"))
+
+
+def test_iter_transactions_excel_invalid_chunk_size() -> None:
+    with pytest.raises(ValueError):
+        next(iter_transactions_excel("fake/path.xlsx", chunk_size=0))
+
+
+@pytest.mark.parametrize("filepath, expected", [
+    ("data/statement_2021-12.xlsx", "2021-12"),
+    ("data/card_7197_202111.xlsx", "2021-11"),
+    ("data/2020_01_account.xlsx", "2020-01"),
+    ("data/operations.xlsx", None),
+    ("data/statement_2021-13.xlsx", None),
+])
+def test_get_partition_month(filepath: str, expected: str) -> None:
+    assert get_partition_month(filepath) == expected
+
+
+def test_select_statement_files() -> None:
+    filepaths = ["a_2021-10.xlsx", "a_2021-11.xlsx", "a_2021-12.xlsx", "operations.xlsx"]
+
+    result = select_statement_files(filepaths, datetime(2021, 11, 5), datetime(2021, 11, 30))
+
+    assert result == ["a_2021-11.xlsx", "operations.xlsx"]
+
+
+def test_read_transactions_partitions(statements_dir: str) -> None:
+    result = read_transactions_partitions(statements_dir, max_workers=2)
+
+    assert len(result) == 6
+    assert result["Дата операции"].is_monotonic_decreasing
+    assert result["Месяц выписки"].tolist() == ["2021-12", "2021-12", "2021-11", "2021-11", "2021-10", "2021-10"]
+    assert result["Файл выписки"].iloc[0] == "statement_2021-12.xlsx"
+    assert result["Сумма операции"].dtype == "float64"
+
+
+@patch("src.read_xlsx.read_transactions_excel", wraps=read_transactions_excel)
+def test_read_transactions_partitions_skips_files(mock_read: Any, statements_dir: str) -> None:
+    result = read_transactions_partitions(os.path.join(statements_dir, "statement_*.xlsx"),
+                                          start_date=datetime(2021, 11, 10), end_date=datetime(2021, 12, 1),
+                                          max_workers=1)
+
+    opened = sorted(os.path.basename(call.args[0]) for call in mock_read.call_args_list)
+    assert opened == ["statement_2021-11.xlsx", "statement_2021-12.xlsx"]
+    assert set(result["Месяц выписки"]) == {"2021-11", "2021-12"}
+
+
+def test_read_transactions_partitions_not_found(tmp_path: Path) -> None:
+    assert find_statement_files(str(tmp_path)) == []
+    with pytest.raises(FileNotFoundError):
+        read_transactions_partitions(str(tmp_path))
+
+
+def test_read_transactions_range_frame(filtered_transactions: pd.DataFrame) -> None:
+    assert read_transactions_range(filtered_transactions, datetime(2023, 2, 3)) is filtered_transactions
+
+
+@patch("src.read_xlsx.read_transactions_excel", wraps=read_transactions_excel)
+def test_read_transactions_range_path(mock_read: Any, statements_dir: str) -> None:
+    result = read_transactions_range(statements_dir, datetime(2021, 12, 1), datetime(2021, 12, 31))
+
+    assert [os.path.basename(call.args[0]) for call in mock_read.call_args_list] == ["statement_2021-12.xlsx"]
+    assert len(result) == 2
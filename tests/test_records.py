@@ -0,0 +1,96 @@
+import io
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.records import (
+    TRANSACTION_FILL_VALUES,
+    iter_records_json,
+    make_column_values,
+    make_records,
+    to_native,
+    write_records_json
+)
+from src.schema import apply_compact_schema, restore_default_schema
+from src.services import make_transactions_json
+
+
+@pytest.fixture
+def transactions_with_nulls() -> pd.DataFrame:
+    return pd.DataFrame({
+        "Дата операции": pd.Series(["2023-02-02 10:15:00", None, "2023-02-05 00:00:00"], dtype="datetime64[ns]"),
+        "Номер карты": ["*4556", np.nan, "*7197"],
+        "Сумма операции": [-160.89, 1000.0, -5.5],
+        "Кэшбэк": [np.nan, 20.0, 1.0],
+        "Категория": ["Супермаркеты", np.nan, "Связь"],
+        "MCC": [5411.0, np.nan, 4814.0]
+    })
+
+
+def test_to_native() -> None:
+    assert type(to_native(np.int64(5))) is int
+    assert type(to_native(np.float32(0.5))) is float
+    assert to_native("Связь") == "Связь"
+
+
+def test_make_column_values(transactions_with_nulls: pd.DataFrame) -> None:
+    dates = transactions_with_nulls["Дата операции"]
+    categories = transactions_with_nulls["Категория"].astype("category")
+
+    assert make_column_values(dates) == ["2023-02-02 10:15:00", None, "2023-02-05 00:00:00"]
+    assert make_column_values(dates, "%d.%m.%Y") == ["02.02.2023", None, "05.02.2023"]
+    assert make_column_values(transactions_with_nulls["Кэшбэк"], fill_value=0) == [0, 20.0, 1.0]
+    assert make_column_values(categories) == ["Супермаркеты", None, "Связь"]
+
+
+def test_make_records(transactions_with_nulls: pd.DataFrame) -> None:
+    result = make_records(transactions_with_nulls.iloc[:2], fill_values=TRANSACTION_FILL_VALUES)
+
+    assert result == [
+        {"Дата операции": "2023-02-02 10:15:00", "Номер карты": "*4556", "Сумма операции": -160.89,
+         "Кэшбэк": 0, "Категория": "Супермаркеты", "MCC": 5411.0},
+        {"Дата операции": None, "Номер карты": None, "Сумма операции": 1000.0,
+         "Кэшбэк": 20.0, "Категория": None, "MCC": None}
+    ]
+    assert all(type(value) is not np.float64 for record in result for value in record.values())
+
+
+def test_make_records_adds_fill_columns(filtered_transactions: pd.DataFrame) -> None:
+    result = make_records(filtered_transactions[["Описание"]].iloc[:1], fill_values=TRANSACTION_FILL_VALUES)
+
+    assert result == [{"Описание": "Дмитрий Р.", "Номер карты": None, "Кэшбэк": 0, "MCC": None}]
+
+
+def test_make_records_empty(filtered_transactions: pd.DataFrame) -> None:
+    assert make_records(filtered_transactions.iloc[0:0], fill_values=TRANSACTION_FILL_VALUES) == []
+
+
+def test_make_records_compact(transactions_with_nulls: pd.DataFrame) -> None:
+    compact_df = apply_compact_schema(transactions_with_nulls)
+
+    assert make_records(compact_df) == make_records(restore_default_schema(compact_df))
+
+
+def test_make_transactions_json_is_valid_json(transactions_with_nulls: pd.DataFrame) -> None:
+    result = make_transactions_json(transactions_with_nulls)
+
+    assert "NaN" not in result
+    assert json.loads(result)[1]["Категория"] is None
+
+
+@pytest.mark.parametrize("n_rows", [0, 1, 2, 3])
+def test_iter_records_json(transactions_with_nulls: pd.DataFrame, n_rows: int) -> None:
+    transactions_df = transactions_with_nulls.iloc[:n_rows]
+    expected = json.dumps(make_records(transactions_df, fill_values=TRANSACTION_FILL_VALUES), ensure_ascii=False,
+                          indent=4)
+
+    assert "".join(iter_records_json(transactions_df, TRANSACTION_FILL_VALUES, chunk_size=2)) == expected
+
+
+def test_write_records_json(transactions_with_nulls: pd.DataFrame) -> None:
+    file = io.StringIO()
+
+    assert write_records_json(file, transactions_with_nulls, chunk_size=1) == 3
+    assert json.loads(file.getvalue()) == make_records(transactions_with_nulls)
@@ -0,0 +1,97 @@
+import json
+import os
+from typing import Any
+
+import pandas as pd
+
+from src.report_sink import ReportSink, snapshot_value, summarize_value
+
+
+def read_records(path: Any) -> list[dict]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_snapshot_value_short() -> None:
+    assert snapshot_value(None) is None
+    assert snapshot_value(1.5) == 1.5
+    assert snapshot_value("Связь") == "Связь"
+    assert snapshot_value([1, 2]) == "[1, 2]"
+    assert summarize_value("Связь") == "Связь"
+
+
+def test_snapshot_value_long() -> None:
+    result = snapshot_value(list(range(1000)), max_length=20)
+
+    assert result == {"type": "list", "head": "[0, 1, 2, 3, 4, 5, 6", "length": 1000}
+    assert snapshot_value("а" * 1000, max_length=10) == "а" * 1000
+
+
+def test_summarize_value_long_string() -> None:
+    result = summarize_value("а" * 1000, max_length=10)
+
+    assert result["type"] == "str"
+    assert result["length"] == 1000
+    assert result["head"] == "а" * 10
+    assert result["fingerprint"] == summarize_value("а" * 1000, max_length=10)["fingerprint"]
+    assert result["fingerprint"] != summarize_value("б" * 1000, max_length=10)["fingerprint"]
+
+
+def test_snapshot_value_dataframe(filtered_transactions: pd.DataFrame) -> None:
+    result = snapshot_value(filtered_transactions)
+
+    assert result["type"] == "DataFrame"
+    assert result["shape"] == [9, 7]
+    assert result["columns"][0] == "Дата операции"
+    assert result["head"] == repr(filtered_transactions.head())[:200]
+    assert snapshot_value(filtered_transactions["Категория"])["shape"] == [9]
+
+
+def test_report_sink_write(tmp_path: Any, filtered_transactions: pd.DataFrame) -> None:
+    path = tmp_path / "report.txt"
+    sink = ReportSink()
+
+    sink.write(str(path), function="f", status="ok", args=(filtered_transactions,), kwargs={"category": "Связь"},
+               result="[]", duration=0.5)
+    sink.write(str(path), function="f", status="error", args=(), kwargs={}, error="Ошибка", duration=0.1)
+    sink.close()
+
+    records = read_records(path)
+    assert [record["status"] for record in records] == ["ok", "error"]
+    assert records[0]["args"][0]["shape"] == [9, 7]
+    assert records[0]["kwargs"] == {"category": "Связь"}
+    assert records[0]["result"] == "[]"
+    assert records[0]["duration_ms"] == 500.0
+    assert records[1]["error"] == "Ошибка"
+
+
+def test_report_sink_write_ignores_later_mutation(tmp_path: Any, filtered_transactions: pd.DataFrame) -> None:
+    path = tmp_path / "report.txt"
+    sink = ReportSink()
+    result = [1, 2, 3]
+    transactions = filtered_transactions.copy()
+
+    sink.write(str(path), function="f", status="ok", args=(transactions,), kwargs={}, result=result, duration=0)
+    result.append(999)
+    transactions.drop(index=[0, 1], inplace=True)
+    sink.close()
+
+    record = read_records(path)[0]
+    assert record["result"] == "[1, 2, 3]"
+    assert record["args"][0]["shape"] == [9, 7]
+
+
+def test_report_sink_rotation(tmp_path: Any) -> None:
+    path = tmp_path / "report.txt"
+    sink = ReportSink(max_bytes=300, backup_count=2)
+
+    for i in range(20):
+        sink.write(str(path), function="f", status="ok", args=(i,), kwargs={}, result=i, duration=0)
+        sink.flush()
+    sink.close()
+
+    assert sorted(os.listdir(tmp_path)) == ["report.txt", "report.txt.1", "report.txt.2"]
+    assert all(os.path.getsize(tmp_path / name) <= 300 for name in os.listdir(tmp_path))
+    results = [record["result"] for name in ["report.txt.2", "report.txt.1", "report.txt"]
+               for record in read_records(tmp_path / name)]
+    assert results == list(range(20 - len(results), 20))
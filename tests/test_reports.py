@@ -1,13 +1,23 @@
 import json
+import os
 from datetime import datetime, timedelta
 from typing import Any
 from unittest.mock import patch
 
+import numpy as np
 import pandas as pd
 import pytest
 from dateutil.relativedelta import relativedelta
 
-from src.reports import get_date_information, get_spending_by_category, get_spending_by_date_category
+from src.read_xlsx import read_transactions_excel
+from src.reports import (
+    get_date_information,
+    get_spending_by_categories,
+    get_spending_by_category,
+    get_spending_by_date_categories,
+    get_spending_by_date_category
+)
+from src.schema import apply_compact_schema
 
 
 @patch("src.reports.get_spending_by_date_category")
@@ -109,6 +119,15 @@ def test_get_spending_by_date_category(filtered_transactions: pd.DataFrame) -> N
     assert result == expected
 
 
+@patch("src.read_xlsx.read_transactions_excel", wraps=read_transactions_excel)
+def test_get_spending_by_date_category_statements(mock_read: Any, statements_dir: str) -> None:
+    result = get_spending_by_date_category(statements_dir, "Супермаркеты", datetime(2021, 11, 5),
+                                           datetime(2021, 11, 30))
+
+    assert result == {"category": "Супермаркеты", "spending": 200.0}
+    assert [os.path.basename(call.args[0]) for call in mock_read.call_args_list] == ["statement_2021-11.xlsx"]
+
+
 def test_get_filtered_transactions_invalid(filtered_transactions_invalid: pd.DataFrame) -> None:
     start_date = datetime(2023, 1, 1, 22, 39, 4)
     end_date = datetime(2023, 3, 15, 22, 39, 4)
@@ -116,3 +135,69 @@ def test_get_filtered_transactions_invalid(filtered_transactions_invalid: pd.Dat
 
     with pytest.raises(KeyError):
         get_spending_by_date_category(filtered_transactions_invalid, category, start_date, end_date)
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_get_spending_by_date_categories(filtered_transactions: pd.DataFrame, compact: bool) -> None:
+    start_date = datetime(2023, 1, 1, 22, 39, 4)
+    end_date = datetime(2023, 3, 15, 22, 39, 4)
+    transactions_df = apply_compact_schema(filtered_transactions) if compact else filtered_transactions
+    categories = sorted(filtered_transactions["Категория"].unique())
+
+    result = get_spending_by_date_categories(transactions_df, None, start_date, end_date)
+
+    assert result == [get_spending_by_date_category(transactions_df, category, start_date, end_date)
+                      for category in categories]
+
+
+def test_get_spending_by_date_categories_multi_row() -> None:
+    rng = np.random.default_rng(0)
+    n_rows = 2000
+    categories = ["Супермаркеты", "Аптеки", "Связь", "Такси"]
+    transactions_df = pd.DataFrame({
+        "Дата операции": pd.Timestamp("2023-03-01") + pd.to_timedelta(rng.integers(0, 30 * 24, n_rows), unit="h"),
+        "Сумма операции": np.round(rng.uniform(-3000, 500, n_rows), 2),
+        "Категория": rng.choice(categories, n_rows)
+    })
+    start_date, end_date = datetime(2023, 3, 5), datetime(2023, 3, 25)
+
+    result = get_spending_by_date_categories(transactions_df, None, start_date, end_date)
+
+    assert result == [get_spending_by_date_category(transactions_df, category, start_date, end_date)
+                      for category in sorted(categories)]
+    window = transactions_df[(transactions_df["Дата операции"] >= start_date)
+                             & (transactions_df["Дата операции"] < end_date)
+                             & (transactions_df["Сумма операции"] < 0)]
+    kopecks = (window["Сумма операции"] * 100).round().astype("int64").groupby(window["Категория"]).sum()
+    assert result == [{"category": category, "spending": abs(int(total)) / 100} for category, total in kopecks.items()]
+
+
+def test_get_spending_by_date_categories_given(filtered_transactions: pd.DataFrame) -> None:
+    start_date = datetime(2023, 1, 1, 22, 39, 4)
+    end_date = datetime(2023, 3, 15, 22, 39, 4)
+
+    result = get_spending_by_date_categories(filtered_transactions, ["Связь", "Такси", "Пополнения"],
+                                             start_date, end_date)
+
+    assert result == [
+        {"category": "Связь", "spending": 350.0},
+        {"category": "Такси", "spending": 0},
+        {"category": "Пополнения", "spending": 0}
+    ]
+
+
+def test_get_spending_by_date_categories_invalid(filtered_transactions_invalid: pd.DataFrame) -> None:
+    start_date = datetime(2023, 1, 1, 22, 39, 4)
+    end_date = datetime(2023, 3, 15, 22, 39, 4)
+
+    with pytest.raises(KeyError):
+        get_spending_by_date_categories(filtered_transactions_invalid, None, start_date, end_date)
+
+
+def test_get_spending_by_categories(filtered_transactions: pd.DataFrame) -> None:
+    result = get_spending_by_categories(filtered_transactions, ["Детские товары", "Аптеки"], "2023-03-14 22:39:04")
+
+    assert json.loads(result) == [
+        {"category": "Детские товары", "spending": 400.0},
+        {"category": "Аптеки", "spending": 1000.0}
+    ]
@@ -1,8 +1,10 @@
+import json
 import os
 
 import pytest
 
 from config import ROOT_DIR
+from src.report_sink import get_report_sink
 from src.reports_decorator import report
 
 
@@ -18,14 +20,16 @@ def exception_exec_file(error: str) -> str:
 
 def remove_test_file(path: str) -> None:
     """Удаляет тестовый файл для записи логов"""
+    get_report_sink().flush()
     if os.path.exists(path):
         os.remove(path)
 
 
 def read_test_file(path: str) -> list:
-    """Возвращает записаннные в файл строки в виде списка кортежей"""
+    """Возвращает записанные в файл записи репорта в виде списка словарей"""
+    get_report_sink().flush()
     with open(path, "r", encoding="utf-8") as f:
-        return f.readlines()
+        return [json.loads(line) for line in f]
 
 
 def test_report_decorator_filename() -> None:
@@ -38,10 +42,12 @@ def test_report_decorator_filename() -> None:
 
     file_content = read_test_file(filepath)
 
-    assert file_content[0] == "Function normal_exec_file ok\n"
-    assert file_content[1] == "Function normal_exec_file called with args:\n"
-    assert file_content[2] == " ('Alice',) \n"
-    assert file_content[3] == "and kwargs: {}. \n", "Result: Hello Alice"
+    assert len(file_content) == 1
+    assert file_content[0]["function"] == "normal_exec_file"
+    assert file_content[0]["status"] == "ok"
+    assert file_content[0]["args"] == ["Alice"]
+    assert file_content[0]["kwargs"] == {}
+    assert file_content[0]["result"] == "Hello Alice"
 
 
 def test_log_file_decorator_exception() -> None:
@@ -53,5 +59,20 @@ def test_log_file_decorator_exception() -> None:
         exception_exec_file("Неверное значение")
 
     file_content = read_test_file(filepath)
-    assert (file_content[0] == "exception_exec_file error: Ошибка: " +
-                               "Неверное значение. Inputs: ('Неверное значение',), {}\n")
+    assert file_content[0]["function"] == "exception_exec_file"
+    assert file_content[0]["status"] == "error"
+    assert file_content[0]["error"] == "Ошибка: Неверное значение."
+    assert file_content[0]["args"] == ["Неверное значение"]
+
+
+def test_report_decorator_appends() -> None:
+    """Проверка декоратора: записи нескольких вызовов дописываются в файл"""
+    filepath = os.path.join(ROOT_DIR, r"data/test_exec.txt")
+    remove_test_file(filepath)
+
+    normal_exec_file("Alice")
+    normal_exec_file(name="Bob")
+
+    file_content = read_test_file(filepath)
+    assert [record["args"] for record in file_content] == [["Alice"], []]
+    assert file_content[1]["kwargs"] == {"name": "Bob"}
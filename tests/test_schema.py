@@ -0,0 +1,124 @@
+import json
+from datetime import datetime
+from typing import Any
+
+import pandas as pd
+import pytest
+from pandas._testing import assert_frame_equal
+
+from src.reports import get_spending_by_date_category
+from src.schema import apply_compact_schema, is_compact, restore_default_schema, to_rubles
+from src.services import get_profitable_cashback_categories
+from src.utils import (
+    get_card_spent_cashback,
+    get_top_categories_expenses,
+    get_top_categories_income,
+    get_top_five_transactions,
+    get_total_expenses,
+    get_total_income,
+    get_transfers_and_cash_expenses,
+    reduce_transactions
+)
+
+
+def test_apply_compact_schema(filtered_transactions: pd.DataFrame) -> None:
+    result = apply_compact_schema(filtered_transactions)
+
+    assert is_compact(result)
+    assert not is_compact(filtered_transactions)
+    assert result["Категория"].dtype == "category"
+    assert result["Номер карты"].dtype == "category"
+    assert result["Описание"].dtype == object
+    assert result["Сумма операции"].dtype == "int64"
+    assert result["Сумма операции"].tolist()[:3] == [100000, -200000, -80050]
+    assert result["Кэшбэк"].dtype == "float32"
+
+
+def test_apply_compact_schema_keeps_inexact_cashback() -> None:
+    transactions = pd.DataFrame({"Кэшбэк": [12.62, None], "Сумма операции": [-1262.0, None]})
+
+    result = apply_compact_schema(transactions)
+
+    assert result["Кэшбэк"].dtype == "float64"
+    assert result["Сумма операции"].dtype == "float64"
+    assert result["Сумма операции"].tolist()[0] == -1262.0
+
+
+def test_apply_compact_schema_amount_gaps() -> None:
+    transactions = pd.DataFrame({"Сумма операции": [-100.5, None, 200.0],
+                                 "Сумма платежа": [-100.5, -50.0, 200.0],
+                                 "Категория": ["Связь", "Связь", None]})
+
+    result = apply_compact_schema(transactions)
+    expenses = result[result["Сумма операции"] < 0]
+
+    assert not is_compact(result)
+    assert result["Сумма платежа"].dtype == "float64"
+    assert expenses["Сумма операции"].tolist() == [-100.5]
+    assert to_rubles(expenses["Сумма операции"].sum(), result) == -100.5
+    assert get_total_expenses(result.merge(pd.DataFrame({"Категория": ["Связь"]}), how="left", on="Категория")) == {
+        "total_amount": 101}
+
+
+@pytest.mark.parametrize("rebuild", [
+    lambda df: df.merge(pd.DataFrame({"Категория": ["Связь"]}), how="left", on="Категория"),
+    lambda df: pd.DataFrame(df.to_dict(orient="records")),
+])
+def test_compact_schema_without_marker(filtered_transactions: pd.DataFrame, rebuild: Any) -> None:
+    transactions = rebuild(apply_compact_schema(filtered_transactions))
+
+    assert transactions.attrs == {}
+    with pytest.raises(ValueError):
+        get_total_expenses(transactions)
+    with pytest.raises(ValueError):
+        restore_default_schema(transactions)
+
+
+def test_restore_default_schema(filtered_transactions: pd.DataFrame) -> None:
+    result = restore_default_schema(apply_compact_schema(filtered_transactions))
+
+    assert not is_compact(result)
+    assert_frame_equal(result, filtered_transactions, check_dtype=False)
+    assert result["Категория"].dtype == object
+
+
+def test_to_rubles(filtered_transactions: pd.DataFrame) -> None:
+    assert to_rubles(80050, apply_compact_schema(filtered_transactions)) == 800.5
+    assert to_rubles(800.5, filtered_transactions) == 800.5
+
+
+@pytest.mark.parametrize("aggregate", [
+    get_total_expenses,
+    get_total_income,
+    get_top_categories_expenses,
+    get_top_categories_income,
+    get_transfers_and_cash_expenses,
+    get_card_spent_cashback
+])
+def test_aggregations_on_compact_schema(filtered_transactions: pd.DataFrame, aggregate: Any) -> None:
+    compact = apply_compact_schema(filtered_transactions)
+
+    assert aggregate(compact) == aggregate(filtered_transactions)
+    assert aggregate(reduce_transactions(compact)) == aggregate(filtered_transactions)
+
+
+def test_top_five_on_compact_schema(filtered_transactions: pd.DataFrame) -> None:
+    result = get_top_five_transactions(apply_compact_schema(filtered_transactions))
+
+    assert result == get_top_five_transactions(filtered_transactions)
+
+
+def test_spending_on_compact_schema(filtered_transactions: pd.DataFrame) -> None:
+    result = get_spending_by_date_category(apply_compact_schema(filtered_transactions), "Супермаркеты",
+                                           datetime(2023, 1, 1), datetime(2023, 3, 1))
+
+    assert result == {"category": "Супермаркеты", "spending": 800.5}
+
+
+def test_cashback_on_compact_schema(filtered_transactions: pd.DataFrame) -> None:
+    records = apply_compact_schema(filtered_transactions).to_dict(orient="records")
+
+    result = json.loads(get_profitable_cashback_categories(records, 2, 2023))
+
+    assert result["Дом и ремонт"] == 100
+    assert len(result) == 8
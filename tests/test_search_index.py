@@ -0,0 +1,119 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.search_index import (
+    ColumnSearchIndex,
+    build_fuzzy_index,
+    build_search_index,
+    get_ngrams,
+    get_word_trigrams,
+    is_plain_query,
+    scan_transactions,
+    scan_transactions_df
+)
+
+
+@pytest.fixture
+def search_df() -> pd.DataFrame:
+    return pd.DataFrame({
+        "Категория": ["Супермаркеты", "Переводы", "Супермаркеты", np.nan, "Каршеринг"],
+        "Описание": ["Магнит", "Перевод с карты", "Пятёрочка", "Ситидрайв", "Ситидрайв"]
+    })
+
+
+def test_get_ngrams() -> None:
+    assert get_ngrams("магнит") == {"маг", "агн", "гни", "нит"}
+    assert get_ngrams("ма") == set()
+
+
+@pytest.mark.parametrize("search_str, expected", [("Ситидрайв", True), ("Перевод с карты", True),
+                                                  ("^Маг", False), ("Маг|Лента", False), ("a.b", False)])
+def test_is_plain_query(search_str: str, expected: bool) -> None:
+    assert is_plain_query(search_str) == expected
+
+
+def test_column_search_index(search_df: pd.DataFrame) -> None:
+    column_index = ColumnSearchIndex(search_df["Категория"])
+
+    assert sorted(column_index.find_rows("маркет")) == [0, 2]
+    assert sorted(column_index.find_rows("nan")) == [3]
+    assert sorted(column_index.find_rows("ы")) == [0, 1, 2]
+    assert len(column_index.find_rows("маркетплейс")) == 0
+
+
+@pytest.mark.parametrize("search_str, expected", [
+    ("ситидрайв", [3, 4]),
+    ("КАР", [1, 4]),
+    ("ё", [2]),
+    ("", [0, 1, 2, 3, 4]),
+    ("Лента", []),
+])
+def test_search_index(search_df: pd.DataFrame, search_str: str, expected: list[int]) -> None:
+    assert list(build_search_index(search_df).search(search_str)) == expected
+
+
+def test_search_index_compact(search_df: pd.DataFrame) -> None:
+    compact_df = search_df.astype("category")
+
+    assert list(build_search_index(compact_df).search("КАР")) == [1, 4]
+
+
+def test_search_index_matches_scan(search_df: pd.DataFrame) -> None:
+    search_index = build_search_index(search_df)
+    transactions = search_df.to_dict(orient="records")
+
+    for search_str in ["с", "ит", "пере", "нит", "ы", "драйв", "Na"]:
+        expected = [transactions.index(transact) for transact in scan_transactions(transactions, search_str)]
+        assert list(search_index.search(search_str)) == expected
+
+
+def test_get_word_trigrams() -> None:
+    assert get_word_trigrams("Магнит") == {"  м", " ма", "маг", "агн", "гни", "нит", "ит "}
+    assert get_word_trigrams("Я Т") == {"  я", " я ", "  т", " т "}
+    assert get_word_trigrams("...") == set()
+
+
+@pytest.mark.parametrize("search_str, expected", [
+    ("Ситидрайф", [("Ситидрайв", 0.667)]),
+    ("магнт", [("Магнит", 0.444)]),
+    ("перевод", [("Перевод с карты", 0.5)]),
+    ("zzz", []),
+])
+def test_fuzzy_search_index(search_df: pd.DataFrame, search_str: str, expected: list[tuple[str, float]]) -> None:
+    fuzzy_index = build_fuzzy_index(search_df)
+
+    result = [(fuzzy_index.values[value_id], round(score, 3)) for value_id, score in fuzzy_index.search(search_str)]
+
+    assert result == expected
+
+
+def test_fuzzy_search_index_rows(search_df: pd.DataFrame) -> None:
+    fuzzy_index = build_fuzzy_index(search_df)
+
+    [(value_id, score)] = fuzzy_index.search("Ситидрайф")
+
+    assert list(fuzzy_index.rows.get_rows(value_id)) == [3, 4]
+
+
+def test_fuzzy_search_index_threshold_and_limit(search_df: pd.DataFrame) -> None:
+    fuzzy_index = build_fuzzy_index(search_df)
+
+    ranked = fuzzy_index.search("Магнит Пятёрочка", threshold=0.1, limit=10)
+    limited = fuzzy_index.search("Магнит Пятёрочка", threshold=0.1, limit=1)
+    strict = fuzzy_index.search("Магнит Пятёрочка", threshold=0.9)
+
+    assert [fuzzy_index.values[value_id] for value_id, _ in ranked] == ["Пятёрочка", "Магнит"]
+    assert [score for _, score in ranked] == sorted([score for _, score in ranked], reverse=True)
+    assert limited == ranked[:1]
+    assert strict == []
+
+
+@pytest.mark.parametrize("search_str", ["^С", "драйв$", "Магнит|Пятёрочка", "NaN", "[ао]р", ""])
+def test_scan_transactions_df(search_df: pd.DataFrame, search_str: str) -> None:
+    transactions = search_df.to_dict(orient="records")
+
+    expected = [transactions.index(transact) for transact in scan_transactions(transactions, search_str)]
+
+    assert list(scan_transactions_df(search_df, search_str)) == expected
+    assert list(scan_transactions_df(search_df.astype("category"), search_str)) == expected
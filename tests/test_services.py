@@ -1,26 +1,38 @@
+import io
 import json
-from typing import Any
-from unittest.mock import patch
+from typing import Any, Callable, Optional
+from unittest.mock import Mock, patch
 
 import pandas as pd
 import pytest
 
+from src.search_index import scan_transactions
+from src.schema import apply_compact_schema, restore_default_schema
 from src.services import (
     get_profitable_cashback_categories,
+    get_profitable_cashback_categories_df,
+    get_transactions_frame,
     get_transactions_list,
+    make_fuzzy_search,
     make_simple_search,
-    search_for_transfers_to_individuals
+    make_simple_search_df,
+    make_simple_search_page,
+    search_for_transfers_to_individuals,
+    search_for_transfers_to_individuals_df,
+    search_for_transfers_to_individuals_page,
+    write_simple_search,
+    write_transfers_to_individuals
 )
 
 
-@patch("src.services.read_transactions_excel")
-def test_get_transactions_list(mock_read_excel: Any) -> None:
+@patch("src.services.get_dataset")
+def test_get_transactions_list(mock_get_dataset: Any) -> None:
     fake_df = pd.DataFrame({
         "Дата операции": ["01.01.2021 12:00:00", "02.01.2021 14:30:00"],
         "Сумма": [1000, 2000]
     })
 
-    mock_read_excel.return_value = fake_df
+    mock_get_dataset.return_value = Mock(filepath="fake/path.xlsx", frame=fake_df)
 
     result = get_transactions_list()
 
@@ -30,12 +42,13 @@ def test_get_transactions_list(mock_read_excel: Any) -> None:
     ]
 
     assert result == expected
-    mock_read_excel.assert_called_once()
+    mock_get_dataset.assert_called_once()
 
 
-@patch("src.services.read_transactions_excel")
-def test_get_transactions_list_invalid(mock_read_excel: Any) -> None:
-    mock_read_excel.side_effect = AttributeError()
+@patch("src.services.get_dataset")
+def test_get_transactions_list_invalid(mock_get_dataset: Any) -> None:
+    fake_df = Mock(attrs={}, columns=[], to_dict=Mock(side_effect=AttributeError()))
+    mock_get_dataset.return_value = Mock(filepath="fake/path.xlsx", frame=fake_df)
     with pytest.raises(AttributeError):
         get_transactions_list()
 
@@ -64,11 +77,11 @@ def test_get_profitable_cashback_categories_invalid(filtered_transactions_invali
         get_profitable_cashback_categories(filtered_transactions_invalid_list, 2, 2023)
 
 
-@patch("src.services.get_transactions_list")
-def test_make_simple_search(mock_get_list: Any, filtered_transactions_list: list[dict]) -> None:
-    mock_get_list.return_value = filtered_transactions_list
+@patch("src.services.get_dataset")
+def test_make_simple_search(mock_get_dataset: Any, filtered_transactions_list: list[dict]) -> None:
+    mock_get_dataset.return_value = Mock(frame=pd.DataFrame(filtered_transactions_list))
 
-    result = make_simple_search("Тинькофф")
+    result = make_simple_search("Тинькофф", use_index=False)
 
     expected = [{
         "Дата операции": "2023-02-02 00:00:00",
@@ -86,6 +99,64 @@ def test_make_simple_search(mock_get_list: Any, filtered_transactions_list: list
     assert actual_result == expected
 
 
+@patch("src.services.get_dataset")
+@pytest.mark.parametrize("search_str", ["Тинькофф", "тинь", "ПЕРЕВОД", "ма", "нет такого", "", "^Ма", "Магнит|Вита"])
+@pytest.mark.parametrize("use_index", [True, False])
+def test_make_simple_search_matches_scan(mock_get_dataset: Any,
+                                         search_str: str,
+                                         use_index: bool,
+                                         filtered_transactions_list: list[dict]) -> None:
+    transactions_df = pd.DataFrame(filtered_transactions_list)
+    mock_get_dataset.return_value = Mock(frame=transactions_df,
+                                         get_index=lambda name, builder: builder(transactions_df))
+
+    result = json.loads(make_simple_search(search_str, use_index))
+
+    expected = scan_transactions(filtered_transactions_list, search_str)
+    assert [item["Описание"] for item in result] == [item["Описание"] for item in expected]
+
+
+@patch("src.services.get_dataset")
+def test_make_simple_search_regex(mock_get_dataset: Any, filtered_transactions_list: list[dict]) -> None:
+    mock_get_dataset.return_value = Mock(frame=pd.DataFrame(filtered_transactions_list))
+
+    result = json.loads(make_simple_search("^Ма"))
+
+    assert [item["Описание"] for item in result] == ["Магнит", "МаксидоМ"]
+    mock_get_dataset.return_value.get_index.assert_called_once()
+
+
+@patch("src.services.get_dataset")
+def test_make_fuzzy_search(mock_get_dataset: Any, filtered_transactions_list: list[dict]) -> None:
+    transactions_df = pd.DataFrame(filtered_transactions_list)
+    mock_get_dataset.return_value = Mock(frame=transactions_df,
+                                         get_index=lambda name, builder: builder(transactions_df))
+
+    result = json.loads(make_fuzzy_search("Магнт Вита", threshold=0.2))
+
+    assert [(item["Описание"], item["Сходство"]) for item in result] == [("Магнит", 0.286), ("Аптека Вита", 0.278)]
+    assert result[0] == {
+        "Дата операции": "2023-02-03 00:00:00",
+        "Номер карты": "*4556",
+        "Сумма операции": -800.5,
+        "Кэшбэк": 0,
+        "Сумма операции с округлением": 800,
+        "Категория": "Супермаркеты",
+        "Описание": "Магнит",
+        "MCC": None,
+        "Сходство": 0.286
+    }
+
+
+@patch("src.services.get_dataset")
+def test_make_fuzzy_search_not_found(mock_get_dataset: Any, filtered_transactions_list: list[dict]) -> None:
+    transactions_df = pd.DataFrame(filtered_transactions_list)
+    mock_get_dataset.return_value = Mock(frame=transactions_df,
+                                         get_index=lambda name, builder: builder(transactions_df))
+
+    assert json.loads(make_fuzzy_search("Лента")) == []
+
+
 def test_search_for_transfers_to_individuals(filtered_transactions_list: list[dict]) -> None:
     result = search_for_transfers_to_individuals(filtered_transactions_list)
 
@@ -120,3 +191,114 @@ def test_search_for_transfers_to_individuals(filtered_transactions_list: list[di
 def test_search_for_transfers_to_individuals_invalid(filtered_transactions_invalid_list: list[dict]) -> None:
     with pytest.raises(KeyError):
         search_for_transfers_to_individuals(filtered_transactions_invalid_list)
+
+
+@patch("src.services.get_dataset")
+def test_get_transactions_frame(mock_get_dataset: Any) -> None:
+    fake_df = pd.DataFrame({"Сумма": [1000, 2000]})
+    mock_get_dataset.return_value = Mock(filepath="fake/path.xlsx", frame=fake_df)
+
+    assert get_transactions_frame() is fake_df
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_services_df_match_list(filtered_transactions_list: list[dict], compact: bool) -> None:
+    transactions_df = pd.DataFrame(filtered_transactions_list)
+    if compact:
+        transactions_df = apply_compact_schema(transactions_df)
+    transactions_list = restore_default_schema(transactions_df).to_dict(orient="records")
+
+    assert (get_profitable_cashback_categories_df(transactions_df, 2, 2023)
+            == get_profitable_cashback_categories(transactions_list, 2, 2023))
+    assert (search_for_transfers_to_individuals_df(transactions_df)
+            == search_for_transfers_to_individuals(transactions_list))
+
+
+def test_make_simple_search_df(filtered_transactions_list: list[dict]) -> None:
+    transactions_df = pd.DataFrame(filtered_transactions_list)
+
+    result = json.loads(make_simple_search_df(transactions_df, "^(Магнит|Аптека)"))
+
+    assert [item["Описание"] for item in result] == ["Магнит", "Аптека Вита"]
+
+
+def test_search_for_transfers_to_individuals_df_invalid(filtered_transactions_invalid_list: list[dict]) -> None:
+    with pytest.raises(KeyError):
+        search_for_transfers_to_individuals_df(pd.DataFrame(filtered_transactions_invalid_list))
+
+
+def read_all_pages(get_page: Callable[[Optional[str]], str]) -> list[dict]:
+    transactions: list[dict] = []
+    cursor = None
+    while True:
+        page = json.loads(get_page(cursor))
+        transactions += page["transactions"]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return transactions
+
+
+@patch("src.services.get_dataset")
+@pytest.mark.parametrize("search_str", ["а", "Переводы", "^Ма", "нет такого"])
+def test_write_simple_search(mock_get_dataset: Any, search_str: str, filtered_transactions_list: list[dict]) -> None:
+    transactions_df = pd.DataFrame(filtered_transactions_list)
+    mock_get_dataset.return_value = Mock(frame=transactions_df,
+                                         get_index=lambda name, builder: builder(transactions_df))
+    file = io.StringIO()
+
+    count = write_simple_search(file, search_str)
+
+    assert file.getvalue() == make_simple_search(search_str)
+    assert count == len(json.loads(file.getvalue()))
+
+
+def test_write_transfers_to_individuals(filtered_transactions_list: list[dict]) -> None:
+    transactions_df = pd.DataFrame(filtered_transactions_list)
+    file = io.StringIO()
+
+    assert write_transfers_to_individuals(file, transactions_df) == 2
+    assert file.getvalue() == search_for_transfers_to_individuals_df(transactions_df)
+
+
+@patch("src.services.get_dataset")
+@pytest.mark.parametrize("limit", [1, 2, 4, 100])
+def test_make_simple_search_page(mock_get_dataset: Any, limit: int, filtered_transactions_list: list[dict]) -> None:
+    transactions_df = pd.DataFrame(filtered_transactions_list)
+    mock_get_dataset.return_value = Mock(frame=transactions_df, version=1,
+                                         get_index=lambda name, builder: builder(transactions_df))
+
+    first_page = json.loads(make_simple_search_page("а", limit))
+    result = read_all_pages(lambda cursor: make_simple_search_page("а", limit, cursor))
+
+    assert len(first_page["transactions"]) == min(limit, len(result))
+    assert result == json.loads(make_simple_search("а"))
+
+
+@patch("src.services.get_dataset")
+def test_search_for_transfers_to_individuals_page(mock_get_dataset: Any,
+                                                  filtered_transactions_list: list[dict]) -> None:
+    transactions_df = pd.DataFrame(filtered_transactions_list)
+    mock_get_dataset.return_value = Mock(frame=transactions_df, version=1)
+
+    result = read_all_pages(lambda cursor: search_for_transfers_to_individuals_page(1, cursor))
+
+    assert result == json.loads(search_for_transfers_to_individuals_df(transactions_df))
+
+
+@patch("src.services.get_dataset")
+def test_make_simple_search_page_invalid_cursor(mock_get_dataset: Any, filtered_transactions_list: list[dict]) -> None:
+    transactions_df = pd.DataFrame(filtered_transactions_list)
+    mock_get_dataset.return_value = Mock(frame=transactions_df, version=1,
+                                         get_index=lambda name, builder: builder(transactions_df))
+    cursor = json.loads(make_simple_search_page("а", 1))["next_cursor"]
+
+    with pytest.raises(ValueError):
+        make_simple_search_page("е", 1, cursor)
+    with pytest.raises(ValueError):
+        make_simple_search_page("а", 1, "не курсор")
+    with pytest.raises(ValueError):
+        make_simple_search_page("а", 0)
+
+    mock_get_dataset.return_value.version = 2
+    with pytest.raises(ValueError):
+        make_simple_search_page("а", 1, cursor)
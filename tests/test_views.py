@@ -0,0 +1,46 @@
+import os
+from unittest.mock import patch
+
+from config import ROOT_DIR
+from src.cube import get_events_information_cube, get_information_home_page_cube
+from src.external_api import ReplayQuoteProvider, get_currency_rates, get_stock_prices
+from src.logging_config import views_logger
+from src.views import get_inform_for_veb_page, load_transactions
+
+RECORDED_PATH = os.path.join(ROOT_DIR, "data", "quotes_recorded.json")
+
+
+def test_get_inform_for_veb_page() -> None:
+    provider = ReplayQuoteProvider(RECORDED_PATH)
+    transactions, cube, date_order = load_transactions()
+    currency_rates = get_currency_rates(provider=provider)
+    stock_prices = get_stock_prices(provider=provider)
+
+    result = get_inform_for_veb_page("2021-12-31 22:39:04", "W", provider=provider, use_cache=False)
+
+    assert result == (
+        get_information_home_page_cube("2021-12-31 22:39:04", transactions, cube, currency_rates, stock_prices,
+                                       date_order),
+        get_events_information_cube("2021-12-31 22:39:04", transactions, cube, currency_rates, stock_prices, "W")
+    )
+
+
+def test_get_inform_for_veb_page_overlaps_stages() -> None:
+    load_transactions()
+    timings: dict[str, float] = {}
+
+    get_inform_for_veb_page("2021-12-31 22:39:04", "M", provider=ReplayQuoteProvider(RECORDED_PATH, latency=0.2),
+                            use_cache=False, timings=timings)
+
+    assert set(timings) == {"transactions", "currency_rates", "stock_prices", "home_page", "events_page", "total"}
+    assert timings["currency_rates"] >= 0.2
+    assert timings["stock_prices"] >= 0.2
+    assert timings["total"] < timings["currency_rates"] + timings["stock_prices"]
+
+
+def test_get_inform_for_veb_page_skips_disabled_timing_log() -> None:
+    with patch.object(views_logger, "isEnabledFor", return_value=False), patch.object(views_logger, "info") as info:
+        get_inform_for_veb_page("2021-12-31 22:39:04", "M", provider=ReplayQuoteProvider(RECORDED_PATH),
+                                use_cache=False)
+
+    info.assert_not_called()
@@ -0,0 +1,96 @@
+import os
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+from pandas._testing import assert_frame_equal
+
+from src.read_xlsx import read_transactions_excel
+from src.xlsx_cache import get_cache_paths, invalidate_cache, load_cached_transactions
+
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def workbook_path(tmp_path: Path) -> str:
+    filepath = os.path.join(tmp_path, "operations.xlsx")
+    pd.DataFrame({
+        "Дата операции": ["31.12.2021 16:44:00", "30.12.2021 12:00:00", "29.12.2021 08:15:30"],
+        "Номер карты": ["*7197", None, "*5091"],
+        "Сумма операции": [-160.89, 500.0, -64.0],
+        "Кэшбэк": [None, 5.0, None],
+        "Категория": ["Супермаркеты", "Пополнения", None],
+        "MCC": [5411.0, None, 5814.0],
+        "Описание": ["Колхоз", "Пополнение", "Магнит"]
+    }).to_excel(filepath, index=False)
+    return filepath
+
+
+def test_read_transactions_excel_creates_cache(workbook_path: str) -> None:
+    expected_df = read_transactions_excel(workbook_path, use_cache=False)
+
+    result = read_transactions_excel(workbook_path)
+
+    cache_path, meta_path = get_cache_paths(workbook_path)
+    assert os.path.exists(cache_path)
+    assert os.path.exists(meta_path)
+    assert_frame_equal(result, expected_df)
+
+
+def test_read_transactions_excel_from_cache(workbook_path: str) -> None:
+    expected_df = read_transactions_excel(workbook_path)
+
+    with patch("src.read_xlsx.pd.read_excel") as mock_read_excel:
+        result = read_transactions_excel(workbook_path)
+
+    mock_read_excel.assert_not_called()
+    assert_frame_equal(result, expected_df)
+    assert isinstance(result["Категория"].iloc[2], float)
+
+
+def test_cache_invalidated_by_content_change(workbook_path: str) -> None:
+    read_transactions_excel(workbook_path)
+
+    pd.DataFrame({
+        "Дата операции": ["01.01.2022 10:00:00"],
+        "Сумма операции": [-1.0]
+    }).to_excel(workbook_path, index=False)
+
+    assert load_cached_transactions(workbook_path) is None
+    result = read_transactions_excel(workbook_path)
+
+    assert len(result) == 1
+
+
+def test_cache_survives_touch(workbook_path: str) -> None:
+    read_transactions_excel(workbook_path)
+    stat = os.stat(workbook_path)
+    os.utime(workbook_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert load_cached_transactions(workbook_path) is not None
+
+
+def test_cache_invalidated_by_size_change(workbook_path: str) -> None:
+    read_transactions_excel(workbook_path)
+    with open(workbook_path, "ab") as f:
+        f.write(b"\0")
+
+    assert load_cached_transactions(workbook_path) is None
+
+
+def test_invalidate_cache(workbook_path: str) -> None:
+    read_transactions_excel(workbook_path)
+
+    invalidate_cache(workbook_path)
+
+    assert not any(os.path.exists(path) for path in get_cache_paths(workbook_path))
+
+
+@patch("src.xlsx_cache.is_cache_available", return_value=False)
+def test_read_transactions_excel_without_pyarrow(mock_available: Any, workbook_path: str) -> None:
+    result = read_transactions_excel(workbook_path)
+
+    assert len(result) == 3
+    assert not os.path.exists(get_cache_paths(workbook_path)[0])
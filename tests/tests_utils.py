@@ -3,14 +3,19 @@ from datetime import datetime
 from typing import Any
 from unittest.mock import patch
 
+import numpy as np
 import pandas as pd
 import pytest
 
 from src.utils import (
+    aggregate_transactions_chunks,
     filter_transactions,
     get_card_spent_cashback,
     get_date_obj_information,
+    get_date_windows,
+    get_category_totals,
     get_events_information,
+    get_expenses_and_income,
     get_greeting,
     get_information_home_page,
     get_top_categories_expenses,
@@ -18,7 +23,9 @@ from src.utils import (
     get_top_five_transactions,
     get_total_expenses,
     get_total_income,
-    get_transfers_and_cash_expenses
+    get_transfers_and_cash_expenses,
+    merge_reduced_transactions,
+    reduce_transactions
 )
 
 
@@ -65,20 +72,12 @@ def test_get_information_home_page(mock_get_date_obj_information: Any,
     assert result_json["stock_prices"] == [{"stock": "AAPL", "price": 150.0}]
 
 
-@patch("src.utils.get_top_categories_income")
-@patch("src.utils.get_total_income")
-@patch("src.utils.get_transfers_and_cash_expenses")
-@patch("src.utils.get_top_categories_expenses")
-@patch("src.utils.get_total_expenses")
+@patch("src.utils.get_expenses_and_income")
 @patch("src.utils.filter_transactions")
 @patch("src.utils.get_date_obj_information")
 def test_get_events_information(mock_get_date_obj_information: Any,
                                 mock_filter_transactions: Any,
-                                mock_get_total_expenses: Any,
-                                mock_get_top_categories_expenses: Any,
-                                mock_get_transfers_and_cash_expenses: Any,
-                                mock_get_total_income: Any,
-                                mock_get_top_categories_income: Any
+                                mock_get_expenses_and_income: Any
                                 ) -> None:
     date_str = "2023-11-01 12:00:00"
     transactions = pd.DataFrame({
@@ -95,20 +94,26 @@ def test_get_events_information(mock_get_date_obj_information: Any,
         pd.Timestamp("2023-11-02")
     )
     mock_filter_transactions.return_value = transactions
-    mock_get_total_expenses.return_value = {"total_amount": 55000}
-    mock_get_top_categories_expenses.return_value = [
-        {"category": "Переводы", "amount": 11000},
-        {"category": "Такси", "amount": 5000}
-    ]
-    mock_get_transfers_and_cash_expenses.return_value = [
-        {"category": "Переводы", "amount": 11000},
-        {"category": "Наличные", "amount": 1000}
-    ]
-    mock_get_total_income.return_value = {"total_amount": 155000}
-    mock_get_top_categories_income.return_value = [
-        {"category": "Пополнения", "amount": 11000},
-        {"category": "Другое", "amount": 2000}
-    ]
+    mock_get_expenses_and_income.return_value = (
+        {
+            "total_amount": 55000,
+            "main": [
+                {"category": "Переводы", "amount": 11000},
+                {"category": "Такси", "amount": 5000}
+            ],
+            "transfers_and_cash": [
+                {"category": "Переводы", "amount": 11000},
+                {"category": "Наличные", "amount": 1000}
+            ]
+        },
+        {
+            "total_amount": 155000,
+            "main": [
+                {"category": "Пополнения", "amount": 11000},
+                {"category": "Другое", "amount": 2000}
+            ]
+        }
+    )
 
     result = get_events_information(date_str, transactions, currency_rates, stock_prices, data_range)
     result_json = json.loads(result)
@@ -172,6 +177,22 @@ def test_get_date_obj_information_invalid() -> None:
         get_date_obj_information("2023-12-31T02:26:18.671407", "M")
 
 
+@pytest.mark.parametrize("data_range", ["W", "M", "Y", "m"])
+def test_get_date_windows(data_range: str) -> None:
+    date_strs = ["2025-06-13 02:26:18", "2025-06-15 23:00:00", "2025-06-16 00:00:00", "1900-04-01 02:26:18",
+                 "2000-02-29 02:26:18", "2024-12-31 12:00:00"]
+
+    dates, start_dates, end_dates = get_date_windows(date_strs, data_range)
+
+    assert list(zip(dates, start_dates, end_dates)) == [get_date_obj_information(date_str, data_range)
+                                                        for date_str in date_strs]
+
+
+def test_get_date_windows_invalid() -> None:
+    with pytest.raises(ValueError):
+        get_date_windows(["2023-12-31 02:26:18", "2023-12-31T02:26:18.671407"])
+
+
 @pytest.mark.parametrize("date, expected", [
     ((2023, 1, 1, 8, 0), "Доброе утро"),
     ((2023, 1, 1, 12, 15), "Добрый день"),
@@ -280,7 +301,7 @@ def test_get_top_five_transactions_invalid(filtered_transactions_invalid: pd.Dat
 def test_get_total_expenses(filtered_transactions: pd.DataFrame) -> None:
     result = get_total_expenses(filtered_transactions)
 
-    expected = {"total_amount": 14850}
+    expected = {"total_amount": 14851}
 
     assert result == expected
 
@@ -310,7 +331,7 @@ def test_get_top_categories_expenses(filtered_transactions: pd.DataFrame) -> Non
         {"category": "Дом и ремонт", "amount": 10000},
         {"category": "Наличные", "amount": 2000},
         {"category": "Аптеки", "amount": 1000},
-        {"category": "Супермаркеты", "amount": 800},
+        {"category": "Супермаркеты", "amount": 801},
         {"category": "Детские товары", "amount": 400},
         {"category": "Связь", "amount": 350},
         {"category": "Остальное", "amount": 0}
@@ -354,3 +375,104 @@ def test_get_transfers_and_cash_expenses(filtered_transactions: pd.DataFrame) ->
 def test_get_transfers_and_cash_expenses_invalid(filtered_transactions_invalid: pd.DataFrame) -> None:
     with pytest.raises(KeyError, match="Категория"):
         get_transfers_and_cash_expenses(filtered_transactions_invalid)
+
+
+def test_get_category_totals(filtered_transactions: pd.DataFrame) -> None:
+    result = get_category_totals(filtered_transactions)
+
+    assert result.attrs["amounts_in_kopecks"] is True
+    assert len(result) == 9
+    assert result["Сумма операции"].sum() == -1375050
+
+
+def test_get_category_totals_invalid(filtered_transactions_invalid: pd.DataFrame) -> None:
+    with pytest.raises(KeyError, match="Сумма операции"):
+        get_category_totals(filtered_transactions_invalid)
+
+
+@pytest.mark.parametrize("without_category", [False, True])
+def test_get_expenses_and_income(filtered_transactions: pd.DataFrame, without_category: bool) -> None:
+    if without_category:
+        filtered_transactions.loc[1, "Категория"] = np.nan
+
+    expenses, income = get_expenses_and_income(filtered_transactions)
+
+    assert expenses == {
+        "total_amount": get_total_expenses(filtered_transactions)["total_amount"],
+        "main": get_top_categories_expenses(filtered_transactions),
+        "transfers_and_cash": get_transfers_and_cash_expenses(filtered_transactions)
+    }
+    assert income == {
+        "total_amount": get_total_income(filtered_transactions)["total_amount"],
+        "main": get_top_categories_income(filtered_transactions)
+    }
+
+
+@pytest.mark.parametrize("aggregate", [
+    get_total_expenses,
+    get_total_income,
+    get_top_categories_expenses,
+    get_top_categories_income,
+    get_transfers_and_cash_expenses,
+    get_card_spent_cashback
+])
+def test_reduce_transactions(filtered_transactions: pd.DataFrame, aggregate: Any) -> None:
+    reduced = reduce_transactions(filtered_transactions)
+
+    assert aggregate(reduced) == aggregate(filtered_transactions)
+
+
+def test_reduce_transactions_invalid(filtered_transactions_invalid: pd.DataFrame) -> None:
+    with pytest.raises(KeyError, match="Сумма операции"):
+        reduce_transactions(filtered_transactions_invalid)
+
+
+def test_merge_reduced_transactions(filtered_transactions: pd.DataFrame) -> None:
+    parts = [reduce_transactions(filtered_transactions.iloc[:4]), reduce_transactions(filtered_transactions.iloc[4:])]
+
+    result = merge_reduced_transactions(parts)
+
+    assert result["Количество операций"].sum() == len(filtered_transactions)
+    assert get_top_categories_expenses(result) == get_top_categories_expenses(filtered_transactions)
+
+
+def test_aggregate_transactions_chunks(filtered_transactions: pd.DataFrame) -> None:
+    chunks = (filtered_transactions.iloc[i:i + 2] for i in range(0, len(filtered_transactions), 2))
+
+    reduced, top_candidates = aggregate_transactions_chunks(chunks)
+
+    assert get_total_expenses(reduced) == {"total_amount": 14851}
+    assert get_card_spent_cashback(reduced) == get_card_spent_cashback(filtered_transactions)
+    assert get_top_five_transactions(top_candidates) == get_top_five_transactions(filtered_transactions)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 4, 9])
+def test_aggregate_transactions_chunks_tied_amounts(filtered_transactions: pd.DataFrame, chunk_size: int) -> None:
+    transactions = filtered_transactions.assign(**{
+        "Сумма операции с округлением": [300, 100, 300, 100, 300, 300, 100, 300, 300]})
+    chunks = (transactions.iloc[i:i + chunk_size] for i in range(0, len(transactions), chunk_size))
+
+    _, top_candidates = aggregate_transactions_chunks(chunks)
+    result = get_top_five_transactions(top_candidates)
+
+    assert result == get_top_five_transactions(transactions)
+    assert [item["description"] for item in result] == [
+        "Дмитрий Р.", "Магнит", "Андрей Х.", "Детский Мир", "Devajs Servis."]
+
+
+def test_aggregate_transactions_chunks_with_dates(filtered_transactions: pd.DataFrame) -> None:
+    chunks = (filtered_transactions.iloc[i:i + 3] for i in range(0, len(filtered_transactions), 3))
+    start_date = datetime(2023, 2, 3, 0, 0, 0)
+    end_date = datetime(2023, 2, 5, 0, 0, 0)
+
+    reduced, top_candidates = aggregate_transactions_chunks(chunks, start_date, end_date, end_date)
+
+    assert get_total_expenses(reduced) == {"total_amount": 2501}
+    assert len(top_candidates) == 4
+
+
+def test_aggregate_transactions_chunks_empty() -> None:
+    reduced, top_candidates = aggregate_transactions_chunks([])
+
+    assert get_total_expenses(reduced) == {"total_amount": 0}
+    assert top_candidates.empty